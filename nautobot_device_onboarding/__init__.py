@@ -42,10 +42,40 @@ class NautobotDeviceOnboardingConfig(NautobotAppConfig):
             "ios": "nautobot_device_onboarding.onboarding_extensions.ios",
         },
         "object_match_strategy": "loose",
+        "sync_network_data_bulk_write": False,
+        "sync_network_data_bulk_batch_size": 500,
+        "sync_transaction_chunk_size": 0,
+        "sync_network_data_diff_processes": 0,
+        "sync_query_statistics": True,
+        "sync_memory_snapshots": False,
+        "reference_cache_timeout": 0,
+        "dns_resolver_timeout": 10,
+        "dns_resolver_cache_ttl": 300,
+        "onboarding_task_workers": 1,
+        "command_getter_adaptive_concurrency": False,
+        "command_getter_initial_workers": 4,
+        "ssh_concurrency_budget": 0,
+        "ssh_concurrency_budget_per_location": {},
+        "ssh_concurrency_lease_timeout": 600,
+        "ssh_concurrency_acquire_timeout": 900,
+        "command_getter_device_timeout": 0,
+        "command_getter_retries": 0,
+        "command_getter_retry_backoff": 10,
+        "command_getter_retry_workers": 2,
     }
     caching_config = {}
     docs_view_name = "plugins:nautobot_device_onboarding:docs"
     home_view_name = "extras:job_list"  # Jobs only for now. May change in the future.
 
+    def ready(self):
+        """Trigger callback when database is ready."""
+        super().ready()
+
+        from nautobot_device_onboarding.signals import (  # pylint: disable=import-outside-toplevel
+            register_signals,
+        )
+
+        register_signals(self)
+
 
 config = NautobotDeviceOnboardingConfig  # pylint:disable=invalid-name
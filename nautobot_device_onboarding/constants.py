@@ -22,6 +22,13 @@ NETMIKO_TO_NAPALM_STATIC = {
     "cisco_xr": "iosxr",
 }
 
+# NAPALM drivers opening a Netmiko SSH connection, with the Netmiko device type they open it as. The original
+# onboarding job hands the SSH session used to detect the device type over to these drivers.
+NAPALM_NETMIKO_DEVICE_TYPES = {
+    "ios": "cisco_ios",
+    "nxos_ssh": "cisco_nxos",
+}
+
 
 # This is used in the new SSoT based jobs.
 SUPPORTED_NETWORK_DRIVERS = list(get_all_network_driver_mappings().keys())
@@ -2,25 +2,24 @@
 
 import socket
 from collections import defaultdict
-from typing import DefaultDict, Dict, FrozenSet, Hashable, Tuple, Type
+from typing import Dict, Type
 
 import diffsync
 import netaddr
-from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from django.db.models import Model
+from django.db.models import F, Model
 from nautobot.dcim.models import Device, DeviceType, Manufacturer, Platform
+from nautobot.ipam.models import IPAddressToInterface
 
 from nautobot_device_onboarding.diffsync.models import sync_devices_models
+from nautobot_device_onboarding.diffsync.syncer import ChunkedTransactionAdapterMixin
 from nautobot_device_onboarding.nornir_plays.command_getter import (
     sync_devices_command_getter,
 )
-from nautobot_device_onboarding.utils import diffsync_utils
+from nautobot_device_onboarding.utils import diffsync_utils, dns_resolver, query_statistics
 
-ParameterSet = FrozenSet[Tuple[str, Hashable]]
 
-
-class SyncDevicesNautobotAdapter(diffsync.Adapter):
+class SyncDevicesNautobotAdapter(ChunkedTransactionAdapterMixin, diffsync.Adapter):
     """Adapter for loading Nautobot data."""
 
     manufacturer = sync_devices_models.SyncDevicesManufacturer
@@ -30,39 +29,62 @@ class SyncDevicesNautobotAdapter(diffsync.Adapter):
 
     top_level = ["manufacturer", "platform", "device_type", "device"]
 
-    # This dictionary acts as an ORM cache.
-    _cache: DefaultDict[str, Dict[ParameterSet, Model]]
-    _cache_hits: DefaultDict[str, int] = defaultdict(int)
-
     def __init__(self, job, sync, *args, **kwargs):
         """Initialize the SyncDevicesNautobotAdapter."""
         super().__init__(*args, **kwargs)
         self.job = job
         self.sync = sync
-        self.invalidate_cache()
+        self.orm_cache = job.orm_cache
 
     def invalidate_cache(self, zero_out_hits=True):
         """Invalidates all the objects in the ORM cache."""
-        self._cache = defaultdict(dict)
-        if zero_out_hits:
-            self._cache_hits = defaultdict(int)
+        self.orm_cache.invalidate(zero_out_hits=zero_out_hits)
 
     def get_from_orm_cache(self, parameters: Dict, model_class: Type[Model]):
-        """Retrieve an object from the ORM or the cache."""
-        parameter_set = frozenset(parameters.items())
-        content_type = ContentType.objects.get_for_model(model_class)
-        model_cache_key = f"{content_type.app_label}.{content_type.model}"
-        if cached_object := self._cache[model_cache_key].get(parameter_set):
-            self._cache_hits[model_cache_key] += 1
-            return cached_object
-        # As we are using `get` here, this will error if there is not exactly one object that corresponds to the
-        # parameter set. We intentionally pass these errors through.
-        self._cache[model_cache_key][parameter_set] = model_class.objects.get(**dict(parameter_set))
-        return self._cache[model_cache_key][parameter_set]
+        """Retrieve an object from the job's ORM cache or the ORM."""
+        return self.orm_cache.get(parameters, model_class)
+
+    def _get_network_values(self, model_name, field):
+        """
+        Return the values of a field of the objects of a model loaded by the network adapter.
+
+        Returns None if the network adapter hasn't been loaded, all objects of the model are then loaded from Nautobot.
+        """
+        if self.job.source_adapter is None:
+            return None
+        return {getattr(obj, field) for obj in self.job.source_adapter.get_all(model_name)}
+
+    def get_manufacturer_queryset(self):
+        """Return the manufacturers to load, those returned by the network once it has been loaded."""
+        queryset = Manufacturer.objects.all()
+        names = self._get_network_values("manufacturer", "name")
+        if names is not None:
+            queryset = queryset.filter(name__in=names)
+        return queryset
+
+    def get_platform_queryset(self):
+        """Return the platforms to load, those returned by the network or used by its devices once it has been loaded."""
+        queryset = Platform.objects.select_related("manufacturer")
+        names = self._get_network_values("platform", "name")
+        if names is not None:
+            names |= self._get_network_values("device", "platform__name")
+            queryset = queryset.filter(name__in=names)
+        return queryset
+
+    def get_device_type_queryset(self):
+        """Return the device types to load, those returned by the network once it has been loaded."""
+        queryset = DeviceType.objects.select_related("manufacturer")
+        models = self._get_network_values("device_type", "model")
+        if models is not None:
+            # This may match a few device types the network didn't return, the job skips unmatched Nautobot objects.
+            queryset = queryset.filter(
+                model__in=models, manufacturer__name__in=self._get_network_values("device_type", "manufacturer__name")
+            )
+        return queryset
 
     def load_manufacturers(self):
         """Load manufacturer data from Nautobot."""
-        for manufacturer in Manufacturer.objects.all():
+        for manufacturer in self.get_manufacturer_queryset():
             if self.job.debug:
                 self.job.logger.debug("Loading Manufacturer data from Nautobot...")
             onboarding_manufacturer = self.manufacturer(adapter=self, pk=manufacturer.pk, name=manufacturer.name)
@@ -74,7 +96,7 @@ class SyncDevicesNautobotAdapter(diffsync.Adapter):
         """Load platform data from Nautobot."""
         if self.job.debug:
             self.job.logger.debug("Loading Platform data from Nautobot...")
-        for platform in Platform.objects.all():
+        for platform in self.get_platform_queryset():
             onboarding_platform = self.platform(
                 adapter=self,
                 pk=platform.pk,
@@ -90,7 +112,7 @@ class SyncDevicesNautobotAdapter(diffsync.Adapter):
         """Load device type data from Nautobot."""
         if self.job.debug:
             self.job.logger.debug("Loading DeviceType data from Nautobot...")
-        for device_type in DeviceType.objects.all():
+        for device_type in self.get_device_type_queryset():
             onboarding_device_type = self.device_type(
                 adapter=self,
                 pk=device_type.pk,
@@ -102,24 +124,30 @@ class SyncDevicesNautobotAdapter(diffsync.Adapter):
             if self.job.debug:
                 self.job.logger.debug(f"DeviceType: {device_type.model} loaded.")
 
+    def _get_primary_ip_interface_names(self, devices):
+        """Return the names of the interfaces each device's primary IPv4 address is assigned to, keyed by device pk."""
+        interface_names = defaultdict(list)
+        for device_pk, interface_name in IPAddressToInterface.objects.filter(
+            interface__device__in=devices, ip_address=F("interface__device__primary_ip4")
+        ).values_list("interface__device", "interface__name"):
+            interface_names[device_pk].append(interface_name)
+        return interface_names
+
     def load_devices(self):
         """Load device data from Nautobot."""
         if self.job.debug:
             self.job.logger.debug("Loading Device data from Nautobot...")
 
-        for device in Device.objects.filter(primary_ip4__host__in=self.job.ip_addresses):
-            interface_list = []
-            # Only interfaces with the device's primary ip should be considered for diff calculations
-            # Ultimately, only the first matching interface is used but this list could support multiple
-            # interface syncs in the future.
-            for interface in device.interfaces.all():
-                if device.primary_ip4 in interface.ip_addresses.all():
-                    interface_list.append(interface.name)
-            if interface_list:
-                interface_list.sort()
-                interfaces = [interface_list[0]]
-            else:
-                interfaces = []
+        devices = Device.objects.filter(primary_ip4__host__in=self.job.ip_addresses).select_related(
+            "device_type", "location", "platform", "primary_ip4__status", "role", "status", "secrets_group"
+        )
+        # Only interfaces with the device's primary ip should be considered for diff calculations
+        # Ultimately, only the first matching interface is used but this mapping could support multiple
+        # interface syncs in the future.
+        primary_ip_interface_names = self._get_primary_ip_interface_names(devices)
+        for device in devices:
+            interface_list = sorted(primary_ip_interface_names.get(device.pk, []))
+            interfaces = interface_list[:1]
             onboarding_device = self.device(
                 adapter=self,
                 pk=device.pk,
@@ -142,10 +170,14 @@ class SyncDevicesNautobotAdapter(diffsync.Adapter):
 
     def load(self):
         """Load nautobot data."""
-        self.load_manufacturers()
-        self.load_platforms()
-        self.load_device_types()
-        self.load_devices()
+        with query_statistics.model_scope("manufacturer"):
+            self.load_manufacturers()
+        with query_statistics.model_scope("platform"):
+            self.load_platforms()
+        with query_statistics.model_scope("device_type"):
+            self.load_device_types()
+        with query_statistics.model_scope("device"):
+            self.load_devices()
 
 
 class SyncDevicesNetworkAdapter(diffsync.Adapter):
@@ -165,22 +197,29 @@ class SyncDevicesNetworkAdapter(diffsync.Adapter):
         self.sync = sync
         self.device_data = None
         self.failed_ip_addresses = []
+        self.dns_resolver = dns_resolver.get_resolver()
 
     def _validate_ip_addresses(self, ip_addresses):
         """Validate the format of each IP Address in a list of IP Addresses."""
-        # Validate IP Addresses
+        # Validate IP Addresses, names are resolved concurrently before logging the results in order
         validation_successful = True
-        for i, ip_address in enumerate(ip_addresses):
+        names = []
+        for ip_address in ip_addresses:
             try:
                 netaddr.IPAddress(ip_address)
             except netaddr.AddrFormatError:
-                try:
-                    resolved_ip = socket.gethostbyname(ip_address)
-                    self.job.logger.info(f"[{ip_address}] resolved to [{resolved_ip}]")
-                    ip_addresses[i] = resolved_ip
-                except socket.gaierror:
-                    self.job.logger.error(f"[{ip_address}] is not a valid IP Address or name.")
-                    validation_successful = False
+                names.append(ip_address)
+        resolved_names = self.dns_resolver.resolve_all(names) if names else {}
+        for i, ip_address in enumerate(ip_addresses):
+            if ip_address not in resolved_names:
+                continue
+            resolved_ip = resolved_names[ip_address]
+            if isinstance(resolved_ip, socket.gaierror):
+                self.job.logger.error(f"[{ip_address}] is not a valid IP Address or name.")
+                validation_successful = False
+            else:
+                self.job.logger.info(f"[{ip_address}] resolved to [{resolved_ip}]")
+                ip_addresses[i] = resolved_ip
         if validation_successful:
             return True
         raise netaddr.AddrConversionError
@@ -233,6 +272,7 @@ class SyncDevicesNetworkAdapter(diffsync.Adapter):
                 "No devices will be onboarded, check the CommandGetter job logs."
             )
             raise ValidationError("Unexpected data returned from CommandGetter.")
+        self.job.memory_snapshots.take("collection", {"command_getter_result": self.device_data})
 
     def _add_ip_address_to_failed_list(self, ip_address):
         """If an a model fails to load, add the ip address to the failed list for logging."""
@@ -1,22 +1,27 @@
 """DiffSync adapters."""
 
 import datetime
+from typing import Dict, Type
 
 import diffsync
-from diffsync.enum import DiffSyncModelFlags
+from diffsync.enum import DiffSyncFlags, DiffSyncModelFlags
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from nautobot.dcim.models import Interface
+from django.db.models import Model, Q
+from nautobot.dcim.models import Cable, Interface
 from nautobot.ipam.models import VLAN, VRF, IPAddress
 from nautobot_ssot.contrib import NautobotAdapter
-from netaddr import EUI, mac_unix_expanded
-from netutils.interface import canonical_interface_name
 
+from nautobot_device_onboarding.diffsync import parallel_diff
+from nautobot_device_onboarding.diffsync.diff import SyncNetworkDataDiff
 from nautobot_device_onboarding.diffsync.models import sync_network_data_models
+from nautobot_device_onboarding.diffsync.syncer import ChunkedTransactionAdapterMixin
 from nautobot_device_onboarding.nornir_plays.command_getter import (
     sync_network_data_command_getter,
 )
-from nautobot_device_onboarding.utils import diffsync_utils
+from nautobot_device_onboarding.utils import diffsync_utils, normalizer, query_statistics
+from nautobot_device_onboarding.utils.bulk_writer import InterfaceBulkWriter
+from nautobot_device_onboarding.utils.ip_reconciler import IPAddressReconciler
 
 app_settings = settings.PLUGINS_CONFIG["nautobot_device_onboarding"]
 
@@ -37,7 +42,7 @@ class FilteredNautobotAdapter(NautobotAdapter):
             self._load_single_object(database_object, diffsync_model, parameter_names)
 
 
-class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
+class SyncNetworkDataNautobotAdapter(ChunkedTransactionAdapterMixin, FilteredNautobotAdapter):
     """Adapter for loading Nautobot data."""
 
     device = sync_network_data_models.SyncNetworkDataDevice
@@ -53,6 +58,10 @@ class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
     cable = sync_network_data_models.SyncNetworkDataCable
 
     primary_ips = None
+    orm_cache = None
+    bulk_writer = None
+    ip_address_reconciler = None
+    vlan_index = None
 
     top_level = [
         "ip_address",
@@ -67,6 +76,65 @@ class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
         "cable",
     ]
 
+    def __init__(self, *args, job, sync=None, **kwargs):
+        """Instantiate this class, but do not load data immediately from the local system."""
+        super().__init__(*args, job=job, sync=sync, **kwargs)
+        self.orm_cache = job.orm_cache
+        if app_settings.get("sync_network_data_bulk_write"):
+            self.bulk_writer = InterfaceBulkWriter(
+                job=job, batch_size=app_settings.get("sync_network_data_bulk_batch_size", 500)
+            )
+
+    def invalidate_cache(self, zero_out_hits=True):
+        """Invalidates all the objects in the job's ORM cache."""
+        if self.orm_cache is not None:
+            self.orm_cache.invalidate(zero_out_hits=zero_out_hits)
+
+    def get_from_orm_cache(self, parameters: Dict, model_class: Type[Model]):
+        """Retrieve an object from the job's ORM cache or the ORM."""
+        return self.orm_cache.get(parameters, model_class)
+
+    def get_vlan_pk(self, location, vid, name):
+        """
+        Return the primary key of a VLAN, or None if the VLAN does not exist.
+
+        VLANs are looked up in a job-scoped index of (location, vid, name) to VLAN pk. The VLANs of a location are
+        loaded into the index with a single query the first time that location is looked up.
+        """
+        if self.vlan_index is None:
+            self.vlan_index = {}
+        location_pk = location.pk if location else None
+        if location_pk not in self.vlan_index:
+            self.vlan_index[location_pk] = {
+                (vlan_vid, vlan_name): vlan_pk
+                for vlan_pk, vlan_vid, vlan_name in VLAN.objects.filter(location=location).values_list(
+                    "pk", "vid", "name"
+                )
+            }
+        return self.vlan_index[location_pk].get((int(vid), name))
+
+    def add_vlan_to_index(self, vlan, location):
+        """Add a VLAN created during the sync to the VLAN index."""
+        location_pk = location.pk if location else None
+        if self.vlan_index is not None and location_pk in self.vlan_index:
+            self.vlan_index[location_pk][(int(vlan.vid), vlan.name)] = vlan.pk
+
+    def get_failed_create(self, model_name, unique_id):
+        """Return why the queued create of an object failed, or None if it didn't fail or wasn't queued."""
+        writer = {"interface": self.bulk_writer, "ip_address": self.ip_address_reconciler}.get(model_name)
+        if writer is None:
+            return None
+        return writer.failed_creates.get(unique_id)
+
+    def _cache_interfaces(self):
+        """
+        Add the interfaces of the devices being synced to the ORM cache.
+
+        Interfaces queued with the bulk writer are fetched from the cache instead of one query per interface.
+        """
+        for interface in Interface.objects.filter(device__in=self.job.devices_to_load):
+            self.orm_cache.set({"pk": interface.pk}, Interface, interface)
+
     def _cache_primary_ips(self, device_queryset):
         """
         Create a cache of primary ip address for devices.
@@ -75,7 +143,7 @@ class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
         of an interface, this cache is used to reset it in sync_complete().
         """
         self.primary_ips = {}
-        for device in device_queryset:
+        for device in device_queryset.select_related("primary_ip4", "primary_ip6"):
             self.primary_ips[device.id] = device.primary_ip.id
 
     def load_param_mac_address(self, parameter_name, database_object):
@@ -107,7 +175,7 @@ class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
         for ip_address in IPAddress.objects.filter(
             host__in=ip_address_hosts,
             parent__namespace__name=self.job.namespace.name,
-        ):
+        ).select_related("status"):
             network_ip_address = self.ip_address(
                 adapter=self,
                 host=ip_address.host,
@@ -131,7 +199,7 @@ class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
 
         Only Vlans that were returned by the CommandGetter job should be synced.
         """
-        for vlan in VLAN.objects.all():
+        for vlan in VLAN.objects.select_related("location"):
             network_vlan = self.vlan(
                 adapter=self,
                 name=vlan.name,
@@ -150,7 +218,11 @@ class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
 
         Only Vlan assignments that were returned by the CommandGetter job should be loaded.
         """
-        for interface in Interface.objects.filter(device__in=self.job.devices_to_load):
+        for interface in (
+            Interface.objects.filter(device__in=self.job.devices_to_load)
+            .select_related("device")
+            .prefetch_related("tagged_vlans")
+        ):
             tagged_vlans = []
             for vlan in interface.tagged_vlans.all():
                 vlan_dict = {}
@@ -173,7 +245,9 @@ class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
 
         Only UnTagged Vlan assignments that were returned by the CommandGetter job should be synced.
         """
-        for interface in Interface.objects.filter(device__in=self.job.devices_to_load):
+        for interface in Interface.objects.filter(device__in=self.job.devices_to_load).select_related(
+            "device", "untagged_vlan"
+        ):
             untagged_vlan = {}
             if interface.untagged_vlan:
                 untagged_vlan["name"] = interface.untagged_vlan.name
@@ -194,7 +268,7 @@ class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
 
         Only Lag assignments that were returned by the CommandGetter job should be synced.
         """
-        for interface in Interface.objects.filter(device__in=self.job.devices_to_load):
+        for interface in Interface.objects.filter(device__in=self.job.devices_to_load).select_related("device", "lag"):
             network_lag_to_interface = self.lag_to_interface(
                 adapter=self,
                 device__name=interface.device.name,
@@ -210,7 +284,7 @@ class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
 
         Only Vrfs that were returned by the CommandGetter job should be synced.
         """
-        for vrf in VRF.objects.all():
+        for vrf in VRF.objects.select_related("namespace"):
             network_vrf = self.vrf(
                 adapter=self,
                 name=vrf.name,
@@ -228,7 +302,7 @@ class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
 
         Only Vrf assignments that were returned by the CommandGetter job should be synced.
         """
-        for interface in Interface.objects.filter(device__in=self.job.devices_to_load):
+        for interface in Interface.objects.filter(device__in=self.job.devices_to_load).select_related("device", "vrf"):
             vrf = {}
             if interface.vrf:
                 vrf["name"] = interface.vrf.name
@@ -246,47 +320,55 @@ class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
         """
         Load Cables into diffsync store.
 
-        Only cables returned by the CommandGetter job should be synced.
+        Only cables returned by the CommandGetter job should be synced. The cables of all the devices are loaded in a
+        single query, using the devices Nautobot caches on each cable instead of a query per termination.
         """
-        for device in self.job.devices_to_load:
-            for cable in device.get_cables():
-                if cable.termination_b.device.name == "" or cable.termination_a.device.name == "":
-                    self.job.logger.warning(
-                        f"Device attached to a cable is missing a name. Devices must have a name to utilize cable onboarding. "
-                        f"Skipping Cable: {cable}"
-                    )
-                    continue
-                if cable.termination_a.device.name < cable.termination_b.device.name:
-                    termination_a_device = cable.termination_a.device.name
-                    termination_a_interface = cable.termination_a.name
-                    termination_b_device = cable.termination_b.device.name
-                    termination_b_interface = cable.termination_b.name
-                else:
-                    termination_a_device = cable.termination_b.device.name
-                    termination_a_interface = cable.termination_b.name
-                    termination_b_device = cable.termination_a.device.name
-                    termination_b_interface = cable.termination_a.name
-
-                network_cable = self.cable(
-                    adapter=self,
-                    status__name=cable.status.name,
-                    termination_a__app_label="dcim",
-                    termination_a__model="interface",
-                    termination_a__device__name=termination_a_device,
-                    termination_a__name=termination_a_interface,
-                    termination_b__app_label="dcim",
-                    termination_b__model="interface",
-                    termination_b__device__name=termination_b_device,
-                    termination_b__name=termination_b_interface,
+        devices = self.job.devices_to_load
+        cables = (
+            Cable.objects.filter(Q(_termination_a_device__in=devices) | Q(_termination_b_device__in=devices))
+            .select_related("status", "_termination_a_device", "_termination_b_device")
+            .prefetch_related("termination_a", "termination_b")
+        )
+        for cable in cables:
+            device_a = cable._termination_a_device  # pylint: disable=protected-access
+            device_b = cable._termination_b_device  # pylint: disable=protected-access
+            if not (device_a and device_a.name and device_b and device_b.name):
+                self.job.logger.warning(
+                    f"Device attached to a cable is missing a name. Devices must have a name to utilize cable onboarding. "
+                    f"Skipping Cable: {cable}"
                 )
+                continue
+            if device_a.name < device_b.name:
+                termination_a_device = device_a.name
+                termination_a_interface = cable.termination_a.name
+                termination_b_device = device_b.name
+                termination_b_interface = cable.termination_b.name
+            else:
+                termination_a_device = device_b.name
+                termination_a_interface = cable.termination_b.name
+                termination_b_device = device_a.name
+                termination_b_interface = cable.termination_a.name
 
-                try:
-                    self.add(network_cable)
-                    network_cable.pk = cable.pk
-                    if self.job.debug:
-                        self.job.logger.debug(f"Loaded Cable: {network_cable}")
-                except diffsync.exceptions.ObjectAlreadyExists:
-                    continue
+            network_cable = self.cable(
+                adapter=self,
+                status__name=cable.status.name,
+                termination_a__app_label="dcim",
+                termination_a__model="interface",
+                termination_a__device__name=termination_a_device,
+                termination_a__name=termination_a_interface,
+                termination_b__app_label="dcim",
+                termination_b__model="interface",
+                termination_b__device__name=termination_b_device,
+                termination_b__name=termination_b_interface,
+            )
+
+            try:
+                self.add(network_cable)
+                network_cable.pk = cable.pk
+                if self.job.debug:
+                    self.job.logger.debug(f"Loaded Cable: {network_cable}")
+            except diffsync.exceptions.ObjectAlreadyExists:
+                continue
 
     def load(self):
         """Generic implementation of the load function."""
@@ -294,32 +376,62 @@ class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
             raise ValueError("'top_level' needs to be set on the class.")
 
         self._cache_primary_ips(device_queryset=self.job.devices_to_load)
+        if app_settings.get("sync_network_data_bulk_write"):
+            self.ip_address_reconciler = IPAddressReconciler(
+                job=self.job,
+                namespace=self.job.namespace,
+                default_ip_status=self.job.ip_address_status,
+                default_prefix_status=self.job.default_prefix_status,
+                batch_size=app_settings.get("sync_network_data_bulk_batch_size", 500),
+            )
         for model_name in self.top_level:
-            if model_name == "ip_address":
-                self.load_ip_addresses()
-            elif model_name == "vlan":
-                if self.job.sync_vlans:
-                    self.load_vlans()
-            elif model_name == "vrf":
-                if self.job.sync_vrfs:
-                    self.load_vrfs()
-            elif model_name == "tagged_vlans_to_interface":
-                if self.job.sync_vlans:
-                    self.load_tagged_vlans_to_interface()
-            elif model_name == "untagged_vlan_to_interface":
-                if self.job.sync_vlans:
-                    self.load_untagged_vlan_to_interface()
-            elif model_name == "lag_to_interface":
-                self.load_lag_to_interface()
-            elif model_name == "vrf_to_interface":
-                if self.job.sync_vrfs:
-                    self.load_vrf_to_interface()
-            elif model_name == "cable":
-                if self.job.sync_cables:
-                    self.load_cables()
-            else:
-                diffsync_model = self._get_diffsync_class(model_name)
-                self._load_objects(diffsync_model)
+            with query_statistics.model_scope(model_name):
+                if model_name == "ip_address":
+                    self.load_ip_addresses()
+                elif model_name == "vlan":
+                    if self.job.sync_vlans:
+                        self.load_vlans()
+                elif model_name == "vrf":
+                    if self.job.sync_vrfs:
+                        self.load_vrfs()
+                elif model_name == "tagged_vlans_to_interface":
+                    if self.job.sync_vlans:
+                        self.load_tagged_vlans_to_interface()
+                elif model_name == "untagged_vlan_to_interface":
+                    if self.job.sync_vlans:
+                        self.load_untagged_vlan_to_interface()
+                elif model_name == "lag_to_interface":
+                    self.load_lag_to_interface()
+                elif model_name == "vrf_to_interface":
+                    if self.job.sync_vrfs:
+                        self.load_vrf_to_interface()
+                elif model_name == "cable":
+                    if self.job.sync_cables:
+                        self.load_cables()
+                else:
+                    diffsync_model = self._get_diffsync_class(model_name)
+                    self._load_objects(diffsync_model)
+        if self.bulk_writer:
+            self._cache_interfaces()
+
+    def _flush_queued_writes(self, group=None):
+        """Write any IP addresses and interfaces that are still queued."""
+        if self.ip_address_reconciler:
+            self.ip_address_reconciler.flush()
+        if self.bulk_writer:
+            self.bulk_writer.flush()
+
+    def sync_from(self, source, diff_class=SyncNetworkDataDiff, flags=DiffSyncFlags.NONE, callback=None, diff=None):
+        """Sync data from the network adapter, flushing queued writes after each run of a model group."""
+        if not diff:
+            diff = self.diff_from(source, diff_class=diff_class, flags=flags, callback=callback)
+        if isinstance(diff, SyncNetworkDataDiff):
+            diff.group_complete_callbacks.append(self._flush_queued_writes)
+        diff = super().sync_from(source, diff_class=diff_class, flags=flags, callback=callback, diff=diff)
+        self._flush_queued_writes()
+        if self.bulk_writer:
+            self.bulk_writer.log_summary()
+        return diff
 
     def sync_complete(self, source, diff, *args, **kwargs):
         """
@@ -331,9 +443,11 @@ class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
 
         This method only runs if data was changed.
         """
+        self._flush_queued_writes()
         if self.job.debug:
             self.job.logger.debug("Sync Complete method called, checking for missing primary ip addresses...")
-        for device in self.job.devices_to_load.all():  # refresh queryset after sync is complete
+        # refresh queryset after sync is complete
+        for device in self.job.devices_to_load.all().select_related("primary_ip4", "primary_ip6"):
             if not device.primary_ip:
                 ip_address = ""
                 try:
@@ -366,12 +480,6 @@ class SyncNetworkDataNautobotAdapter(FilteredNautobotAdapter):
         return super().sync_complete(source, diff, *args, **kwargs)
 
 
-class MacUnixExpandedUppercase(mac_unix_expanded):
-    """Mac Unix Expanded Uppercase."""
-
-    word_fmt = "%.2X"
-
-
 class SyncNetworkDataNetworkAdapter(diffsync.Adapter):
     """Adapter for loading Network data."""
 
@@ -465,39 +573,54 @@ class SyncNetworkDataNetworkAdapter(diffsync.Adapter):
                 "Data returned from CommandGetter is not the correct type. No devices will be onboarded"
             )
             raise ValidationError("Unexpected data returned from CommandGetter.")
-
-    def _process_mac_address(self, mac_address):
-        """Convert a mac address to match the value stored by Nautobot."""
-        if mac_address:
-            return str(EUI(mac_address, version=48, dialect=MacUnixExpandedUppercase))
-        return ""
+        self.job.memory_snapshots.take("collection", {"command_getter_result": self.job.command_getter_result})
+
+    def diff_to(self, target, diff_class=SyncNetworkDataDiff, flags=DiffSyncFlags.NONE, callback=None):
+        """Calculate the diff to Nautobot, per device in a process pool if `sync_network_data_diff_processes` is set."""
+        processes = app_settings.get("sync_network_data_diff_processes", 0)
+        if not processes:
+            return super().diff_to(target, diff_class=diff_class, flags=flags, callback=callback)
+        self.job.logger.info(f"Calculating diffs in {processes} processes...")
+        return parallel_diff.calculate_diff(self, target, diff_class=diff_class, flags=flags, processes=processes)
+
+    def _load_device(self, hostname, device_data):
+        """Load a device into the DiffSync store, returning None if it failed to load."""
+        try:
+            network_device = self.device(
+                adapter=self,
+                name=hostname,
+                serial=device_data["serial"],
+                last_network_data_sync=datetime.datetime.now().date().isoformat(),
+            )
+            self.add(network_device)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self._handle_general_load_exception(error=err, hostname=hostname, data=device_data, model_type="device")
+            return None
+        return network_device
+
+    def _load_device_interface(  # pylint: disable=too-many-arguments
+        self, network_device, hostname, device_data, interface_name, interface_data
+    ):
+        """Load an interface into the DiffSync store as a child of its device."""
+        try:
+            network_interface = self.load_interface(hostname, interface_name, interface_data)
+            network_device.add_child(network_interface)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self._handle_general_load_exception(
+                error=err,
+                hostname=hostname,
+                data=device_data,
+                model_type="interface",
+            )
 
     def load_devices(self):
         """Load devices into the DiffSync store."""
         for hostname, device_data in self.job.command_getter_result.items():
-            try:
-                network_device = self.device(
-                    adapter=self,
-                    name=hostname,
-                    serial=device_data["serial"],
-                    last_network_data_sync=datetime.datetime.now().date().isoformat(),
-                )
-                self.add(network_device)
-            except Exception as err:  # pylint: disable=broad-exception-caught
-                self._handle_general_load_exception(error=err, hostname=hostname, data=device_data, model_type="device")
+            network_device = self._load_device(hostname, device_data)
+            if not network_device:
                 continue
             for interface_name, interface_data in device_data["interfaces"].items():
-                try:
-                    network_interface = self.load_interface(hostname, interface_name, interface_data)
-                    network_device.add_child(network_interface)
-                except Exception as err:  # pylint: disable=broad-exception-caught
-                    self._handle_general_load_exception(
-                        error=err,
-                        hostname=hostname,
-                        data=device_data,
-                        model_type="interface",
-                    )
-                    continue
+                self._load_device_interface(network_device, hostname, device_data, interface_name, interface_data)
 
     # def _get_vlan_name(self, interface_data):
     #     """Given interface data returned from a device, process and return the vlan name."""
@@ -507,15 +630,20 @@ class SyncNetworkDataNetworkAdapter(diffsync.Adapter):
     #     return vlan_name
 
     def load_interface(self, hostname, interface_name, interface_data):
-        """Load an interface into the DiffSync store."""
+        """
+        Load an interface into the DiffSync store, its MAC address and MTU were normalized by `load()`.
+
+        Raises the error normalizing its MAC address if it is invalid, the interface isn't loaded.
+        """
+        normalizer.check_interface(interface_data)
         network_interface = self.interface(
             adapter=self,
             name=interface_name,
             device__name=hostname,
             status__name=self.job.interface_status.name,
             type=interface_data["type"],
-            mac_address=self._process_mac_address(mac_address=interface_data["mac_address"]),
-            mtu=interface_data["mtu"] if interface_data["mtu"] else "1500",
+            mac_address=interface_data["mac_address"],
+            mtu=interface_data["mtu"],
             description=interface_data["description"],
             enabled=interface_data["link_status"],
             mode=interface_data["802.1Q_mode"],
@@ -526,256 +654,285 @@ class SyncNetworkDataNetworkAdapter(diffsync.Adapter):
         self.add(network_interface)
         return network_interface
 
+    def _load_interface_ip_addresses(self, hostname, device_data, interface_name, interface_data):
+        """Load the IP addresses of an interface into the DiffSync store."""
+        if not interface_data["ip_addresses"]:
+            return
+        for ip_address in interface_data["ip_addresses"]:
+            if ip_address["ip_address"]:  # the ip_address and mask_length may be empty, skip these
+                if self.job.debug:
+                    self.job.logger.debug(f"Loading {ip_address} from {interface_name} on {hostname}")
+                try:
+                    network_ip_address = self.ip_address(
+                        adapter=self,
+                        host=ip_address["ip_address"],
+                        mask_length=int(ip_address["prefix_length"]),
+                        type="host",
+                        ip_version=4,
+                        status__name=self.job.ip_address_status.name,
+                    )
+                    self.add(network_ip_address)
+                except diffsync.exceptions.ObjectAlreadyExists:
+                    self.job.logger.warning(
+                        f"{network_ip_address} is already loaded to the DiffSync store. This is a duplicate IP Address."
+                    )
+                    continue
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    self._handle_general_load_exception(
+                        error=err,
+                        hostname=hostname,
+                        data=device_data,
+                        model_type="ip_address",
+                    )
+                    continue
+
     def load_ip_addresses(self):
         """Load IP addresses into the DiffSync store."""
-        for (  # pylint: disable=too-many-nested-blocks
-            hostname,
-            device_data,
-        ) in self.job.command_getter_result.items():
+        for hostname, device_data in self.job.command_getter_result.items():
             if self.job.debug:
                 self.job.logger.debug(f"Loading IP Addresses from {hostname}")
-            # for interface in device_data["interfaces"]:
             for interface_name, interface_data in device_data["interfaces"].items():
-                if interface_data["ip_addresses"]:
-                    for ip_address in interface_data["ip_addresses"]:
-                        if ip_address["ip_address"]:  # the ip_address and mask_length may be empty, skip these
-                            if self.job.debug:
-                                self.job.logger.debug(f"Loading {ip_address} from {interface_name} on {hostname}")
-                            try:
-                                network_ip_address = self.ip_address(
-                                    adapter=self,
-                                    host=ip_address["ip_address"],
-                                    mask_length=int(ip_address["prefix_length"]),
-                                    type="host",
-                                    ip_version=4,
-                                    status__name=self.job.ip_address_status.name,
-                                )
-                                self.add(network_ip_address)
-                            except diffsync.exceptions.ObjectAlreadyExists:
-                                self.job.logger.warning(
-                                    f"{network_ip_address} is already loaded to the "
-                                    "DiffSync store. This is a duplicate IP Address."
-                                )
-                                continue
-                            except (
-                                Exception  # pylint: disable=broad-exception-caught
-                            ) as err:
-                                self._handle_general_load_exception(
-                                    error=err,
-                                    hostname=hostname,
-                                    data=device_data,
-                                    model_type="ip_address",
-                                )
-                                continue
+                self._load_interface_ip_addresses(hostname, device_data, interface_name, interface_data)
+
+    def _get_location_names(self):
+        """Return the location name of each device to load, by device name."""
+        return dict(self.job.devices_to_load.values_list("name", "location__name"))
+
+    def _load_interface_vlans(self, hostname, device_data, interface_data, location_name):
+        """Load the tagged and untagged vlans of an interface into the Diffsync store."""
+        # add tagged vlans
+        for tagged_vlan in interface_data["tagged_vlans"]:
+            try:
+                network_vlan = self.vlan(
+                    adapter=self,
+                    name=tagged_vlan["name"],
+                    vid=tagged_vlan["id"],
+                    location__name=location_name,
+                )
+                self.add(network_vlan)
+            except diffsync.exceptions.ObjectAlreadyExists:
+                continue
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                self._handle_general_load_exception(
+                    error=err,
+                    hostname=hostname,
+                    data=device_data,
+                    model_type="vlan",
+                )
+                continue
+        # check for untagged vlan and add if necessary, skip VLAN 0
+        if interface_data["untagged_vlan"] and interface_data["untagged_vlan"].get("id") == "0":
+            self.job.logger.warning("Interface with untagged vlan 0 found. Skipping untagged vlan load.")
+            return
+        try:
+            network_vlan = self.vlan(
+                adapter=self,
+                name=interface_data["untagged_vlan"]["name"],
+                vid=interface_data["untagged_vlan"]["id"],
+                location__name=location_name,
+            )
+            self.add(network_vlan)
+        except diffsync.exceptions.ObjectAlreadyExists:
+            pass
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self._handle_general_load_exception(
+                error=err,
+                hostname=hostname,
+                data=device_data,
+                model_type="vlan",
+            )
 
     def load_vlans(self):
         """Load vlans into the Diffsync store."""
-        location_names = {}
-        for device in self.job.devices_to_load:
-            location_names[device.name] = device.location.name
-
-        for (
-            hostname,
-            device_data,
-        ) in self.job.command_getter_result.items():  # pylint: disable=too-many-nested-blocks
+        location_names = self._get_location_names()
+        for hostname, device_data in self.job.command_getter_result.items():
             if self.job.debug:
                 self.job.logger.debug(f"Loading Vlans from {hostname}")
-            # for interface in device_data["interfaces"]:
             for _, interface_data in device_data["interfaces"].items():
-                # add tagged vlans
-                for tagged_vlan in interface_data["tagged_vlans"]:
-                    try:
-                        network_vlan = self.vlan(
-                            adapter=self,
-                            name=tagged_vlan["name"],
-                            vid=tagged_vlan["id"],
-                            location__name=location_names.get(hostname, ""),
-                        )
-                        self.add(network_vlan)
-                    except diffsync.exceptions.ObjectAlreadyExists:
-                        continue
-                    except Exception as err:  # pylint: disable=broad-exception-caught
-                        self._handle_general_load_exception(
-                            error=err,
-                            hostname=hostname,
-                            data=device_data,
-                            model_type="vlan",
-                        )
-                        continue
-                # check for untagged vlan and add if necessary, skip VLAN 0
-                if interface_data["untagged_vlan"] and interface_data["untagged_vlan"].get("id") == "0":
-                    self.job.logger.warning("Interface with untagged vlan 0 found. Skipping untagged vlan load.")
-                    continue
+                self._load_interface_vlans(hostname, device_data, interface_data, location_names.get(hostname, ""))
+
+    def _load_interface_vrf(self, hostname, device_data, interface_data):
+        """Load the vrf of an interface into the Diffsync store."""
+        if not interface_data["vrf"]:
+            return
+        try:
+            network_vrf = self.vrf(
+                adapter=self,
+                name=interface_data["vrf"]["name"],
+                namespace__name=self.job.namespace.name,
+            )
+            self.add(network_vrf)
+        except diffsync.exceptions.ObjectAlreadyExists:
+            pass
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self._handle_general_load_exception(
+                error=err,
+                hostname=hostname,
+                data=device_data,
+                model_type="vrf",
+            )
+
+    def load_vrfs(self):
+        """Load vrfs into the Diffsync store."""
+        for hostname, device_data in self.job.command_getter_result.items():
+            if self.job.debug:
+                self.job.logger.debug(f"Loading Vrfs from {hostname}")
+            for _, interface_data in device_data["interfaces"].items():
+                self._load_interface_vrf(hostname, device_data, interface_data)
+
+    def _load_ip_address_to_interface(self, hostname, device_data, interface_name, interface_data):
+        """Load the ip address assignments of an interface into the Diffsync store."""
+        for ip_address in interface_data["ip_addresses"]:
+            if ip_address["ip_address"]:  # the ip_address and mask_length may be empty, skip these
                 try:
-                    network_vlan = self.vlan(
+                    network_ip_address_to_interface = self.ipaddress_to_interface(
                         adapter=self,
-                        name=interface_data["untagged_vlan"]["name"],
-                        vid=interface_data["untagged_vlan"]["id"],
-                        location__name=location_names.get(hostname, ""),
+                        interface__device__name=hostname,
+                        interface__name=interface_name,
+                        ip_address__host=ip_address["ip_address"],
+                        ip_address__mask_length=(
+                            int(ip_address["prefix_length"]) if ip_address["prefix_length"] else None
+                        ),
                     )
-                    self.add(network_vlan)
-                except diffsync.exceptions.ObjectAlreadyExists:
-                    continue
+                    self.add(network_ip_address_to_interface)
                 except Exception as err:  # pylint: disable=broad-exception-caught
                     self._handle_general_load_exception(
                         error=err,
                         hostname=hostname,
                         data=device_data,
-                        model_type="vlan",
+                        model_type="ip_address to interface",
                     )
                     continue
 
-    def load_vrfs(self):
-        """Load vrfs into the Diffsync store."""
-        for (
-            hostname,
-            device_data,
-        ) in self.job.command_getter_result.items():  # pylint: disable=too-many-nested-blocks
-            if self.job.debug:
-                self.job.logger.debug(f"Loading Vrfs from {hostname}")
-            # for interface in device_data["interfaces"]:
-            for _, interface_data in device_data["interfaces"].items():
-                if interface_data["vrf"]:
-                    try:
-                        network_vrf = self.vrf(
-                            adapter=self,
-                            name=interface_data["vrf"]["name"],
-                            namespace__name=self.job.namespace.name,
-                        )
-                        self.add(network_vrf)
-                    except diffsync.exceptions.ObjectAlreadyExists:
-                        continue
-                    except Exception as err:  # pylint: disable=broad-exception-caught
-                        self._handle_general_load_exception(
-                            error=err,
-                            hostname=hostname,
-                            data=device_data,
-                            model_type="vrf",
-                        )
-                        continue
-
     def load_ip_address_to_interfaces(self):
         """Load ip address interface assignments into the Diffsync store."""
-        for (
-            hostname,
-            device_data,
-        ) in self.job.command_getter_result.items():  # pylint: disable=too-many-nested-blocks
+        for hostname, device_data in self.job.command_getter_result.items():
             for interface_name, interface_data in device_data["interfaces"].items():
-                for ip_address in interface_data["ip_addresses"]:
-                    if ip_address["ip_address"]:  # the ip_address and mask_length may be empty, skip these
-                        try:
-                            network_ip_address_to_interface = self.ipaddress_to_interface(
-                                adapter=self,
-                                interface__device__name=hostname,
-                                interface__name=interface_name,
-                                ip_address__host=ip_address["ip_address"],
-                                ip_address__mask_length=(
-                                    int(ip_address["prefix_length"]) if ip_address["prefix_length"] else None
-                                ),
-                            )
-                            self.add(network_ip_address_to_interface)
-                        except (
-                            Exception  # pylint: disable=broad-exception-caught
-                        ) as err:
-                            self._handle_general_load_exception(
-                                error=err,
-                                hostname=hostname,
-                                data=device_data,
-                                model_type="ip_address to interface",
-                            )
-                            continue
+                self._load_ip_address_to_interface(hostname, device_data, interface_name, interface_data)
+
+    def _load_tagged_vlans_to_interface(self, hostname, device_data, interface_name, interface_data):
+        """Load the tagged vlan assignments of an interface into the Diffsync store."""
+        try:
+            network_tagged_vlans_to_interface = self.tagged_vlans_to_interface(
+                adapter=self,
+                device__name=hostname,
+                name=interface_name,
+                tagged_vlans=interface_data["tagged_vlans"],
+            )
+            self.add(network_tagged_vlans_to_interface)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self._handle_general_load_exception(
+                error=err,
+                hostname=hostname,
+                data=device_data,
+                model_type="tagged vlan to interface",
+            )
 
     def load_tagged_vlans_to_interface(self):
         """Load tagged vlan to interface assignments into the Diffsync store."""
         for hostname, device_data in self.job.command_getter_result.items():
-            # for interface in device_data["interfaces"]:
             for interface_name, interface_data in device_data["interfaces"].items():
-                try:
-                    network_tagged_vlans_to_interface = self.tagged_vlans_to_interface(
-                        adapter=self,
-                        device__name=hostname,
-                        name=interface_name,
-                        tagged_vlans=interface_data["tagged_vlans"],
-                    )
-                    self.add(network_tagged_vlans_to_interface)
-                except Exception as err:  # pylint: disable=broad-exception-caught
-                    self._handle_general_load_exception(
-                        error=err,
-                        hostname=hostname,
-                        data=device_data,
-                        model_type="tagged vlan to interface",
-                    )
-                    continue
+                self._load_tagged_vlans_to_interface(hostname, device_data, interface_name, interface_data)
+
+    def _load_untagged_vlan_to_interface(self, hostname, device_data, interface_name, interface_data):
+        """Load the untagged vlan assignment of an interface into the Diffsync store."""
+        try:
+            if interface_data["untagged_vlan"] and interface_data["untagged_vlan"].get("id") == "0":
+                self.job.logger.warning("Interface with untagged vlan 0 found. Skipping untagged vlan load.")
+                return
+            network_untagged_vlan_to_interface = self.untagged_vlan_to_interface(
+                adapter=self,
+                device__name=hostname,
+                name=interface_name,
+                untagged_vlan=interface_data["untagged_vlan"],
+            )
+            self.add(network_untagged_vlan_to_interface)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self._handle_general_load_exception(
+                error=err,
+                hostname=hostname,
+                data=device_data,
+                model_type="untagged vlan to interface",
+            )
 
     def load_untagged_vlan_to_interface(self):
         """Load untagged vlan to interface assignments into the Diffsync store."""
         for hostname, device_data in self.job.command_getter_result.items():
-            # for interface in device_data["interfaces"]:
             for interface_name, interface_data in device_data["interfaces"].items():
-                try:
-                    if interface_data["untagged_vlan"] and interface_data["untagged_vlan"].get("id") == "0":
-                        self.job.logger.warning("Interface with untagged vlan 0 found. Skipping untagged vlan load.")
-                        continue
-                    network_untagged_vlan_to_interface = self.untagged_vlan_to_interface(
-                        adapter=self,
-                        device__name=hostname,
-                        name=interface_name,
-                        untagged_vlan=interface_data["untagged_vlan"],
-                    )
-                    self.add(network_untagged_vlan_to_interface)
+                self._load_untagged_vlan_to_interface(hostname, device_data, interface_name, interface_data)
 
-                except Exception as err:  # pylint: disable=broad-exception-caught
-                    self._handle_general_load_exception(
-                        error=err,
-                        hostname=hostname,
-                        data=device_data,
-                        model_type="untagged vlan to interface",
-                    )
-                    continue
+    def _load_lag_to_interface(self, hostname, device_data, interface_name, interface_data):
+        """Load the lag assignment of an interface into the Diffsync store."""
+        try:
+            network_lag_to_interface = self.lag_to_interface(
+                adapter=self,
+                device__name=hostname,
+                name=interface_name,
+                lag__interface__name=(interface_data["lag"] if interface_data["lag"] else ""),
+            )
+            self.add(network_lag_to_interface)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self._handle_general_load_exception(
+                error=err,
+                hostname=hostname,
+                data=device_data,
+                model_type="lag to interface",
+            )
 
     def load_lag_to_interface(self):
         """Load lag interface assignments into the Diffsync store."""
         for hostname, device_data in self.job.command_getter_result.items():
-            # for interface in device_data["interfaces"]:
             for interface_name, interface_data in device_data["interfaces"].items():
-                try:
-                    network_lag_to_interface = self.lag_to_interface(
-                        adapter=self,
-                        device__name=hostname,
-                        name=interface_name,
-                        lag__interface__name=(interface_data["lag"] if interface_data["lag"] else ""),
-                    )
-                    self.add(network_lag_to_interface)
-                except Exception as err:  # pylint: disable=broad-exception-caught
-                    self._handle_general_load_exception(
-                        error=err,
-                        hostname=hostname,
-                        data=device_data,
-                        model_type="lag to interface",
-                    )
-                    continue
+                self._load_lag_to_interface(hostname, device_data, interface_name, interface_data)
+
+    def _load_vrf_to_interface(self, hostname, device_data, interface_name, interface_data):
+        """Load the vrf assignment of an interface into the Diffsync store."""
+        try:
+            network_vrf_to_interface = self.vrf_to_interface(
+                adapter=self,
+                device__name=hostname,
+                name=interface_name,
+                vrf=interface_data["vrf"],
+            )
+            self.add(network_vrf_to_interface)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self._handle_general_load_exception(
+                error=err,
+                hostname=hostname,
+                data=device_data,
+                model_type="vrf to interface",
+            )
 
     def load_vrf_to_interface(self):
         """Load Vrf to interface assignments into the Diffsync store."""
         for hostname, device_data in self.job.command_getter_result.items():
-            # for interface in device_data["interfaces"]:
             for interface_name, interface_data in device_data["interfaces"].items():
-                try:
-                    network_vrf_to_interface = self.vrf_to_interface(
-                        adapter=self,
-                        device__name=hostname,
-                        name=interface_name,
-                        vrf=interface_data["vrf"],
-                    )
-                    self.add(network_vrf_to_interface)
-                except Exception as err:  # pylint: disable=broad-exception-caught
-                    self._handle_general_load_exception(
-                        error=err,
-                        hostname=hostname,
-                        data=device_data,
-                        model_type="vrf to interface",
-                    )
-                    continue
+                self._load_vrf_to_interface(hostname, device_data, interface_name, interface_data)
+
+    def load_device_data(self, hostname, device_data, location_name=""):
+        """
+        Load every enabled model of a device into the DiffSync store in a single pass over its interfaces.
+
+        This is equivalent to calling each of the `load_*` methods above for a single device.
+        """
+        if self.job.debug:
+            self.job.logger.debug(f"Loading network data from {hostname}")
+        network_device = self._load_device(hostname, device_data)
+        for interface_name, interface_data in device_data["interfaces"].items():
+            self._load_interface_ip_addresses(hostname, device_data, interface_name, interface_data)
+            if self.job.sync_vlans:
+                self._load_interface_vlans(hostname, device_data, interface_data, location_name)
+            if self.job.sync_vrfs:
+                self._load_interface_vrf(hostname, device_data, interface_data)
+            if network_device:
+                self._load_device_interface(network_device, hostname, device_data, interface_name, interface_data)
+            self._load_ip_address_to_interface(hostname, device_data, interface_name, interface_data)
+            if self.job.sync_vlans:
+                self._load_tagged_vlans_to_interface(hostname, device_data, interface_name, interface_data)
+                self._load_untagged_vlan_to_interface(hostname, device_data, interface_name, interface_data)
+            self._load_lag_to_interface(hostname, device_data, interface_name, interface_data)
+            if self.job.sync_vrfs:
+                self._load_vrf_to_interface(hostname, device_data, interface_name, interface_data)
 
     def load_cables(self):  # pylint: disable=inconsistent-return-statements
         """Load cables into the Diffsync store."""
@@ -792,7 +949,7 @@ class SyncNetworkDataNetworkAdapter(diffsync.Adapter):
             try:
                 for neighbor_data in device_data["cables"]:
                     try:
-                        local_interface = canonical_interface_name(neighbor_data["local_interface"])
+                        local_interface = neighbor_data["local_interface"]
                     except KeyError as error:
                         error.args = error.args + "Local interface is missing a name."
                         self._handle_general_load_exception(
@@ -804,7 +961,7 @@ class SyncNetworkDataNetworkAdapter(diffsync.Adapter):
                         continue
 
                     try:
-                        remote_interface = canonical_interface_name(neighbor_data["remote_interface"])
+                        remote_interface = neighbor_data["remote_interface"]
                     except KeyError as error:
                         error.args = error.args + "Remote interface is missing a name."
                         self._handle_general_load_exception(
@@ -876,18 +1033,10 @@ class SyncNetworkDataNetworkAdapter(diffsync.Adapter):
     def load(self):
         """Load network data."""
         self.execute_command_getter()
-        self.load_ip_addresses()
-        if self.job.sync_vlans:
-            self.load_vlans()
-        if self.job.sync_vrfs:
-            self.load_vrfs()
-        self.load_devices()
-        self.load_ip_address_to_interfaces()
-        if self.job.sync_vlans:
-            self.load_tagged_vlans_to_interface()
-            self.load_untagged_vlan_to_interface()
-        self.load_lag_to_interface()
-        if self.job.sync_vrfs:
-            self.load_vrf_to_interface()
+        normalizer.normalize_network_data(self.job.command_getter_result)
+        self.job.memory_snapshots.take("normalize", {"command_getter_result": self.job.command_getter_result})
+        location_names = self._get_location_names() if self.job.sync_vlans else {}
+        for hostname, device_data in self.job.command_getter_result.items():
+            self.load_device_data(hostname, device_data, location_name=location_names.get(hostname, ""))
         if self.job.sync_cables:
             self.load_cables()
@@ -0,0 +1,79 @@
+"""DiffSync diff classes."""
+
+from collections import defaultdict
+
+from diffsync.diff import Diff
+
+
+def get_device_name(obj_type, keys):
+    """Return the name of the device a diffsync object belongs to, or None if it isn't specific to one device."""
+    if obj_type == "device":
+        return keys["name"]
+    for key in ("device__name", "interface__device__name"):
+        if key in keys:
+            return keys[key]
+    return None
+
+
+class SyncNetworkDataDiff(Diff):
+    """
+    Diff used by the Sync Network Data job.
+
+    Elements are synced device by device: the groups preceding the device group (IP addresses, VLANs, VRFs) are
+    synced first, then the device, its interfaces and its interface assignments, one device at a time, and finally
+    the groups that span several devices (cables). This keeps the writes of each device together, so they can be
+    committed in a single transaction.
+
+    Callbacks registered in `group_complete_callbacks` are called with the group name once a run of elements of that
+    group has been synced. Models synced later in the run (e.g. IP address to interface assignments) depend on the
+    interfaces synced earlier, so queued bulk writes are flushed from here.
+    """
+
+    device_groups = (
+        "device",
+        "ipaddress_to_interface",
+        "untagged_vlan_to_interface",
+        "tagged_vlans_to_interface",
+        "lag_to_interface",
+        "vrf_to_interface",
+    )
+
+    def __init__(self):
+        """Initialize the diff."""
+        super().__init__()
+        self.group_complete_callbacks = []
+
+    def _group_complete(self, group):
+        """Call the group complete callbacks."""
+        for callback in self.group_complete_callbacks:
+            callback(group)
+
+    def _ordered_children(self, group):
+        """Iterate over the child elements of a group in order."""
+        order_method = getattr(self, f"order_children_{group}", self.order_children_default)
+        yield from order_method(self.children[group])
+
+    def get_children(self):
+        """Iterate over all child elements, device by device, calling the callbacks after each run of a group."""
+        groups = self.groups()
+        device_groups = [group for group in groups if group in self.device_groups]
+        first_device_group = groups.index(device_groups[0]) if device_groups else len(groups)
+
+        for group in groups[:first_device_group]:
+            yield from self._ordered_children(group)
+            self._group_complete(group)
+
+        elements_by_device = defaultdict(lambda: defaultdict(list))
+        for group in device_groups:
+            for element in self._ordered_children(group):
+                elements_by_device[get_device_name(element.type, element.keys)][group].append(element)
+        for device_elements in elements_by_device.values():
+            for group in device_groups:
+                if device_elements[group]:
+                    yield from device_elements[group]
+                    self._group_complete(group)
+
+        for group in groups[first_device_group:]:
+            if group not in self.device_groups:
+                yield from self._ordered_children(group)
+                self._group_complete(group)
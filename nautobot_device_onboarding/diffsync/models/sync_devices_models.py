@@ -62,7 +62,7 @@ class SyncDevicesDevice(DiffSyncModel):
             location = diffsync_utils.retrieve_submitted_value(
                 job=adapter.job, ip_address=attrs["primary_ip4__host"], query_string="location"
             )
-            platform = Platform.objects.get(name=attrs["platform__name"])
+            platform = adapter.get_from_orm_cache({"name": attrs["platform__name"]}, Platform)
             device = Device.objects.get(name=ids["name"], location=location)
             update_devices_without_primary_ip = diffsync_utils.retrieve_submitted_value(
                 job=adapter.job,
@@ -95,7 +95,7 @@ class SyncDevicesDevice(DiffSyncModel):
                 role=diffsync_utils.retrieve_submitted_value(
                     job=adapter.job, ip_address=attrs["primary_ip4__host"], query_string="device_role"
                 ),
-                device_type=DeviceType.objects.get(model=attrs["device_type__model"]),
+                device_type=adapter.get_from_orm_cache({"model": attrs["device_type__model"]}, DeviceType),
                 name=ids["name"],
                 platform=platform,
                 secrets_group=diffsync_utils.retrieve_submitted_value(
@@ -171,7 +171,7 @@ class SyncDevicesDevice(DiffSyncModel):
             ip_address=attrs["primary_ip4__host"],
             query_string="device_role",
         )
-        device.device_type = DeviceType.objects.get(model=attrs["device_type__model"])
+        device.device_type = adapter.get_from_orm_cache({"model": attrs["device_type__model"]}, DeviceType)
         device.platform = platform
         device.secrets_group = diffsync_utils.retrieve_submitted_value(
             job=adapter.job,
@@ -254,15 +254,15 @@ class SyncDevicesDevice(DiffSyncModel):
         if self.adapter.job.debug:
             self.adapter.job.logger.debug(f"Updating {device.name} with attrs: {attrs}")
         if attrs.get("device_type__model"):
-            device.device_type = DeviceType.objects.get(model=attrs.get("device_type__model"))
+            device.device_type = self.adapter.get_from_orm_cache({"model": attrs["device_type__model"]}, DeviceType)
         if attrs.get("platform__name"):
-            device.platform = Platform.objects.get(name=attrs.get("platform__name"))
+            device.platform = self.adapter.get_from_orm_cache({"name": attrs["platform__name"]}, Platform)
         if attrs.get("role__name"):
-            device.role = Role.objects.get(name=attrs.get("role__name"))
+            device.role = self.adapter.get_from_orm_cache({"name": attrs["role__name"]}, Role)
         if attrs.get("status__name"):
-            device.status = Status.objects.get(name=attrs.get("status__name"))
+            device.status = self.adapter.get_from_orm_cache({"name": attrs["status__name"]}, Status)
         if attrs.get("secrets_group__name"):
-            device.secrets_group = SecretsGroup.objects.get(name=attrs.get("secrets_group__name"))
+            device.secrets_group = self.adapter.get_from_orm_cache({"name": attrs["secrets_group__name"]}, SecretsGroup)
 
         if attrs.get("interfaces"):
             # Update both the interface and primary ip address
@@ -1,5 +1,6 @@
 """Diffsync models."""
 
+from collections import defaultdict
 from typing import List, Optional
 
 try:
@@ -10,7 +11,8 @@ except ImportError:
 from diffsync import Adapter, DiffSyncModel
 from diffsync import exceptions as diffsync_exceptions
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist, ValidationError
-from nautobot.dcim.choices import InterfaceTypeChoices
+from django.db.models import Prefetch
+from nautobot.dcim.choices import InterfaceModeChoices, InterfaceTypeChoices
 from nautobot.dcim.models import Cable, Device, Interface, Location
 from nautobot.extras.models import Status
 from nautobot.ipam.models import VLAN, VRF, IPAddress, IPAddressToInterface
@@ -71,8 +73,11 @@ class SyncNetworkDataDevice(FilteredNautobotModel):
 
         job.command_getter_result contains the result from the CommandGetter job.
         Only devices that actually responded with data should be considered for the sync.
+        The interfaces loaded as children of the devices are fetched along with them.
         """
-        return adapter.job.devices_to_load
+        return adapter.job.devices_to_load.prefetch_related(
+            Prefetch("interfaces", queryset=Interface.objects.select_related("status"))
+        )
 
     @classmethod
     def create(cls, adapter, ids, attrs):
@@ -128,6 +133,73 @@ class SyncNetworkDataInterface(FilteredNautobotModel):
     enabled: Optional[bool] = None
     description: Optional[str] = None
 
+    @classmethod
+    def _set_parameters_without_save(cls, obj, parameters, adapter):
+        """Set the given parameters on an interface without saving it, the bulk writer saves it later."""
+        relationship_fields = {
+            "foreign_keys": defaultdict(dict),
+            "many_to_many_fields": defaultdict(list),
+            "custom_relationship_foreign_keys": defaultdict(dict),
+            "custom_relationship_many_to_many_fields": defaultdict(dict),
+        }
+        for field, value in parameters.items():
+            cls._handle_single_field(field, obj, value, relationship_fields, adapter)
+        cls._lookup_and_set_foreign_keys(relationship_fields["foreign_keys"], obj, adapter)
+
+    @classmethod
+    def create(cls, adapter, ids, attrs):
+        """Create a new interface, or queue it with the bulk writer if bulk writes are enabled."""
+        if not adapter.bulk_writer:
+            return super().create(adapter, ids, attrs)
+        interface = Interface()
+        try:
+            cls._set_parameters_without_save(interface, {**ids, **attrs}, adapter)
+        except diffsync_exceptions.ObjectCrudException as err:
+            raise diffsync_exceptions.ObjectNotCreated(err) from err
+        # Skip NautobotModel.create(), which would save the interface right away.
+        diffsync_model = super(NautobotModel, cls).create(adapter, ids, attrs)
+        adapter.bulk_writer.queue_create(interface, key=ids["device__name"], diffsync_model=diffsync_model)
+        return diffsync_model
+
+    def update(self, attrs):
+        """Update an existing interface, or queue it with the bulk writer if bulk writes are enabled."""
+        if not self.adapter.bulk_writer:
+            return super().update(attrs)
+        try:
+            interface = self.get_from_db()
+            self._set_parameters_without_save(interface, attrs, self.adapter)
+        except diffsync_exceptions.ObjectCrudException as err:
+            raise diffsync_exceptions.ObjectNotUpdated(err) from err
+        self.adapter.bulk_writer.queue_update(
+            interface, fields=[attr.split("__")[0] for attr in attrs], key=self.device__name, diffsync_model=self
+        )
+        # Skip NautobotModel.update(), which would save the interface right away.
+        return super(NautobotModel, self).update(attrs)
+
+
+def check_queued_create(adapter, model_name, queued_model_name, unique_id, description):
+    """
+    Raise ObjectNotCreated if the queued create of the object an object depends on failed.
+
+    The objects depending on an interface or an IP address that failed to be created in bulk are skipped with the
+    reason it failed, instead of failing on an object that does not exist.
+    """
+    reason = adapter.get_failed_create(queued_model_name, unique_id)
+    if reason:
+        adapter.job.logger.error(f"Skipping {model_name} of {description}, {reason}")
+        raise diffsync_exceptions.ObjectNotCreated(reason)
+
+
+def check_interface_created(adapter, model_name, device_name, interface_name):
+    """Raise ObjectNotCreated if the queued create of an interface failed."""
+    check_queued_create(
+        adapter,
+        model_name,
+        "interface",
+        SyncNetworkDataInterface.create_unique_id(device__name=device_name, name=interface_name),
+        f"{device_name}:{interface_name}",
+    )
+
 
 class SyncNetworkDataIPAddress(DiffSyncModel):
     """Shared data model representing an IPAddress."""
@@ -145,7 +217,13 @@ class SyncNetworkDataIPAddress(DiffSyncModel):
 
     @classmethod
     def create(cls, adapter, ids, attrs):
-        """Create a new IPAddress object."""
+        """Create a new IPAddress object, or queue it with the IP address reconciler."""
+        if adapter.ip_address_reconciler:
+            diffsync_model = super().create(adapter, ids, attrs)
+            adapter.ip_address_reconciler.queue(
+                host=ids["host"], mask_length=attrs["mask_length"], diffsync_model=diffsync_model
+            )
+            return diffsync_model
         diffsync_utils.get_or_create_ip_address(
             host=ids["host"],
             mask_length=attrs["mask_length"],
@@ -165,7 +243,7 @@ class SyncNetworkDataIPAddress(DiffSyncModel):
         if attrs.get("mask_length"):
             ip_address.mask_length = attrs["mask_length"]
         if attrs.get("status__name"):
-            ip_address.status = Status.objects.get(name=attrs["status__name"])
+            ip_address.status = self.adapter.get_from_orm_cache({"name": attrs["status__name"]}, Status)
         if attrs.get("ip_version"):
             ip_address.ip_version = attrs["ip_version"]
         try:
@@ -190,7 +268,16 @@ class SyncNetworkDataIPAddressToInterface(FilteredNautobotModel):
     @classmethod
     def _get_queryset(cls, adapter: "Adapter"):
         """Get the queryset used to load the models data from Nautobot."""
-        return IPAddressToInterface.objects.filter(interface__device__in=adapter.job.devices_to_load)
+        return IPAddressToInterface.objects.filter(interface__device__in=adapter.job.devices_to_load).select_related(
+            "interface__device", "ip_address"
+        )
+
+    @classmethod
+    def create(cls, adapter, ids, attrs):
+        """Assign an IP address to an interface, unless the interface or the IP address failed to be created."""
+        check_interface_created(adapter, cls._modelname, ids["interface__device__name"], ids["interface__name"])
+        check_queued_create(adapter, cls._modelname, "ip_address", ids["ip_address__host"], ids["ip_address__host"])
+        return super().create(adapter, ids, attrs)
 
 
 class SyncNetworkDataVLAN(DiffSyncModel):
@@ -209,7 +296,7 @@ class SyncNetworkDataVLAN(DiffSyncModel):
         """Create a new VLAN."""
         location = None
         try:
-            location = Location.objects.get(name=ids["location__name"])
+            location = adapter.get_from_orm_cache({"name": ids["location__name"]}, Location)
         except ObjectDoesNotExist:
             adapter.job.logger.warning(
                 f"While creating VLAN {ids['vid']} - {ids['name']}, "
@@ -227,9 +314,12 @@ class SyncNetworkDataVLAN(DiffSyncModel):
                 name=ids["name"],
                 vid=ids["vid"],
                 location=location,
-                status=Status.objects.get(name="Active"),  # TODO: this can't be hardcoded, add a form input
+                status=adapter.get_from_orm_cache(
+                    {"name": "Active"}, Status
+                ),  # TODO: this can't be hardcoded, add a form input
             )
             vlan.validated_save()
+            adapter.add_vlan_to_index(vlan=vlan, location=location)
         except ValidationError as err:
             adapter.job.logger.error(f"VLAN {vlan} failed to create, {err}")
 
@@ -250,27 +340,42 @@ class SyncNetworkDataTaggedVlansToInterface(DiffSyncModel):
 
     @classmethod
     def _get_and_assign_tagged_vlans(cls, adapter, attrs, interface):
-        """Loop through the tagged vlans for an interface and assign them."""
+        """Assign the tagged vlans to an interface, only adding and removing the assignments that changed."""
+        if interface.mode != InterfaceModeChoices.MODE_TAGGED:
+            adapter.job.logger.error(
+                f"Failed to assign tagged vlans to {interface.device}:{interface}, "
+                f"mode must be set to {InterfaceModeChoices.MODE_TAGGED} when specifying tagged vlans."
+            )
+            raise diffsync_exceptions.ObjectNotCreated
+        vlan_pks = set()
         for network_vlan in attrs["tagged_vlans"]:
-            try:
-                nautobot_vlan = VLAN.objects.get(
-                    name=network_vlan["name"], vid=network_vlan["id"], location=interface.device.location
-                )
-                interface.tagged_vlans.add(nautobot_vlan)
-            except ObjectDoesNotExist:
+            vlan_pk = adapter.get_vlan_pk(
+                location=interface.device.location, vid=network_vlan["id"], name=network_vlan["name"]
+            )
+            if not vlan_pk:
                 adapter.job.logger.error(
                     f"Failed to assign tagged vlan to {interface.device}:{interface}, unable to locate a vlan "
                     f"with attributes [name: {network_vlan['name']}, vid: {network_vlan['id']} "
                     f"location: {interface.device.location}]"
                 )
                 raise diffsync_exceptions.ObjectNotCreated
+            vlan_pks.add(vlan_pk)
+
+        current_vlan_pks = set(interface.tagged_vlans.values_list("pk", flat=True))
+        if current_vlan_pks - vlan_pks:
+            interface.tagged_vlans.remove(*(current_vlan_pks - vlan_pks))
+        if vlan_pks - current_vlan_pks:
+            interface.tagged_vlans.add(*(vlan_pks - current_vlan_pks))
 
     @classmethod
     def create(cls, adapter, ids, attrs):
         """Assign tagged vlans to an interface."""
+        check_interface_created(adapter, cls._modelname, ids["device__name"], ids["name"])
         if attrs.get("tagged_vlans"):
             try:
-                interface = Interface.objects.get(device__name=ids["device__name"], name=ids["name"])
+                interface = Interface.objects.select_related("device__location").get(
+                    device__name=ids["device__name"], name=ids["name"]
+                )
             except ObjectDoesNotExist:
                 adapter.job.logger.error(
                     f"Failed to assign tagged vlans {attrs['tagged_vlans']}. An interface with "
@@ -278,22 +383,13 @@ class SyncNetworkDataTaggedVlansToInterface(DiffSyncModel):
                 )
                 raise diffsync_exceptions.ObjectNotCreated
             cls._get_and_assign_tagged_vlans(adapter, attrs, interface)
-            if interface:
-                try:
-                    interface.validated_save()
-                except ValidationError as err:
-                    adapter.job.logger.error(
-                        f"Failed to assign tagged vlans {attrs['tagged_vlans']} to {interface} on {interface.device}, {err}"
-                    )
-                    raise diffsync_exceptions.ObjectNotCreated
         return super().create(adapter, ids, attrs)
 
     def update(self, attrs):
         """Update tagged vlans."""
         if attrs.get("tagged_vlans"):
             try:
-                interface = Interface.objects.get(**self.get_identifiers())
-                interface.tagged_vlans.clear()
+                interface = Interface.objects.select_related("device__location").get(**self.get_identifiers())
             except ObjectDoesNotExist:
                 self.adapter.job.logger.error(
                     f"Failed to assign tagged vlans {attrs['tagged_vlans']}. An interface with "
@@ -301,13 +397,6 @@ class SyncNetworkDataTaggedVlansToInterface(DiffSyncModel):
                 )
                 raise diffsync_exceptions.ObjectNotUpdated
             self._get_and_assign_tagged_vlans(self.adapter, attrs, interface)
-            try:
-                interface.validated_save()
-            except ValidationError as err:
-                self.adapter.job.logger.error(
-                    f"Failed to assign tagged vlans {attrs['tagged_vlans']} to {interface} on {interface.device}, {err}"
-                )
-                raise diffsync_exceptions.ObjectNotUpdated
         return super().update(attrs)
 
 
@@ -326,27 +415,29 @@ class SyncNetworkDataUnTaggedVlanToInterface(DiffSyncModel):
     @classmethod
     def _get_and_assign_untagged_vlan(cls, adapter, attrs, interface):
         """Assign an untagged vlan to an interface."""
-        try:
-            vlan = VLAN.objects.get(
-                name=attrs["untagged_vlan"]["name"],
-                vid=attrs["untagged_vlan"]["id"],
-                location=interface.device.location,
-            )
-            interface.untagged_vlan = vlan
-        except ObjectDoesNotExist:
+        vlan_pk = adapter.get_vlan_pk(
+            location=interface.device.location,
+            vid=attrs["untagged_vlan"]["id"],
+            name=attrs["untagged_vlan"]["name"],
+        )
+        if not vlan_pk:
             adapter.job.logger.error(
                 f"Failed to assign untagged vlan to {interface.device}:{interface}, unable to locate a vlan with "
                 f"attributes [name: {attrs['untagged_vlan']['name']}, vid: {attrs['untagged_vlan']['id']} "
                 f"location: {interface.device.location}]"
             )
             raise diffsync_exceptions.ObjectNotCreated
+        interface.untagged_vlan_id = vlan_pk
 
     @classmethod
     def create(cls, adapter, ids, attrs):
         """Assign an untagged vlan to an interface."""
+        check_interface_created(adapter, cls._modelname, ids["device__name"], ids["name"])
         if attrs.get("untagged_vlan"):
             try:
-                interface = Interface.objects.get(device__name=ids["device__name"], name=ids["name"])
+                interface = Interface.objects.select_related("device__location").get(
+                    device__name=ids["device__name"], name=ids["name"]
+                )
             except ObjectDoesNotExist:
                 adapter.job.logger.error(
                     f"Failed to assign untagged vlan {attrs['untagged_vlan']}. An interface with "
@@ -367,7 +458,7 @@ class SyncNetworkDataUnTaggedVlanToInterface(DiffSyncModel):
         """Update the untagged vlan on an interface."""
         if attrs.get("untagged_vlan"):
             try:
-                interface = Interface.objects.get(**self.get_identifiers())
+                interface = Interface.objects.select_related("device__location").get(**self.get_identifiers())
             except ObjectDoesNotExist:
                 self.adapter.job.logger.error(
                     f"Failed to assign untagged vlan {attrs['untagged_vlan']}. An interface with "
@@ -401,6 +492,7 @@ class SyncNetworkDataLagToInterface(DiffSyncModel):
     @classmethod
     def create(cls, adapter, ids, attrs):
         """Assign a lag to an interface."""
+        check_interface_created(adapter, cls._modelname, ids["device__name"], ids["name"])
         if attrs["lag__interface__name"]:
             try:
                 interface = Interface.objects.get(device__name=ids["device__name"], name=ids["name"])
@@ -521,6 +613,7 @@ class SyncNetworkDataVrfToInterface(DiffSyncModel):
     @classmethod
     def create(cls, adapter, ids, attrs):
         """Assign a vrf to an interface."""
+        check_interface_created(adapter, cls._modelname, ids["device__name"], ids["name"])
         if attrs.get("vrf"):
             try:
                 interface = Interface.objects.get(device__name=ids["device__name"], name=ids["name"])
@@ -0,0 +1,113 @@
+"""Calculate the diff between two adapters in a process pool, one partition of devices per task."""
+
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from diffsync import Adapter
+from django.db import connections
+
+from nautobot_device_onboarding.diffsync.diff import get_device_name
+
+# Number of partitions per worker process, smaller partitions even out the work between the processes.
+PARTITIONS_PER_PROCESS = 4
+
+
+def partition_adapter(adapter, device_partitions, partition_count):
+    """
+    Split the objects of an adapter by device.
+
+    Objects of a device are assigned to the partition of that device in `device_partitions`, devices seen for the
+    first time are assigned to the next partition in turn. Objects not specific to a device go to partition None.
+
+    Returns:
+        dict: partition -> list of (model name, object data) tuples
+    """
+    partitions = defaultdict(list)
+    for model_name in sorted(adapter.get_all_model_names()):
+        for obj in adapter.get_all(model_name):
+            device_name = get_device_name(model_name, obj.get_identifiers())
+            if device_name is None:
+                partition = None
+            else:
+                partition = device_partitions.setdefault(device_name, len(device_partitions) % partition_count)
+            partitions[partition].append((model_name, obj.dict()))
+    return partitions
+
+
+def _partition_order(partition):
+    """Sort key of the partitions, the partition of objects not specific to a device first."""
+    return -1 if partition is None else partition
+
+
+def _build_adapter(adapter_type, adapter_name, top_level, model_classes, objects):
+    """Build an adapter holding the given objects."""
+    adapter_class = type(adapter_type, (Adapter,), {"top_level": top_level, **model_classes})
+    adapter = adapter_class(name=adapter_name)
+    for model_name, data in objects:
+        adapter.add(model_classes[model_name](**data))
+    return adapter
+
+
+def _calculate_partition_diff(source_spec, source_objects, target_spec, target_objects, diff_class, flags):
+    """Calculate the diff of a single partition, run in a worker process."""
+    source = _build_adapter(*source_spec, source_objects)
+    target = _build_adapter(*target_spec, target_objects)
+    return target.diff_from(source, diff_class=diff_class, flags=flags)
+
+
+def _adapter_spec(adapter):
+    """Return what a worker process needs to rebuild an empty copy of an adapter."""
+    model_classes = {
+        model_name: getattr(adapter, model_name)
+        for model_name in set(adapter.top_level) | adapter.get_all_model_names()
+    }
+    return adapter.type, adapter.name, list(adapter.top_level), model_classes
+
+
+def merge_diffs(diffs, diff_class, groups):
+    """Merge the diffs of disjoint partitions into a single diff, group by group."""
+    merged_diff = diff_class()
+    for group in groups:
+        for diff in diffs:
+            for element in diff.children.get(group, {}).values():
+                merged_diff.add(element)
+    merged_diff.models_processed = sum(diff.models_processed for diff in diffs)
+    merged_diff.complete()
+    return merged_diff
+
+
+def calculate_diff(source, target, diff_class, flags, processes):
+    """
+    Calculate the diff from `source` to `target` in a pool of `processes` worker processes.
+
+    Both adapters are partitioned by device, the diff of each partition is calculated in a worker process and the
+    diffs are merged back into one. Objects not specific to a device (IP addresses, VLANs, VRFs, cables) are diffed
+    together in a single partition.
+    """
+    device_partitions = {}
+    partition_count = processes * PARTITIONS_PER_PROCESS
+    source_partitions = partition_adapter(source, device_partitions, partition_count)
+    target_partitions = partition_adapter(target, device_partitions, partition_count)
+    source_spec = _adapter_spec(source)
+    target_spec = _adapter_spec(target)
+
+    # Forked workers must not share the database connections of this process.
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("fork")) as executor:
+        futures = [
+            executor.submit(
+                _calculate_partition_diff,
+                source_spec,
+                source_partitions.get(partition, []),
+                target_spec,
+                target_partitions.get(partition, []),
+                diff_class,
+                flags,
+            )
+            for partition in sorted(set(source_partitions) | set(target_partitions), key=_partition_order)
+        ]
+        diffs = [future.result() for future in futures]
+
+    groups = [group for group in target.top_level if group in source.top_level]
+    return merge_diffs(diffs, diff_class, groups)
@@ -0,0 +1,111 @@
+"""DiffSync syncer committing the sync in per-device transactions."""
+
+from diffsync import Adapter
+from diffsync.diff import Diff
+from diffsync.enum import DiffSyncFlags, DiffSyncStatus
+from diffsync.exceptions import DiffClassMismatch
+from diffsync.helpers import DiffSyncSyncer
+from django.conf import settings
+from django.db import transaction
+
+from nautobot_device_onboarding.diffsync.diff import get_device_name
+from nautobot_device_onboarding.utils import query_statistics
+
+app_settings = settings.PLUGINS_CONFIG["nautobot_device_onboarding"]
+
+
+class ChunkedTransactionSyncer(DiffSyncSyncer):
+    """
+    Sync a diff in atomic transactions, each holding the writes of up to `chunk_size` devices.
+
+    Diff elements that don't belong to a single device (e.g. IP addresses or VLANs) are chunked by model instead.
+    Each object is written in its own savepoint: if it fails, only its own writes are rolled back and the rest of the
+    transaction is still committed. If the sync is aborted, the transaction in progress is rolled back.
+
+    A `chunk_size` of 0, the default, disables transactions and savepoints, each write is then committed on its own as
+    by the `DiffSyncSyncer`.
+    """
+
+    def __init__(self, *args, chunk_size=0, **kwargs):
+        """Initialize the syncer."""
+        super().__init__(*args, **kwargs)
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def get_chunk_key(element):
+        """Return the key grouping a diff element into a transaction, the device name or the model name."""
+        return get_device_name(element.type, element.keys) or element.type
+
+    def perform_sync(self):
+        """Perform data synchronization based on the provided diff, one chunk of devices per transaction."""
+        if not self.chunk_size:
+            return super().perform_sync()
+        changed = False
+        self.base_logger.info("Beginning sync")
+        elements = self.diff.get_children()
+        element = next(elements, None)
+        while element is not None:
+            with transaction.atomic():
+                chunk_keys = set()
+                while element is not None:
+                    chunk_key = self.get_chunk_key(element)
+                    if chunk_key not in chunk_keys and len(chunk_keys) >= self.chunk_size:
+                        break
+                    chunk_keys.add(chunk_key)
+                    changed |= self.sync_diff_element(element)
+                    # Fetching the next element may flush queued writes, keep this inside the transaction.
+                    element = next(elements, None)
+        self.base_logger.info("Sync complete")
+        return changed
+
+    def sync_model(self, src_model, dst_model, ids, attrs):
+        """Create/update/delete the current DiffSyncModel in its own savepoint."""
+        with query_statistics.model_scope(self.model_class.get_type()):
+            if not self.chunk_size or self.action is None:
+                return super().sync_model(src_model=src_model, dst_model=dst_model, ids=ids, attrs=attrs)
+            with transaction.atomic():
+                changed, model = super().sync_model(src_model=src_model, dst_model=dst_model, ids=ids, attrs=attrs)
+                if model is None:
+                    # The object failed but the sync continues, undo whatever it wrote before failing.
+                    transaction.set_rollback(True)
+                elif transaction.get_rollback():
+                    # A database error was caught while writing the object, its savepoint will be rolled back.
+                    self.log_sync_status(
+                        self.action,
+                        DiffSyncStatus.ERROR,
+                        f"{self.model_class.get_type()} {self.action} rolled back after a database error.",
+                    )
+                    model = None
+            return changed, model
+
+
+class ChunkedTransactionAdapterMixin:  # pylint: disable=too-few-public-methods
+    """Adapter mixin syncing into the adapter with the `ChunkedTransactionSyncer`."""
+
+    def sync_from(  # pylint: disable=too-many-arguments
+        self,
+        source: Adapter,
+        diff_class=Diff,
+        flags=DiffSyncFlags.NONE,
+        callback=None,
+        diff=None,
+    ):
+        """Synchronize data from the given source adapter into this one, in per-device transactions."""
+        if diff_class and diff and not isinstance(diff, diff_class):
+            raise DiffClassMismatch(
+                f"The provided diff's class ({diff.__class__.__name__}) does not match the diff_class: "
+                f"{diff_class.__name__}",
+            )
+        if not diff:
+            diff = self.diff_from(source, diff_class=diff_class, flags=flags, callback=callback)
+        syncer = ChunkedTransactionSyncer(
+            diff=diff,
+            src_diffsync=source,
+            dst_diffsync=self,
+            flags=flags,
+            callback=callback,
+            chunk_size=app_settings.get("sync_transaction_chunk_size", 0),
+        )
+        if syncer.perform_sync():
+            self.sync_complete(source, diff, flags, syncer.base_logger)
+        return diff
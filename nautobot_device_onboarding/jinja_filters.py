@@ -6,7 +6,7 @@ from itertools import chain
 from django_jinja import library
 from netutils.vlan import vlanconfig_to_list
 
-from nautobot_device_onboarding.constants import INTERFACE_TYPE_MAP_STATIC
+from nautobot_device_onboarding.utils.normalizer import normalize_interface_type, normalize_port_mode
 
 # https://docs.nautobot.com/projects/core/en/stable/development/apps/api/platform-features/jinja2-filters/
 
@@ -17,7 +17,7 @@ logger = logging.getLogger(__name__)
 @library.filter
 def map_interface_type(interface_type):
     """Map interface type to a Nautobot type."""
-    return INTERFACE_TYPE_MAP_STATIC.get(interface_type, "other")
+    return normalize_interface_type(interface_type)
 
 
 @library.filter
@@ -35,13 +35,7 @@ def interface_status_to_bool(status):
 @library.filter
 def port_mode_to_nautobot(current_mode):
     """Take links or admin status and change to boolean."""
-    mode_mapping = {
-        "access": "access",
-        "trunk": "tagged",
-        "bridged": "tagged",
-        "routed": "",
-    }
-    return mode_mapping.get(current_mode, "")
+    return normalize_port_mode(current_mode)
 
 
 @library.filter
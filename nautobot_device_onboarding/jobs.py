@@ -1,15 +1,18 @@
 # pylint: disable=attribute-defined-outside-init
 """Device Onboarding Jobs."""
 
+import codecs
 import csv
 import json
 import logging
-from io import StringIO
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from diffsync.enum import DiffSyncFlags
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist, ValidationError
+from django.db import connections
 from nautobot.apps.jobs import (
     BooleanVar,
     ChoiceVar,
@@ -24,7 +27,6 @@ from nautobot.core.celery import register_jobs
 from nautobot.dcim.models import Device, DeviceType, Location, Platform
 from nautobot.extras.choices import (
     CustomFieldTypeChoices,
-    SecretsGroupAccessTypeChoices,
     SecretsGroupSecretTypeChoices,
 )
 from nautobot.extras.models import (
@@ -49,7 +51,9 @@ from nautobot_device_onboarding.diffsync.adapters.sync_network_data_adapters imp
     SyncNetworkDataNautobotAdapter,
     SyncNetworkDataNetworkAdapter,
 )
+from nautobot_device_onboarding.diffsync.diff import SyncNetworkDataDiff
 from nautobot_device_onboarding.exceptions import OnboardException
+from nautobot_device_onboarding.nautobot_keeper import NautobotKeeperCache
 from nautobot_device_onboarding.netdev_keeper import NetdevKeeper
 from nautobot_device_onboarding.nornir_plays.command_getter import (
     _parse_credentials,
@@ -59,12 +63,26 @@ from nautobot_device_onboarding.nornir_plays.empty_inventory import EmptyInvento
 from nautobot_device_onboarding.nornir_plays.inventory_creator import _set_inventory
 from nautobot_device_onboarding.nornir_plays.logger import NornirLogger
 from nautobot_device_onboarding.nornir_plays.processor import TroubleshootingProcessor
+from nautobot_device_onboarding.utils import dns_resolver, normalizer, query_statistics
+from nautobot_device_onboarding.utils.credentials import SecretsGroupCredentialCache
 from nautobot_device_onboarding.utils.helper import onboarding_task_fqdn_to_ip
+from nautobot_device_onboarding.utils.memory_snapshots import MemorySnapshots, sync_objects
+from nautobot_device_onboarding.utils.orm_cache import ORMCache
+from nautobot_device_onboarding.utils.query_statistics import QueryStatistics
 
 InventoryPluginRegister.register("empty-inventory", EmptyInventory)
 
 PLUGIN_SETTINGS = settings.PLUGINS_CONFIG["nautobot_device_onboarding"]
 
+# Columns of the onboarding CSV file holding the name of an object, by model.
+CSV_OBJECT_COLUMNS = {
+    Role: ("device_role_name",),
+    Namespace: ("namespace",),
+    Status: ("device_status_name", "interface_status_name", "ip_address_status_name"),
+    SecretsGroup: ("secrets_group_name",),
+    Platform: ("platform_name",),
+}
+
 LOGGER = logging.getLogger(__name__)
 name = "Device Onboarding"  # pylint: disable=invalid-name
 
@@ -131,6 +149,7 @@ class OnboardingTask(Job):  # pylint: disable=too-many-instance-attributes
         self.device_type = None
         self.role = None
         self.credentials = None
+        self.keeper_cache = None
         super().__init__(*args, **kwargs)
 
     def run(self, *args, **data):
@@ -144,26 +163,70 @@ class OnboardingTask(Job):  # pylint: disable=too-many-instance-attributes
         self.role = data["role"]
         self.credentials = data["credentials"]
 
+        # Lookups of the reference objects are shared by all the devices onboarded by this job
+        self.keeper_cache = NautobotKeeperCache()
+        self.keeper_cache.prefetch()
+
         self.logger.info("START: onboarding devices")
+        addresses = data["ip_address"].replace(" ", "").split(",")
+        # Resolve all DNS names up front and concurrently, each device then gets its address from the cache
+        dns_resolver.get_resolver().resolve_all(dns_resolver.get_host_names(addresses))
+        onboarding_workers = PLUGIN_SETTINGS.get("onboarding_task_workers", 1)
+        if onboarding_workers > 1 and len(addresses) > 1:
+            self._onboard_concurrently(addresses, onboarding_workers, data["continue_on_failure"])
+            return
         # allows for iteration without having to spawn multiple jobs
         # Later refactor to use nautobot-plugin-nornir
-        for address in data["ip_address"].replace(" ", "").split(","):
+        for address in addresses:
             try:
                 self._onboard(address=address)
             except OnboardException as err:
-                self.logger.exception(
-                    "The following exception occurred when attempting to onboard %s: %s",
-                    address,
-                    str(err),
-                )
-                if not data["continue_on_failure"]:
-                    raise OnboardException(
-                        "fail-general - An exception occurred and continue on failure was disabled."
-                    ) from err
+                self._handle_onboarding_failure(address, err, data["continue_on_failure"])
+
+    def _onboard_concurrently(self, addresses, max_workers, continue_on_failure):
+        """Collect the facts of the devices in a thread pool, while this thread writes them to Nautobot in order."""
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(addresses)))
+        futures = [(address, executor.submit(self._collect_facts_in_thread, address)) for address in addresses]
+        try:
+            for address, future in futures:
+                self.logger.info("Attempting to onboard %s.", address)
+                try:
+                    self._write_device(*future.result())
+                except OnboardException as err:
+                    self._handle_onboarding_failure(address, err, continue_on_failure)
+        finally:
+            # Devices not collected yet when the job stops are skipped, collections already running can't be stopped.
+            for _, future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _handle_onboarding_failure(self, address, err, continue_on_failure):
+        """Log a device that failed to onboard, and stop the job unless it continues on failure."""
+        self.logger.exception(
+            "The following exception occurred when attempting to onboard %s: %s",
+            address,
+            str(err),
+        )
+        if not continue_on_failure:
+            raise OnboardException(
+                "fail-general - An exception occurred and continue on failure was disabled."
+            ) from err
 
     def _onboard(self, address):
         """Onboard single device."""
         self.logger.info("Attempting to onboard %s.", address)
+        self._write_device(*self._collect_facts(address))
+
+    def _collect_facts_in_thread(self, address):
+        """Collect the facts of a device from a worker thread."""
+        try:
+            return self._collect_facts(address)
+        finally:
+            # Close the database connection opened by the platform lookup in this thread.
+            connections.close_all()
+
+    def _collect_facts(self, address):
+        """Connect to a device and collect its facts, returns the management IP address and the facts."""
         address = onboarding_task_fqdn_to_ip(address)
         netdev = NetdevKeeper(
             hostname=address,
@@ -178,8 +241,10 @@ class OnboardingTask(Job):  # pylint: disable=too-many-instance-attributes
             ),
         )
         netdev.get_onboarding_facts()
-        netdev_dict = netdev.get_netdev_dict()
+        return address, netdev.get_netdev_dict()
 
+    def _write_device(self, address, netdev_dict):
+        """Create or update the device in Nautobot from the facts collected."""
         onboarding_kwargs = {
             # Kwargs extracted from OnboardingTask:
             "netdev_mgmt_ip_address": address,
@@ -206,7 +271,9 @@ class OnboardingTask(Job):  # pylint: disable=too-many-instance-attributes
             "password": self.password,
             "secret": self.secret,
         }
-        onboarding_cls.run(onboarding_kwargs=onboarding_kwargs)
+        onboarding_cls.lookup_cache = self.keeper_cache
+        with self.keeper_cache.device_transaction():
+            onboarding_cls.run(onboarding_kwargs=onboarding_kwargs)
         self.logger.info(
             "Successfully onboarded %s with a management IP of %s",
             netdev_dict["netdev_hostname"],
@@ -217,27 +284,26 @@ class OnboardingTask(Job):  # pylint: disable=too-many-instance-attributes
         """Parse and return dictionary of credentials."""
         if credentials:
             self.logger.info("Attempting to parse credentials from selected SecretGroup")
-            try:
-                self.username = credentials.get_secret_value(
-                    access_type=SecretsGroupAccessTypeChoices.TYPE_GENERIC,
-                    secret_type=SecretsGroupSecretTypeChoices.TYPE_USERNAME,
-                )
-                self.password = credentials.get_secret_value(
-                    access_type=SecretsGroupAccessTypeChoices.TYPE_GENERIC,
-                    secret_type=SecretsGroupSecretTypeChoices.TYPE_PASSWORD,
-                )
-                try:
-                    self.secret = credentials.get_secret_value(
-                        access_type=SecretsGroupAccessTypeChoices.TYPE_GENERIC,
-                        secret_type=SecretsGroupSecretTypeChoices.TYPE_SECRET,
+            credential_cache = SecretsGroupCredentialCache()
+            parsed_credentials = credential_cache.get(credentials)
+            errors = credential_cache.get_errors(credentials)
+            for secret_type in (
+                SecretsGroupSecretTypeChoices.TYPE_USERNAME,
+                SecretsGroupSecretTypeChoices.TYPE_PASSWORD,
+            ):
+                error = errors.get(secret_type)
+                if isinstance(error, SecretsGroupAssociation.DoesNotExist):
+                    self.logger.error(
+                        "Unable to use SecretsGroup selected, ensure Access Type is set to Generic & at minimum Username & Password types are set."
                     )
-                except SecretsGroupAssociation.DoesNotExist:
-                    self.secret = None
-            except SecretsGroupAssociation.DoesNotExist as err:
-                self.logger.exception(
-                    "Unable to use SecretsGroup selected, ensure Access Type is set to Generic & at minimum Username & Password types are set."
-                )
-                raise OnboardException("fail-credentials - Unable to parse selected credentials.") from err
+                    raise OnboardException("fail-credentials - Unable to parse selected credentials.") from error
+            for error in errors.values():
+                # A missing secret (enable password) is optional, secrets provider errors are not.
+                if not isinstance(error, SecretsGroupAssociation.DoesNotExist):
+                    raise error
+            self.username = parsed_credentials.username
+            self.password = parsed_credentials.password
+            self.secret = parsed_credentials.secret
 
         else:
             self.logger.info("Using napalm credentials configured in nautobot_config.py")
@@ -254,6 +320,9 @@ class SSOTSyncDevices(DataSource):  # pylint: disable=too-many-instance-attribut
         super().__init__(*args, **kwargs)
         self.processed_csv_data = {}
         self.task_kwargs_csv_data = {}
+        self.orm_cache = ORMCache()
+        self.query_statistics = QueryStatistics(enabled=PLUGIN_SETTINGS.get("sync_query_statistics", True))
+        self.memory_snapshots = MemorySnapshots(enabled=PLUGIN_SETTINGS.get("sync_memory_snapshots", False))
 
         self.diffsync_flags = DiffSyncFlags.SKIP_UNMATCHED_DST
 
@@ -339,15 +408,36 @@ class SSOTSyncDevices(DataSource):  # pylint: disable=too-many-instance-attribut
 
     template_name = "nautobot_device_onboarding/ssot_sync_devices.html"
 
+    @query_statistics.phase("load_source_adapter")
     def load_source_adapter(self):
         """Load onboarding network adapter."""
         self.source_adapter = SyncDevicesNetworkAdapter(job=self, sync=self.sync)
         self.source_adapter.load()
+        self._take_memory_snapshot("load_source_adapter")
 
+    @query_statistics.phase("load_target_adapter")
     def load_target_adapter(self):
         """Load onboarding Nautobot adapter."""
         self.target_adapter = SyncDevicesNautobotAdapter(job=self, sync=self.sync)
         self.target_adapter.load()
+        self._take_memory_snapshot("load_target_adapter")
+
+    @query_statistics.phase("calculate_diff")
+    def calculate_diff(self):
+        """Calculate the diff between the network and Nautobot."""
+        super().calculate_diff()
+        self._take_memory_snapshot("calculate_diff")
+
+    @query_statistics.phase("execute_sync")
+    def execute_sync(self):
+        """Sync the devices into Nautobot."""
+        super().execute_sync()
+        self._take_memory_snapshot("execute_sync")
+
+    def _take_memory_snapshot(self, name):
+        """Take a memory snapshot at the end of a phase of the sync."""
+        device_data = self.source_adapter.device_data if self.source_adapter else None
+        self.memory_snapshots.take(name, sync_objects(self, device_data))
 
     def _convert_string_to_bool(self, string, header):
         """Given a string of 'true' or 'false' convert to bool."""
@@ -360,58 +450,102 @@ class SSOTSyncDevices(DataSource):  # pylint: disable=too-many-instance-attribut
             "Please use either 'True' or 'False'."
         )
 
+    def _resolve_csv_objects(self, rows):
+        """
+        Resolve the distinct object names found in the CSV rows, with a single query per model.
+
+        Returns:
+            tuple: a dict of model -> {name: object}, and a dict of (location name, parent name) -> list of locations,
+                the parent name being None for top-level locations
+        """
+        names = defaultdict(set)
+        location_names = set()
+        for row in rows:
+            for model, columns in CSV_OBJECT_COLUMNS.items():
+                for column in columns:
+                    if row.get(column):
+                        names[model].add(row[column].strip())
+            if row.get("location_name"):
+                location_names.add(row["location_name"].strip())
+        objects_by_name = {
+            model: {obj.name: obj for obj in model.objects.filter(name__in=names[model])}
+            for model in CSV_OBJECT_COLUMNS
+        }
+        # Location names are only unique within their parent, and parent names may be shared too.
+        locations = defaultdict(list)
+        for location in Location.objects.filter(name__in=location_names).select_related("parent"):
+            locations[(location.name, location.parent.name if location.parent else None)].append(location)
+        return objects_by_name, locations
+
+    @staticmethod
+    def _get_csv_object(objects, model, key):
+        """Return a resolved CSV object, raising DoesNotExist like `Model.objects.get()` if there isn't one."""
+        obj = objects.get(key)
+        if obj is None:
+            raise model.DoesNotExist(f"{model._meta.object_name} matching query does not exist.")  # pylint: disable=protected-access
+        return obj
+
+    @staticmethod
+    def _get_csv_location(locations, key):
+        """Return a resolved CSV location, raising like `Location.objects.get()` if there isn't exactly one."""
+        matches = locations.get(key, [])
+        if len(matches) > 1:
+            raise Location.MultipleObjectsReturned(
+                f"get() returned more than one Location -- it returned {len(matches)}!"
+            )
+        if not matches:
+            raise Location.DoesNotExist("Location matching query does not exist.")
+        return matches[0]
+
+    @staticmethod
+    def _read_csv_rows(csv_file):
+        """Decode and parse the CSV file line by line, from its start."""
+        csv_file.seek(0)
+        return csv.DictReader(codecs.iterdecode(csv_file, "utf-8"))
+
     def _process_csv_data(self, csv_file):
         """Convert CSV data into a dictionary containing Nautobot objects."""
         self.logger.info("Decoding CSV file...")
-        decoded_csv_file = csv_file.read().decode("utf-8")
-        csv_reader = csv.DictReader(StringIO(decoded_csv_file))
+        # The file is read twice, first to collect the names to look up and then to process each row, so the rows
+        # are never all held in memory.
+        objects_by_name, locations = self._resolve_csv_objects(self._read_csv_rows(csv_file))
         self.logger.info("Processing CSV data...")
         processing_failed = False
         processed_csv_data = {}
         self.task_kwargs_csv_data = {}
         row_count = 1
-        for row in csv_reader:
+        for row in self._read_csv_rows(csv_file):
             query = None
             try:
                 query = f"location_name: {row.get('location_name')}, location_parent_name: {row.get('location_parent_name')}"
                 if row.get("location_parent_name"):
-                    location = Location.objects.get(
-                        name=row["location_name"].strip(),
-                        parent__name=row["location_parent_name"].strip(),
-                    )
+                    location_key = (row["location_name"].strip(), row["location_parent_name"].strip())
                 else:
                     query = query = f"location_name: {row.get('location_name')}"
-                    location = Location.objects.get(name=row["location_name"].strip(), parent=None)
+                    location_key = (row["location_name"].strip(), None)
+                location = self._get_csv_location(locations, location_key)
                 query = f"device_role: {row.get('device_role_name')}"
-                device_role = Role.objects.get(
-                    name=row["device_role_name"].strip(),
-                )
+                device_role = self._get_csv_object(objects_by_name[Role], Role, row["device_role_name"].strip())
                 query = f"namespace: {row.get('namespace')}"
-                namespace = Namespace.objects.get(
-                    name=row["namespace"].strip(),
-                )
+                namespace = self._get_csv_object(objects_by_name[Namespace], Namespace, row["namespace"].strip())
                 query = f"device_status: {row.get('device_status_name')}"
-                device_status = Status.objects.get(
-                    name=row["device_status_name"].strip(),
-                )
+                device_status = self._get_csv_object(objects_by_name[Status], Status, row["device_status_name"].strip())
                 query = f"interface_status: {row.get('interface_status_name')}"
-                interface_status = Status.objects.get(
-                    name=row["interface_status_name"].strip(),
+                interface_status = self._get_csv_object(
+                    objects_by_name[Status], Status, row["interface_status_name"].strip()
                 )
                 query = f"ip_address_status: {row.get('ip_address_status_name')}"
-                ip_address_status = Status.objects.get(
-                    name=row["ip_address_status_name"].strip(),
+                ip_address_status = self._get_csv_object(
+                    objects_by_name[Status], Status, row["ip_address_status_name"].strip()
                 )
                 query = f"secrets_group: {row.get('secrets_group_name')}"
-                secrets_group = SecretsGroup.objects.get(
-                    name=row["secrets_group_name"].strip(),
+                secrets_group = self._get_csv_object(
+                    objects_by_name[SecretsGroup], SecretsGroup, row["secrets_group_name"].strip()
                 )
                 query = f"platform: {row.get('platform_name')}"
                 platform = None
                 if row.get("platform_name"):
-                    platform = Platform.objects.get(
-                        name=row["platform_name"].strip(),
-                    )
+                    platform = self._get_csv_object(objects_by_name[Platform], Platform, row["platform_name"].strip())
 
                 set_mgmt_only = self._convert_string_to_bool(
                     string=row["set_mgmt_only"].lower().strip(), header="set_mgmt_only"
@@ -446,7 +580,7 @@ class SSOTSyncDevices(DataSource):  # pylint: disable=too-many-instance-attribut
                 )
                 self.task_kwargs_csv_data[row["ip_address_host"]]["platform"] = platform.id if platform else ""
                 row_count += 1
-            except ObjectDoesNotExist as err:
+            except (ObjectDoesNotExist, MultipleObjectsReturned) as err:
                 self.logger.error(f"(row {sum([row_count, 1])}), {err} {query}")
                 processing_failed = True
                 row_count += 1
@@ -559,7 +693,11 @@ class SSOTSyncDevices(DataSource):  # pylint: disable=too-many-instance-attribut
                 "csv_file": "",
                 "connectivity_test": kwargs["connectivity_test"],
             }
-        super().run(dryrun, memory_profiling, *args, **kwargs)
+        with self.query_statistics.record(), self.memory_snapshots.record():
+            super().run(dryrun, memory_profiling, *args, **kwargs)
+        self.orm_cache.log_statistics(self.logger)
+        self.query_statistics.report(self)
+        self.memory_snapshots.report(self)
 
 
 class SSOTSyncNetworkData(DataSource):  # pylint: disable=too-many-instance-attributes
@@ -572,6 +710,9 @@ class SSOTSyncNetworkData(DataSource):  # pylint: disable=too-many-instance-attr
         self.filtered_devices = None  # Queryset of devices based on job form inputs
         self.command_getter_result = None  # Dict result from CommandGetter nornir task
         self.devices_to_load = None  # Queryset consisting of devices that responded
+        self.orm_cache = ORMCache()  # ORM lookups shared by the adapters and models of this job
+        self.query_statistics = QueryStatistics(enabled=PLUGIN_SETTINGS.get("sync_query_statistics", True))
+        self.memory_snapshots = MemorySnapshots(enabled=PLUGIN_SETTINGS.get("sync_memory_snapshots", False))
 
     class Meta:
         """Metadata about this Job."""
@@ -636,17 +777,42 @@ class SSOTSyncNetworkData(DataSource):  # pylint: disable=too-many-instance-attr
         description="Only update devices with the selected platform.",
     )
 
+    @query_statistics.phase("load_source_adapter")
     def load_source_adapter(self):
         """Load network data adapter."""
         # do not load source data if the job form does not filter which devices to sync
         if self.filtered_devices:
             self.source_adapter = SyncNetworkDataNetworkAdapter(job=self, sync=self.sync)
             self.source_adapter.load()
+            self._take_memory_snapshot("load_source_adapter")
 
+    @query_statistics.phase("load_target_adapter")
     def load_target_adapter(self):
         """Load network data Nautobot adapter."""
         self.target_adapter = SyncNetworkDataNautobotAdapter(job=self, sync=self.sync)
         self.target_adapter.load()
+        self._take_memory_snapshot("load_target_adapter")
+
+    @query_statistics.phase("calculate_diff")
+    def calculate_diff(self):
+        """Calculate the diff between network data and Nautobot, see `SyncNetworkDataNetworkAdapter.diff_to()`."""
+        super().calculate_diff()
+        self._take_memory_snapshot("calculate_diff")
+
+    @query_statistics.phase("execute_sync")
+    def execute_sync(self):
+        """Sync network data into Nautobot, using the diff calculated by calculate_diff()."""
+        if self.source_adapter is not None and self.target_adapter is not None:
+            self.source_adapter.sync_to(
+                self.target_adapter, diff_class=SyncNetworkDataDiff, flags=self.diffsync_flags, diff=self.diff
+            )
+            self._take_memory_snapshot("execute_sync")
+        else:
+            self.logger.warning("Not both adapters were properly initialized prior to synchronization.")
+
+    def _take_memory_snapshot(self, name):
+        """Take a memory snapshot at the end of a phase of the sync."""
+        self.memory_snapshots.take(name, sync_objects(self, self.command_getter_result))
 
     def run(
         self,
@@ -747,7 +913,13 @@ class SSOTSyncNetworkData(DataSource):  # pylint: disable=too-many-instance-attr
             "connectivity_test": kwargs["connectivity_test"],
         }
 
-        super().run(dryrun, memory_profiling, *args, **kwargs)
+        normalizer_statistics = normalizer.cache_statistics()
+        with self.query_statistics.record(), self.memory_snapshots.record():
+            super().run(dryrun, memory_profiling, *args, **kwargs)
+        self.orm_cache.log_statistics(self.logger)
+        self.query_statistics.report(self)
+        self.memory_snapshots.report(self)
+        normalizer.log_cache_statistics(self.logger, since=normalizer_statistics)
 
 
 class DeviceOnboardingTroubleshootingJob(Job):
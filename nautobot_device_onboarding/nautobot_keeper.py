@@ -2,10 +2,13 @@
 
 import ipaddress
 import logging
+from collections import defaultdict
+from contextlib import contextmanager
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from nautobot.apps.choices import PrefixTypeChoices
 from nautobot.dcim.choices import InterfaceTypeChoices
 from nautobot.dcim.models import Device, DeviceType, Interface, Location, Manufacturer, Platform
@@ -15,15 +18,28 @@ from nautobot.ipam.models import IPAddress, Namespace, Prefix
 
 from nautobot_device_onboarding.constants import NETMIKO_TO_NAPALM_STATIC
 from nautobot_device_onboarding.exceptions import OnboardException
+from nautobot_device_onboarding.utils import reference_cache
 
 logger = logging.getLogger("rq.worker")
 
 PLUGIN_SETTINGS = settings.PLUGINS_CONFIG["nautobot_device_onboarding"]
 
 
-def ensure_default_cf(obj, model):
-    """Update objects's default custom fields."""
-    for field in CustomField.objects.get_for_model(model):
+# Models whose default custom field values are set by the NautobotKeeper.
+CUSTOM_FIELD_MODELS = (Device, DeviceType, Interface, IPAddress, Manufacturer, Platform, Role)
+
+
+def ensure_default_cf(obj, model, custom_fields=None):
+    """Update objects's default custom fields.
+
+    Args:
+        obj: The object to update.
+        model: The model of the object.
+        custom_fields (list): Custom fields of the model, retrieved from the database if not given.
+    """
+    if custom_fields is None:
+        custom_fields = CustomField.objects.get_for_model(model)
+    for field in custom_fields:
         if (field.default is not None) and (field.label not in obj.cf):
             obj.cf[field.label] = field.default
 
@@ -49,13 +65,13 @@ def object_match(obj, search_array):
                         ]
     """
     try:
-        result = obj.objects.get(**search_array[0])
+        result = reference_cache.get(search_array[0], obj)
         return result
     except obj.DoesNotExist:
         if PLUGIN_SETTINGS["object_match_strategy"] == "loose":
             for search_array_element in search_array[1:]:
                 try:
-                    result = obj.objects.get(**search_array_element)
+                    result = reference_cache.get(search_array_element, obj)
                     return result
                 except obj.DoesNotExist:
                     pass
@@ -70,6 +86,93 @@ def object_match(obj, search_array):
         ) from err
 
 
+def _lookup_key(model, lookups):
+    """Return a hashable key of a model lookup, lookup values may be lists of objects."""
+    return (model, repr([sorted(parameters.items()) for parameters in lookups]))
+
+
+class NautobotKeeperCache:
+    """Memoized lookups shared by the NautobotKeeper instances onboarding a batch of devices.
+
+    Only objects found or created are memoized, a lookup which failed is retried for the next device. Objects created
+    while onboarding a device are only shared with the next devices once the transaction of the device is committed,
+    see `device_transaction()`.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.custom_fields = None
+        self.netmiko_to_napalm = None
+        self._objects = {}
+        self._pending_objects = {}
+
+    def prefetch(self):
+        """Load the custom field definitions and the platform NAPALM drivers used by every device at once."""
+        content_types = ContentType.objects.get_for_models(*CUSTOM_FIELD_MODELS)
+        models_by_content_type = {content_type.pk: model for model, content_type in content_types.items()}
+        self.custom_fields = defaultdict(list)
+        for field in CustomField.objects.filter(content_types__in=content_types.values()).prefetch_related(
+            "content_types"
+        ):
+            for content_type in field.content_types.all():
+                if content_type.pk in models_by_content_type:
+                    self.custom_fields[models_by_content_type[content_type.pk]].append(field)
+        self.get_netmiko_to_napalm()
+
+    def get_custom_fields(self, model):
+        """Return the custom fields of a model, None if they weren't prefetched."""
+        if self.custom_fields is None or model not in CUSTOM_FIELD_MODELS:
+            return None
+        return self.custom_fields[model]
+
+    def get_netmiko_to_napalm(self):
+        """Return the NAPALM driver of each netmiko device type, updated with the drivers of the Nautobot platforms."""
+        if self.netmiko_to_napalm is None:
+            platform_to_napalm_nautobot = {
+                platform: platform.napalm_driver for platform in Platform.objects.all() if platform.napalm_driver
+            }
+            self.netmiko_to_napalm = {**NETMIKO_TO_NAPALM_STATIC, **platform_to_napalm_nautobot}
+        return self.netmiko_to_napalm
+
+    def _memoized(self, key, lookup):
+        """Return a memoized object, or look it up and memoize it until the end of the device transaction."""
+        if key in self._objects:
+            return self._objects[key]
+        if key not in self._pending_objects:
+            self._pending_objects[key] = lookup()
+        return self._pending_objects[key]
+
+    def object_match(self, model, search_array):
+        """Search a model for multiple criteria like the `object_match` function, memoizing the object found."""
+        return self._memoized(
+            ("object_match", _lookup_key(model, search_array), PLUGIN_SETTINGS["object_match_strategy"]),
+            lambda: object_match(model, search_array),
+        )
+
+    def get(self, parameters, model):
+        """Retrieve an object from the reference cache, memoizing the object found."""
+        return self._memoized(("get", _lookup_key(model, [parameters])), lambda: reference_cache.get(parameters, model))
+
+    def get_or_create(self, model, defaults=None, **parameters):
+        """Get or create an object, memoizing it. Only the object is returned."""
+        return self._memoized(
+            ("get_or_create", _lookup_key(model, [parameters])),
+            lambda: model.objects.get_or_create(defaults=defaults, **parameters)[0],
+        )
+
+    @contextmanager
+    def device_transaction(self):
+        """Onboard a device in a transaction, objects looked up in it are shared once the transaction is committed."""
+        try:
+            with transaction.atomic():
+                yield
+        except BaseException:
+            self._pending_objects = {}
+            raise
+        self._objects.update(self._pending_objects)
+        self._pending_objects = {}
+
+
 class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
     """Used to manage the information relating to the network device within the Nautobot server."""
 
@@ -91,6 +194,7 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
         onboarding_class=None,
         driver_addon_result=None,
         netdev_nb_credentials=None,
+        lookup_cache=None,
     ):
         """Create an instance and initialize the managed attributes that are used throughout the onboard processing.
 
@@ -111,6 +215,7 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
             onboarding_class (Object): Onboarding Class (future use)
             driver_addon_result (Any): Attached extended result (future use)
             netdev_nb_credentials (Object): Device's secrets group object
+            lookup_cache (NautobotKeeperCache): Lookups shared with the other devices of a batch
         """
         self.netdev_mgmt_ip_address = netdev_mgmt_ip_address
         self.netdev_nb_location_name = netdev_nb_location_name
@@ -130,6 +235,7 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
 
         self.onboarding_class = onboarding_class
         self.driver_addon_result = driver_addon_result
+        self.lookup_cache = lookup_cache or NautobotKeeperCache()
 
         # these attributes are nautobot model instances as discovered/created
         # through the course of processing.
@@ -144,6 +250,10 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
         self.nb_mgmt_ifname = None
         self.nb_primary_ip = None
 
+    def ensure_default_cf(self, obj, model):
+        """Update objects's default custom fields, from the custom fields prefetched for the batch if any."""
+        ensure_default_cf(obj=obj, model=model, custom_fields=self.lookup_cache.get_custom_fields(model))
+
     def ensure_onboarded_device(self):
         """Lookup if the device already exists in the Nautobot.
 
@@ -190,11 +300,11 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
 
         try:
             search_array = [{"name__iexact": nb_manufacturer}]
-            self.nb_manufacturer = object_match(Manufacturer, search_array)
+            self.nb_manufacturer = self.lookup_cache.object_match(Manufacturer, search_array)
         except Manufacturer.DoesNotExist as err:
             if create_manufacturer:
                 self.nb_manufacturer = Manufacturer.objects.create(name=self.netdev_vendor)
-                ensure_default_cf(obj=self.nb_manufacturer, model=Manufacturer)
+                self.ensure_default_cf(obj=self.nb_manufacturer, model=Manufacturer)
             else:
                 raise OnboardException(f"fail-config - ERROR manufacturer not found: {self.netdev_vendor}") from err
 
@@ -242,7 +352,7 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
                 {"part_number__iexact": self.netdev_model},
             ]
 
-            self.nb_device_type = object_match(DeviceType, search_array)
+            self.nb_device_type = self.lookup_cache.object_match(DeviceType, search_array)
 
             if self.nb_device_type.manufacturer.id != self.nb_manufacturer.id:
                 raise OnboardException(
@@ -257,7 +367,7 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
                     model=nb_device_type_name,
                     manufacturer=self.nb_manufacturer,
                 )
-                ensure_default_cf(obj=self.nb_device_type, model=DeviceType)
+                self.ensure_default_cf(obj=self.nb_device_type, model=DeviceType)
             else:
                 raise OnboardException(f"fail-config - ERROR device type not found: {self.netdev_model}") from err
 
@@ -275,7 +385,7 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
             Nautobot.
         """
         try:
-            self.nb_device_role = Role.objects.get(name=self.netdev_nb_role_name)
+            self.nb_device_role = self.lookup_cache.get({"name": self.netdev_nb_role_name}, Role)
         except Role.DoesNotExist as err:
             if create_device_role:
                 self.nb_device_role = Role.objects.create(
@@ -284,7 +394,7 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
                 )
                 self.nb_device_role.validated_save()
                 self.nb_device_role.content_types.set([ContentType.objects.get_for_model(Device)])
-                ensure_default_cf(obj=self.nb_device_role, model=Role)
+                self.ensure_default_cf(obj=self.nb_device_role, model=Role)
             else:
                 raise OnboardException(
                     f"fail-config - ERROR device role not found: {self.netdev_nb_role_name}"
@@ -314,7 +424,7 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
             if not self.netdev_nb_platform_name:
                 raise OnboardException(f"fail-config - ERROR device platform not found: {self.netdev_hostname}")
 
-            self.nb_platform = Platform.objects.get(name=self.netdev_nb_platform_name)
+            self.nb_platform = self.lookup_cache.get({"name": self.netdev_nb_platform_name}, Platform)
 
             if not self.nb_platform:
                 Platform.objects.get(network_driver=self.netdev_nb_platform_name)
@@ -323,19 +433,15 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
 
         except Platform.DoesNotExist as err:
             if create_platform_if_missing:
-                platform_to_napalm_nautobot = {
-                    platform: platform.napalm_driver for platform in Platform.objects.all() if platform.napalm_driver
-                }
-
-                # Update Constants if Napalm driver is defined for Nautobot Platform
-                netmiko_to_napalm = {**NETMIKO_TO_NAPALM_STATIC, **platform_to_napalm_nautobot}
+                # Constants updated with the Napalm drivers defined for Nautobot Platforms
+                netmiko_to_napalm = self.lookup_cache.get_netmiko_to_napalm()
 
                 self.nb_platform = Platform.objects.create(
                     name=self.netdev_nb_platform_name,
                     napalm_driver=netmiko_to_napalm[self.netdev_netmiko_device_type],
                     network_driver=self.netdev_netmiko_device_type,
                 )
-                ensure_default_cf(obj=self.nb_platform, model=Platform)
+                self.ensure_default_cf(obj=self.nb_platform, model=Platform)
             else:
                 raise OnboardException(
                     f"fail-general - ERROR platform not found in Nautobot: {self.netdev_nb_platform_name}",
@@ -371,7 +477,7 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
             # Construct lookup arguments if onboarded device does not exist in Nautobot
             ct = ContentType.objects.get_for_model(Device)  # pylint: disable=invalid-name
             try:
-                device_status = Status.objects.get(content_types__in=[ct], name=default_status)
+                device_status = self.lookup_cache.get({"content_types__in": [ct], "name": default_status}, Status)
             except Status.DoesNotExist as err:
                 raise OnboardException(
                     f"fail-general - ERROR could not find existing device status: {default_status}",
@@ -396,7 +502,7 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
 
         try:
             self.device, created = Device.objects.update_or_create(**lookup_args)
-            ensure_default_cf(obj=self.device, model=Device)
+            self.ensure_default_cf(obj=self.device, model=Device)
 
             if created:
                 logger.info("CREATED device: %s", self.netdev_hostname)
@@ -419,7 +525,7 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
                 device=self.device,
                 defaults={
                     "type": InterfaceTypeChoices.TYPE_OTHER,
-                    "status": Status.objects.get(name="Active"),
+                    "status": self.lookup_cache.get({"name": "Active"}, Status),
                     "mgmt_only": mgmt_only_setting,
                 },
             )
@@ -427,7 +533,7 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
                 self.nb_mgmt_ifname.mgmt_only = mgmt_only_setting
                 self.nb_mgmt_ifname.validated_save()
 
-            ensure_default_cf(obj=self.nb_mgmt_ifname, model=Interface)
+            self.ensure_default_cf(obj=self.nb_mgmt_ifname, model=Interface)
 
     def ensure_primary_ip(self):
         """Ensure mgmt_ipaddr exists in IPAM, has the device interface, and is assigned as the primary IP address."""
@@ -436,7 +542,7 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
             ct = ContentType.objects.get_for_model(IPAddress)  # pylint: disable=invalid-name
             default_status_name = PLUGIN_SETTINGS["default_ip_status"]
             try:
-                ip_status = Status.objects.get(content_types__in=[ct], name=default_status_name)
+                ip_status = self.lookup_cache.get({"content_types__in": [ct], "name": default_status_name}, Status)
             except Status.DoesNotExist as err:
                 raise OnboardException(
                     f"fail-general - ERROR could not find existing IP Address status: {default_status_name}",
@@ -447,11 +553,12 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
                 ) from err
 
             # Default to Global Namespace -> TODO: add option to specify default namespace
-            namespace = Namespace.objects.get(name="Global")
+            namespace = self.lookup_cache.get({"name": "Global"}, Namespace)
 
             prefix = ipaddress.ip_interface(f"{self.netdev_mgmt_ip_address}/{self.netdev_mgmt_pflen}")
 
-            nautobot_prefix, _ = Prefix.objects.get_or_create(
+            nautobot_prefix = self.lookup_cache.get_or_create(
+                Prefix,
                 prefix=f"{prefix.network}",
                 namespace=namespace,
                 type=PrefixTypeChoices.TYPE_NETWORK,
@@ -463,7 +570,7 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
                 defaults={"status": ip_status, "type": "host"},
             )
 
-            ensure_default_cf(obj=self.nb_primary_ip, model=IPAddress)
+            self.ensure_default_cf(obj=self.nb_primary_ip, model=IPAddress)
 
             if created or self.nb_primary_ip not in self.nb_mgmt_ifname.ip_addresses.all():
                 logger.info("ASSIGN: IP address %s to %s", self.nb_primary_ip.address, self.nb_mgmt_ifname.name)
@@ -498,3 +605,40 @@ class NautobotKeeper:  # pylint: disable=too-many-instance-attributes
 
         if PLUGIN_SETTINGS["assign_secrets_group"]:
             self.ensure_secret_group()
+
+    @classmethod
+    def ensure_devices(cls, devices_onboarding_kwargs, continue_on_failure=True):
+        """Ensure that many devices exist in the Nautobot system, sharing the lookups of their reference objects.
+
+        Custom field definitions are loaded once for the whole batch and lookups are memoized across the devices.
+        Each device is written in its own transaction, a device failing to onboard leaves no partial objects behind.
+
+        Args:
+            devices_onboarding_kwargs (list): NautobotKeeper keyword arguments of each device
+            continue_on_failure (bool): Onboard the next devices when a device fails, raise the error otherwise
+
+        Returns:
+            list: The NautobotKeeper of each device, or the exception raised if it failed to onboard
+        """
+        lookup_cache = NautobotKeeperCache()
+        lookup_cache.prefetch()
+        results = []
+        for onboarding_kwargs in devices_onboarding_kwargs:
+            nb_k = cls(**onboarding_kwargs, lookup_cache=lookup_cache)
+            try:
+                with lookup_cache.device_transaction():
+                    nb_k.ensure_device()
+            except OnboardException as err:
+                if not continue_on_failure:
+                    raise
+                logger.error("FAILED to onboard %s: %s", onboarding_kwargs.get("netdev_hostname"), err)
+                results.append(err)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                # Database and validation errors only fail this device, its transaction was rolled back.
+                if not continue_on_failure:
+                    raise
+                logger.exception("FAILED to onboard %s: %s", onboarding_kwargs.get("netdev_hostname"), err)
+                results.append(err)
+            else:
+                results.append(nb_k)
+        return results
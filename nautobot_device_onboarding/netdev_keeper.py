@@ -9,10 +9,10 @@ from napalm import get_network_driver
 from napalm.base.exceptions import CommandErrorException, ConnectionException
 from napalm.base.netmiko_helpers import netmiko_args
 from nautobot.dcim.models import Platform
-from netmiko import NetMikoAuthenticationException, NetMikoTimeoutException, SSHDetect
+from netmiko import NetMikoAuthenticationException, NetMikoTimeoutException, SSHDetect, redispatch
 from paramiko.ssh_exception import SSHException
 
-from nautobot_device_onboarding.constants import NETMIKO_TO_NAPALM_STATIC
+from nautobot_device_onboarding.constants import NAPALM_NETMIKO_DEVICE_TYPES, NETMIKO_TO_NAPALM_STATIC
 from nautobot_device_onboarding.exceptions import OnboardException
 from nautobot_device_onboarding.onboarding.onboarding import StandaloneOnboarding
 
@@ -45,6 +45,56 @@ def get_mgmt_info(
     return default_mgmt_if, default_mgmt_pfxlen
 
 
+# Netmiko arguments still used once connected, the others only apply to opening the session.
+NETMIKO_SESSION_ARGS = (
+    "fast_cli",
+    "global_cmd_verify",
+    "global_delay_factor",
+    "read_timeout_override",
+    "session_timeout",
+)
+
+
+def apply_netmiko_args(connection, netmiko_optional_args):
+    """Set the Netmiko arguments used once connected on an open session.
+
+    SSHDetect always disables `global_cmd_verify`, it is reset to the Netmiko default unless the arguments set it.
+    """
+    connection.global_cmd_verify = None
+    for name in NETMIKO_SESSION_ARGS:
+        if name in netmiko_optional_args:
+            setattr(connection, name, netmiko_optional_args[name])
+
+
+class _OpenSession:
+    """Proxy of an SSH session ignoring `disconnect()`, every other attribute is the session's."""
+
+    def __init__(self, session):
+        """Wrap the session."""
+        self._session = session
+
+    def __getattr__(self, name):
+        """Return the attribute of the session."""
+        return getattr(self._session, name)
+
+    def disconnect(self):
+        """Keep the session open."""
+
+
+class PersistentSSHDetect(SSHDetect):
+    """SSHDetect leaving its SSH session open after the detection, as `session`, so it can be used afterwards.
+
+    `autodetect()` disconnects the session once it found the device type, it is given a proxy of the session that
+    ignores the disconnect. Closing `session` is up to the caller.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Connect to the device."""
+        super().__init__(*args, **kwargs)
+        self.session = self.connection
+        self.connection = _OpenSession(self.session)
+
+
 class NetdevKeeper:  # pylint: disable=too-many-instance-attributes
     """Used to maintain information about the network device during the onboarding process."""
 
@@ -95,6 +145,7 @@ class NetdevKeeper:  # pylint: disable=too-many-instance-attributes
         self.facts = None
         self.ip_ifs = None
         self.netmiko_device_type = None
+        self.netmiko_connection = None
         self.onboarding_class = StandaloneOnboarding
         self.driver_addon_result = None
 
@@ -146,7 +197,9 @@ class NetdevKeeper:  # pylint: disable=too-many-instance-attributes
 
         try:
             logger.info("INFO guessing device type: %s", self.hostname)
-            guesser = SSHDetect(**remote_device)
+            # Keep the SSH session open after the detection, so it can be handed over to the NAPALM driver.
+            guesser = PersistentSSHDetect(**remote_device)
+            self.netmiko_connection = guesser.session
             guessed_device_type = guesser.autodetect()
             logger.info("INFO guessed device type: %s", guessed_device_type)
 
@@ -193,6 +246,49 @@ class NetdevKeeper:  # pylint: disable=too-many-instance-attributes
                 f"supported, as it has no specified NAPALM driver",
             )
 
+    def close_netmiko_connection(self):
+        """Close the SSH session of the device type detection, if it wasn't handed over to the NAPALM driver."""
+        if self.netmiko_connection is not None:
+            try:
+                self.netmiko_connection.disconnect()
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                logger.warning("WARNING: unable to close the SSH session of %s: %s", self.hostname, err)
+            self.netmiko_connection = None
+
+    def open_napalm_device(self, napalm_device):
+        """Open the NAPALM driver, reusing the SSH session of the device type detection if the driver supports it.
+
+        Netmiko based NAPALM drivers are given the detection session, changed to the device type the driver uses,
+        saving a second SSH login. Other drivers, or a session that can't be reused, open a new connection.
+
+        The detection session was opened with the same Netmiko arguments as the driver, the ones still used once
+        connected are set again from the driver's as SSHDetect overrides `global_cmd_verify`.
+        """
+        netmiko_device_type = NAPALM_NETMIKO_DEVICE_TYPES.get(self.napalm_driver)
+        connection = self.netmiko_connection
+        if (
+            connection is not None
+            and netmiko_device_type
+            and getattr(napalm_device, "transport", "ssh") == "ssh"
+            and connection.is_alive()
+        ):
+            try:
+                redispatch(connection, device_type=netmiko_device_type)
+                apply_netmiko_args(connection, getattr(napalm_device, "netmiko_optional_args", None) or {})
+                if not getattr(napalm_device, "force_no_enable", False):
+                    connection.enable()
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                logger.info("INFO: unable to reuse the SSH session of %s, opening a new one: %s", self.hostname, err)
+            else:
+                logger.info("INFO: reusing the SSH session of the device type detection: %s", self.hostname)
+                # NAPALM closes the connection along with the driver.
+                napalm_device._netmiko_device = connection  # pylint: disable=protected-access
+                napalm_device.device = connection
+                self.netmiko_connection = None
+                return
+        self.close_netmiko_connection()
+        napalm_device.open()
+
     def get_onboarding_facts(self):
         """Gather information from the network device that is needed to onboard the device into the Nautobot system.
 
@@ -236,7 +332,7 @@ class NetdevKeeper:  # pylint: disable=too-many-instance-attributes
                 optional_args=napalm_optional_args,
             )
 
-            napalm_device.open()
+            self.open_napalm_device(napalm_device)
 
             logger.info("COLLECT: device facts")
             self.facts = napalm_device.get_facts()
@@ -276,6 +372,9 @@ class NetdevKeeper:  # pylint: disable=too-many-instance-attributes
         except Exception as err:
             raise OnboardException(f"fail-general - {str(err)}") from err
 
+        finally:
+            self.close_netmiko_connection()
+
     def get_netdev_dict(self):
         """Construct network device dict."""
         netdev_dict = {
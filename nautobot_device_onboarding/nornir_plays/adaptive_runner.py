@@ -0,0 +1,228 @@
+"""Nornir runner adapting the number of devices connected to at the same time to how the devices respond."""
+
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List
+
+from nornir.core.inventory import Host
+from nornir.core.processor import Processors
+from nornir.core.task import AggregatedResult, MultiResult, Task
+
+# Exceptions telling that too many devices are connected to at once: the devices, their AAA servers or a jump host
+# are not answering in time or are rejecting logins. Logins rejected under load look like wrong credentials, backing
+# off on them also keeps a fleet with wrong credentials from locking the account out on the AAA servers.
+CONGESTION_EXCEPTIONS = (
+    "NetmikoTimeoutException",
+    "NetmikoAuthenticationException",
+    "ReadTimeout",
+    "SSHException",
+    "AuthenticationException",
+    "TimeoutError",
+    "timeout",
+)
+
+# Weight of the latest response time in the moving average of the response times.
+LATENCY_SMOOTHING = 0.2
+# Number of responses averaged before the average is compared with the fastest one seen.
+LATENCY_WARMUP = 3
+
+
+def is_congested(result: MultiResult) -> bool:
+    """Return True if a device failed with one of the exceptions telling it is connected to with too many others."""
+    return any(
+        entry.exception is not None and type(entry.exception).__name__ in CONGESTION_EXCEPTIONS for entry in result
+    )
+
+
+class AdaptiveConcurrency:  # pylint: disable=too-many-instance-attributes
+    """
+    Number of devices to connect to at the same time, raised and lowered with AIMD as the devices respond.
+
+    The limit starts at `initial_workers` and grows by one for each device responding, doubling the concurrency
+    until the first congestion. It then grows by one for each `limit` devices responding. A device timing out or
+    rejecting the login, or a response time growing past `latency_tolerance` times the fastest average seen, is a
+    congestion: the limit is multiplied by `backoff`, at most once for the devices started before the previous
+    decrease so that a single overload is not counted once per device in flight.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, initial_workers=4, max_workers=20, min_workers=1, backoff=0.5, latency_tolerance=3.0
+    ):
+        """Initialize the limit at `initial_workers`, between `min_workers` and `max_workers`."""
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers)
+        self.limit = float(min(max(initial_workers, self.min_workers), self.max_workers))
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.slow_start = True
+        self.latency = None
+        self.baseline_latency = None
+        self.latency_samples = 0
+        self.started = 0
+        self.recovery = 0
+        self.running = 0
+        self.max_running = 0
+        self.decreases = 0
+        self.congested = 0
+
+    @property
+    def workers(self):
+        """Return the number of devices to connect to at the same time."""
+        return int(self.limit)
+
+    def start(self):
+        """Count a device starting, returns its sequence number."""
+        self.started += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        return self.started
+
+    def _latency_congested(self, latency):
+        """Average a response time, returns True if the average grew past the tolerance."""
+        if latency is None:
+            return False
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += LATENCY_SMOOTHING * (latency - self.latency)
+        self.latency_samples += 1
+        if self.latency_samples < LATENCY_WARMUP:
+            return False
+        if self.baseline_latency is None or self.latency < self.baseline_latency:
+            self.baseline_latency = self.latency
+        return bool(self.latency_tolerance) and self.latency > self.latency_tolerance * self.baseline_latency
+
+    def complete(self, sequence, latency=None, congested=False):
+        """Raise or lower the limit after a device completed, `latency` is the time it took to respond."""
+        self.running -= 1
+        if not congested:
+            congested = self._latency_congested(latency)
+        if congested:
+            self.congested += 1
+            if sequence > self.recovery:
+                self.limit = max(self.min_workers, self.limit * self.backoff)
+                self.slow_start = False
+                self.recovery = self.started
+                self.decreases += 1
+        elif self.slow_start:
+            self.limit = min(self.max_workers, self.limit + 1)
+        else:
+            self.limit = min(self.max_workers, self.limit + 1 / self.limit)
+
+    def statistics(self):
+        """Return the concurrency reached, the final limit and the number of congestions."""
+        return {
+            "max_running": self.max_running,
+            "final_workers": self.workers,
+            "min_workers": self.min_workers,
+            "max_workers": self.max_workers,
+            "decreases": self.decreases,
+            "congested": self.congested,
+        }
+
+
+class _ResponseTimer:
+    """
+    Nornir processor timing how long each device takes to complete its first subtask, its first command.
+
+    The time waited for the connection budget shared by the jobs is not part of the response time of the device.
+    """
+
+    def __init__(self):
+        self.started = {}
+        self.latencies = {}
+
+    def task_started(self, task: Task) -> None:
+        pass
+
+    def task_completed(self, task: Task, result: AggregatedResult) -> None:
+        pass
+
+    def task_instance_started(self, task: Task, host: Host) -> None:
+        self.started[host.name] = time.monotonic()
+
+    def task_instance_completed(self, task: Task, host: Host, result: MultiResult) -> None:
+        pass
+
+    def subtask_instance_started(self, task: Task, host: Host) -> None:
+        pass
+
+    def subtask_instance_completed(self, task: Task, host: Host, result: MultiResult) -> None:
+        if host.name not in self.latencies and not result.failed:
+            self.latencies[host.name] = (
+                time.monotonic() - self.started[host.name] - host.data.get("connection_budget_wait", 0.0)
+            )
+
+
+class AdaptiveRunner:
+    """
+    Nornir runner connecting to as many devices at the same time as they, and their AAA servers, keep up with.
+
+    Unlike the threaded runner and its fixed `num_workers`, the number of devices run at the same time is adapted by
+    `AdaptiveConcurrency`. The response time of a device is the time to open its connection and complete its first
+    command, connecting being most of it. The statistics of the last run report the concurrency reached.
+
+    Arguments:
+        max_workers: highest number of devices to run at the same time, the size of the thread pool
+        initial_workers: number of devices to run at the same time at first
+        min_workers: lowest number of devices to run at the same time
+        backoff: factor applied to the number of devices on a congestion
+        latency_tolerance: growth of the response time seen as a congestion, 0 to ignore the response times
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, max_workers=20, initial_workers=4, min_workers=1, backoff=0.5, latency_tolerance=3.0
+    ):
+        """Initialize the runner."""
+        self.max_workers = max_workers
+        self.initial_workers = initial_workers
+        self.min_workers = min_workers
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.statistics = {}
+
+    def run(self, task: Task, hosts: List[Host]) -> AggregatedResult:
+        """Run the task over each host, starting a host whenever the concurrency allows it."""
+        concurrency = AdaptiveConcurrency(
+            initial_workers=self.initial_workers,
+            max_workers=self.max_workers,
+            min_workers=self.min_workers,
+            backoff=self.backoff,
+            latency_tolerance=self.latency_tolerance,
+        )
+        timer = _ResponseTimer()
+        timed_task = task.copy()
+        timed_task.processors = Processors([*(task.processors or []), timer])
+        pending = deque(hosts)
+        running = {}
+        results = {}
+        with ThreadPoolExecutor(concurrency.max_workers) as pool:
+            while pending or running:
+                while pending and len(running) < concurrency.workers:
+                    host = pending.popleft()
+                    running[pool.submit(timed_task.copy().start, host)] = (host, concurrency.start())
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    host, sequence = running.pop(future)
+                    results[host.name] = future.result()
+                    concurrency.complete(
+                        sequence, latency=timer.latencies.get(host.name), congested=is_congested(results[host.name])
+                    )
+        self.statistics = concurrency.statistics()
+
+        result = AggregatedResult(task.name)
+        for host in hosts:
+            result[host.name] = results[host.name]
+        return result
+
+    def log_statistics(self, logger):
+        """Log the concurrency reached by the last run."""
+        if not self.statistics:
+            return
+        logger.info(
+            f"Connected to up to {self.statistics['max_running']} devices at the same time, "
+            f"ending at {self.statistics['final_workers']} (between {self.statistics['min_workers']} and "
+            f"{self.statistics['max_workers']}), backed off {self.statistics['decreases']} times on "
+            f"{self.statistics['congested']} congested devices."
+        )
@@ -2,12 +2,13 @@
 
 import json
 import os
+import time
 from typing import Dict, Tuple, Union
 
 from django.conf import settings
 from nautobot.dcim.models import Platform
 from nautobot.dcim.utils import get_all_network_driver_mappings
-from nautobot.extras.choices import SecretsGroupAccessTypeChoices, SecretsGroupSecretTypeChoices
+from nautobot.extras.choices import SecretsGroupSecretTypeChoices
 from nautobot.extras.models import SecretsGroup, SecretsGroupAssociation
 from nautobot_plugin_nornir.constants import NORNIR_SETTINGS
 from nautobot_plugin_nornir.plugins.inventory.nautobot_orm import NautobotORMInventory
@@ -15,12 +16,15 @@ from netutils.ping import tcp_ping
 from nornir import InitNornir
 from nornir.core.exceptions import NornirSubTaskError
 from nornir.core.plugins.inventory import InventoryPluginRegister
+from nornir.core.plugins.runners import RunnersPluginRegister
 from nornir.core.task import Result, Task
+from nornir.plugins.runners import ThreadedRunner
 from nornir_netmiko.tasks import netmiko_send_command
 from ntc_templates.parse import parse_output
 from ttp import ttp
 
 from nautobot_device_onboarding.constants import SUPPORTED_COMMAND_PARSERS, SUPPORTED_NETWORK_DRIVERS
+from nautobot_device_onboarding.nornir_plays.adaptive_runner import AdaptiveRunner
 from nautobot_device_onboarding.nornir_plays.empty_inventory import EmptyInventory
 from nautobot_device_onboarding.nornir_plays.inventory_creator import _set_inventory
 from nautobot_device_onboarding.nornir_plays.logger import NornirLogger
@@ -30,12 +34,34 @@ from nautobot_device_onboarding.nornir_plays.transform import (
     get_git_repo_parser_path,
     load_files_with_precedence,
 )
+from nautobot_device_onboarding.utils.connection_budget import GLOBAL_POOL, ConnectionBudget, ConnectionBudgetExhausted
+from nautobot_device_onboarding.utils.credentials import SecretsGroupCredentialCache
 from nautobot_device_onboarding.utils.helper import check_for_required_file
 
 PARSER_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(__file__)), "parsers"))
 
 InventoryPluginRegister.register("nautobot-inventory", NautobotORMInventory)
 InventoryPluginRegister.register("empty-inventory", EmptyInventory)
+RunnersPluginRegister.register("adaptive", AdaptiveRunner)
+
+app_settings = settings.PLUGINS_CONFIG["nautobot_device_onboarding"]
+
+# Number of workers of the Nornir threaded runner when not set, the most devices the adaptive runner connects to.
+DEFAULT_NUM_WORKERS = 20
+
+# Seconds a command may take to return its output, unless the time budget of the device runs out first.
+READ_TIMEOUT = 60
+
+# Exceptions of a command that may not happen again when the device is tried later, with fewer devices connected to.
+TRANSIENT_EXCEPTIONS = (
+    "NetmikoTimeoutException",
+    "ReadTimeout",
+    "SSHException",
+    "EOFError",
+    "ConnectionResetError",
+    "TimeoutError",
+    "timeout",
+)
 
 
 def deduplicate_command_list(data):
@@ -106,10 +132,16 @@ def _get_commands_to_run(yaml_parsed_info, sync_vlans, sync_vrfs, sync_cables):
     return deduplicate_command_list(all_commands)
 
 
-def netmiko_send_commands(
-    task: Task, command_getter_yaml_data: Dict, command_getter_job: str, logger, **orig_job_kwargs
+def netmiko_send_commands(  # pylint: disable=too-many-arguments
+    task: Task,
+    command_getter_yaml_data: Dict,
+    command_getter_job: str,
+    logger,
+    connection_budget: ConnectionBudget = None,
+    **orig_job_kwargs,
 ):
     """Run commands specified in PLATFORM_COMMAND_MAP."""
+    task.host.data.pop("deferred", None)
     if not task.host.platform:
         return Result(host=task.host, result=f"{task.host.name} has no platform set.", failed=True)
     if task.host.platform not in SUPPORTED_NETWORK_DRIVERS or not "cisco_wlc_ssh":
@@ -139,15 +171,53 @@ def netmiko_send_commands(
         )
 
     logger.debug(f"Commands to run: {[cmd['command'] for cmd in commands]}")
+    if connection_budget is None or not connection_budget.enabled:
+        return _send_commands(task, commands, logger)
+    try:
+        with connection_budget.lease(task.host.data.get("connection_pools", [GLOBAL_POOL]), task.host.name) as waited:
+            task.host.data["connection_budget_wait"] = waited
+            try:
+                return _send_commands(task, commands, logger)
+            finally:
+                # The session counts against the budget until it is closed, not when the commands are done.
+                task.host.close_connections()
+    except ConnectionBudgetExhausted as err:
+        return _defer(task, str(err))
+
+
+def _defer(task: Task, reason: str):
+    """Fail a device, marking it to be retried after the other devices, with a new connection."""
+    task.host.data["deferred"] = reason
+    task.host.close_connections()
+    return Result(host=task.host, result=f"{task.host.name} {reason}", failed=True)
+
+
+def _send_commands(task: Task, commands, logger):
+    """
+    Run the commands on a device, within one connection, and parse their output.
+
+    With `command_getter_device_timeout` set, the commands are stopped once the device has taken that many seconds,
+    the read timeout of each command being cut to the time left. With `command_getter_retries` set, a device failing
+    with a transient exception is not kept with partial outputs but deferred, to be retried after the other devices.
+    """
+    device_timeout = app_settings.get("command_getter_device_timeout", 0)
+    defer_transient = bool(app_settings.get("command_getter_retries", 0))
+    started = time.monotonic()
     # All commands in this for loop are running within 1 device connection.
     for result_idx, command in enumerate(commands):
         send_command_kwargs = {}
+        read_timeout = READ_TIMEOUT
+        if device_timeout:
+            remaining = device_timeout - (time.monotonic() - started)
+            if remaining <= 0:
+                return _defer(task, f"exceeded its time budget of {device_timeout}s.")
+            read_timeout = min(read_timeout, remaining)
         try:
             current_result = task.run(
                 task=netmiko_send_command,
                 name=command["command"],
                 command_string=command["command"],
-                read_timeout=60,
+                read_timeout=read_timeout,
                 **send_command_kwargs,
             )
             if command.get("parser") in SUPPORTED_COMMAND_PARSERS:
@@ -215,35 +285,91 @@ def netmiko_send_commands(
         except NornirSubTaskError:
             # These exceptions indicate that the device is unreachable or the credentials are incorrect.
             # We should fail the task early to avoid trying all commands on a device that is unreachable.
-            if type(task.results[result_idx].exception).__name__ == "NetmikoAuthenticationException":
+            exception_name = type(task.results[result_idx].exception).__name__
+            if exception_name == "NetmikoAuthenticationException":
                 return Result(host=task.host, result=f"{task.host.name} failed authentication.", failed=True)
-            if type(task.results[result_idx].exception).__name__ == "NetmikoTimeoutException":
+            if device_timeout and time.monotonic() - started >= device_timeout:
+                return _defer(task, f"exceeded its time budget of {device_timeout}s.")
+            if exception_name == "NetmikoTimeoutException":
+                if defer_transient:
+                    return _defer(task, "SSH Timeout Occured.")
                 return Result(host=task.host, result=f"{task.host.name} SSH Timeout Occured.", failed=True)
+            if defer_transient and exception_name in TRANSIENT_EXCEPTIONS:
+                return _defer(task, f"failed with {exception_name} on {command['command']}.")
             # We don't want to fail the entire subtask if SubTaskError is hit, set result to empty list and failed to False
             # Handle this type or result latter in the ETL process.
             task.results[result_idx].result = []
             task.results[result_idx].failed = False
 
 
-def _parse_credentials(credentials: Union[SecretsGroup, None], logger: NornirLogger = None) -> Tuple[str, str]:
+def get_runner_settings():
+    """
+    Return the Nornir runner of the command getters.
+
+    With `command_getter_adaptive_concurrency` enabled, the command getters use the adaptive runner instead of the
+    runner set in the Nornir settings, up to the number of workers set there.
+    """
+    runner = NORNIR_SETTINGS.get("runner") or {}
+    if not app_settings.get("command_getter_adaptive_concurrency", False) or runner.get("plugin") == "adaptive":
+        return NORNIR_SETTINGS.get("runner")
+    return {
+        "plugin": "adaptive",
+        "options": {
+            "max_workers": runner.get("options", {}).get("num_workers", DEFAULT_NUM_WORKERS),
+            "initial_workers": app_settings.get("command_getter_initial_workers", 4),
+        },
+    }
+
+
+def run_with_retries(nornir_obj, compiled_results, logger, **kwargs):
+    """
+    Run the commands on the devices, then retry the deferred devices after all the others are done.
+
+    The devices deferred by a transient failure or for exceeding their time budget are retried up to
+    `command_getter_retries` times, after a backoff doubling from `command_getter_retry_backoff` seconds, on
+    `command_getter_retry_workers` devices at the same time. A device is only retried once every other device has been
+    run, so the few slowest devices don't hold up the rest of the collection.
+    """
+    nornir_obj.run(task=netmiko_send_commands, logger=logger, **kwargs)
+    if isinstance(nornir_obj.runner, AdaptiveRunner):
+        nornir_obj.runner.log_statistics(logger)
+    retries = app_settings.get("command_getter_retries", 0)
+    backoff = app_settings.get("command_getter_retry_backoff", 10)
+    retry_runner = ThreadedRunner(num_workers=app_settings.get("command_getter_retry_workers", 2))
+    for attempt in range(retries):
+        deferred = sorted(name for name, host in nornir_obj.inventory.hosts.items() if host.data.get("deferred"))
+        if not deferred:
+            return
+        delay = backoff * 2**attempt
+        logger.info(f"Retrying {len(deferred)} devices in {delay}s, retry {attempt + 1} of {retries}: {deferred}.")
+        time.sleep(delay)
+        for name in deferred:
+            compiled_results.pop(name, None)
+            nornir_obj.data.recover_host(name)
+        retry_nornir = nornir_obj.filter(filter_func=lambda host, names=frozenset(deferred): host.name in names)
+        retry_nornir.with_runner(retry_runner).run(task=netmiko_send_commands, logger=logger, **kwargs)
+    deferred = sorted(name for name, host in nornir_obj.inventory.hosts.items() if host.data.get("deferred"))
+    if retries and deferred:
+        logger.info(f"{len(deferred)} devices still failed after {retries} retries: {deferred}.")
+
+
+def _parse_credentials(
+    credentials: Union[SecretsGroup, None],
+    logger: NornirLogger = None,
+    credential_cache: SecretsGroupCredentialCache = None,
+) -> Tuple[str, str]:
     """Parse creds from either secretsgroup or settings, return tuple of username/password."""
     username, password = None, None
 
     if credentials:
-        try:
-            username = credentials.get_secret_value(
-                access_type=SecretsGroupAccessTypeChoices.TYPE_GENERIC,
-                secret_type=SecretsGroupSecretTypeChoices.TYPE_USERNAME,
-            )
-            password = credentials.get_secret_value(
-                access_type=SecretsGroupAccessTypeChoices.TYPE_GENERIC,
-                secret_type=SecretsGroupSecretTypeChoices.TYPE_PASSWORD,
-            )
-        except SecretsGroupAssociation.DoesNotExist:
-            pass
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.debug(f"Error processing credentials from secrets group {credentials.name}: {e}")
-            pass
+        if credential_cache is None:
+            credential_cache = SecretsGroupCredentialCache()
+        parsed_credentials = credential_cache.get(credentials)
+        username, password = parsed_credentials.username, parsed_credentials.password
+        for secret_type in (SecretsGroupSecretTypeChoices.TYPE_USERNAME, SecretsGroupSecretTypeChoices.TYPE_PASSWORD):
+            error = credential_cache.get_errors(credentials).get(secret_type)
+            if error and not isinstance(error, SecretsGroupAssociation.DoesNotExist):
+                logger.debug(f"Error processing credentials from secrets group {credentials.name}: {error}")
     else:
         username = settings.NAPALM_USERNAME
         password = settings.NAPALM_PASSWORD
@@ -265,6 +391,15 @@ def sync_devices_command_getter(job_result, log_level, kwargs):
         ip_addresses = []
         for ip_address in kwargs["csv_file"]:
             ip_addresses.append(ip_address)
+        credential_cache = SecretsGroupCredentialCache()
+        # Retrieve the credentials of every secrets group used in the csv file up front, once per group.
+        secrets_groups = {
+            str(secrets_group.id): secrets_group
+            for secrets_group in SecretsGroup.objects.filter(
+                id__in={row["secrets_group"] for row in kwargs["csv_file"].values() if row["secrets_group"]}
+            )
+        }
+        credential_cache.prefetch(secrets_groups.values())
     else:
         ip_addresses = kwargs["ip_addresses"].replace(" ", "").split(",")
         port = kwargs["port"]
@@ -272,18 +407,20 @@ def sync_devices_command_getter(job_result, log_level, kwargs):
         platform = kwargs["platform"]
         username, password = _parse_credentials(kwargs["secrets_group"], logger=logger)
 
+    connection_budget = ConnectionBudget.from_settings()
+
     # Initiate Nornir instance with empty inventory
     try:
         compiled_results = {}
         with InitNornir(
-            runner=NORNIR_SETTINGS.get("runner"),
+            runner=get_runner_settings(),
             logging={"enabled": False},
             inventory={
                 "plugin": "empty-inventory",
             },
         ) as nornir_obj:
             nr_with_processors = nornir_obj.with_processors([CommandGetterProcessor(logger, compiled_results, kwargs)])
-            loaded_secrets_group = None
+            parsed_secrets_groups = set()
             for entered_ip in ip_addresses:
                 if kwargs["csv_file"]:
                     # get platform if one was provided via csv
@@ -295,16 +432,17 @@ def sync_devices_command_getter(job_result, log_level, kwargs):
                     # parse secrets from secrets groups provided via csv
                     secrets_group_id = kwargs["csv_file"][entered_ip]["secrets_group"]
                     if secrets_group_id:
-                        new_secrets_group = SecretsGroup.objects.get(id=secrets_group_id)
-                        # only update the credentials if the secrets_group specified on a csv row
-                        # is different than the secrets group on the previous csv row. This prevents
-                        # unnecessary repeat calls to secrets providers.
-                        if new_secrets_group != loaded_secrets_group:
-                            logger.info(f"Parsing credentials from Secrets Group: {new_secrets_group.name}")
-                            loaded_secrets_group = new_secrets_group
-                            username, password = _parse_credentials(loaded_secrets_group, logger=logger)
-                            if not (username and password):
-                                logger.error(f"Unable to onboard {entered_ip}, failed to parse credentials")
+                        secrets_group = secrets_groups.get(str(secrets_group_id))
+                        if secrets_group is None:
+                            secrets_group = SecretsGroup.objects.get(id=secrets_group_id)
+                        if secrets_group.pk not in parsed_secrets_groups:
+                            logger.info(f"Parsing credentials from Secrets Group: {secrets_group.name}")
+                            parsed_secrets_groups.add(secrets_group.pk)
+                        username, password = _parse_credentials(
+                            secrets_group, logger=logger, credential_cache=credential_cache
+                        )
+                        if not (username and password):
+                            logger.error(f"Unable to onboard {entered_ip}, failed to parse credentials")
                         single_host_inventory_constructed, exc_info = _set_inventory(
                             host_ip=entered_ip,
                             platform=platform,
@@ -322,14 +460,20 @@ def sync_devices_command_getter(job_result, log_level, kwargs):
                     if exc_info:
                         logger.error(f"Unable to onboard {entered_ip}, failed with exception {exc_info}")
                         continue
+                location = kwargs["csv_file"][entered_ip]["location"] if kwargs["csv_file"] else kwargs.get("location")
+                for host in single_host_inventory_constructed.values():
+                    host.data["connection_pools"] = connection_budget.pools(location=location)
                 nr_with_processors.inventory.hosts.update(single_host_inventory_constructed)
-            nr_with_processors.run(
-                task=netmiko_send_commands,
+            run_with_retries(
+                nr_with_processors,
+                compiled_results,
+                logger,
                 command_getter_yaml_data=nr_with_processors.inventory.defaults.data["platform_parsing_info"],
                 command_getter_job="sync_devices",
-                logger=logger,
+                connection_budget=connection_budget,
                 **kwargs,
             )
+            connection_budget.log_statistics(logger)
     except Exception as err:  # pylint: disable=broad-exception-caught
         logger.info(f"Error During Sync Devices Command Getter: {err}")
     return compiled_results
@@ -344,13 +488,19 @@ def sync_network_data_command_getter(job_result, log_level, kwargs):
         qs = kwargs["devices"]
         if not qs:
             return None
+        connection_budget = ConnectionBudget.from_settings()
+        if connection_budget.enabled:
+            # The pools of each device are looked up from its location and tags, the inventory joins the location.
+            qs = qs.prefetch_related("tags")
         with InitNornir(
-            runner=NORNIR_SETTINGS.get("runner"),
+            runner=get_runner_settings(),
             logging={"enabled": False},
             inventory={
                 "plugin": "nautobot-inventory",
                 "options": {
-                    "credentials_class": NORNIR_SETTINGS.get("credentials"),
+                    # Devices sharing a secrets group share their credentials, retrieved once per group.
+                    "credentials_class": "nautobot_device_onboarding.utils.credentials.SecretsGroupCachingCredentials",
+                    "credentials_params": {"credentials_class": NORNIR_SETTINGS.get("credentials")},
                     "queryset": qs,
                     "defaults": {
                         "platform_parsing_info": add_platform_parsing_info(),
@@ -363,13 +513,22 @@ def sync_network_data_command_getter(job_result, log_level, kwargs):
             },
         ) as nornir_obj:
             nr_with_processors = nornir_obj.with_processors([CommandGetterProcessor(logger, compiled_results, kwargs)])
-            nr_with_processors.run(
-                task=netmiko_send_commands,
+            if connection_budget.enabled:
+                for host in nr_with_processors.inventory.hosts.values():
+                    device = host.data["obj"]
+                    host.data["connection_pools"] = connection_budget.pools(
+                        location=device.location, tags=device.tags.all()
+                    )
+            run_with_retries(
+                nr_with_processors,
+                compiled_results,
+                logger,
                 command_getter_yaml_data=nr_with_processors.inventory.defaults.data["platform_parsing_info"],
                 command_getter_job="sync_network_data",
-                logger=logger,
+                connection_budget=connection_budget,
                 **kwargs,
             )
+            connection_budget.log_statistics(logger)
     except Exception as err:  # pylint: disable=broad-exception-caught
         logger.info(f"Error During Sync Network Data Command Getter: {err}")
     return compiled_results
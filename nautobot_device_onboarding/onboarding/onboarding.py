@@ -10,6 +10,7 @@ class Onboarding:
         """Init the class."""
         self.created_device = None
         self.credentials = None
+        self.lookup_cache = None
 
     def run(self, onboarding_kwargs):
         """Implement run method."""
@@ -21,7 +22,7 @@ class StandaloneOnboarding(Onboarding):
 
     def run(self, onboarding_kwargs):
         """Ensure device is created with Nautobot Keeper."""
-        nb_k = NautobotKeeper(**onboarding_kwargs)
+        nb_k = NautobotKeeper(**onboarding_kwargs, lookup_cache=self.lookup_cache)
         nb_k.ensure_device()
 
         self.created_device = nb_k.device
@@ -0,0 +1,23 @@
+"""Signal handlers for nautobot_device_onboarding."""
+
+from django.db.models.signals import post_delete, post_save
+
+from nautobot_device_onboarding.utils import reference_cache
+
+
+def invalidate_reference_cache(sender, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the shared reference cache of a model when one of its objects is saved or deleted."""
+    if reference_cache.is_enabled():
+        reference_cache.invalidate(sender)
+
+
+def register_signals(sender):  # pylint: disable=unused-argument
+    """Register signals for the reference models."""
+    for model_class in reference_cache.REFERENCE_MODELS:
+        model_label = model_class._meta.label_lower  # pylint: disable=protected-access
+        for signal_name, signal in (("post_save", post_save), ("post_delete", post_delete)):
+            signal.connect(
+                invalidate_reference_cache,
+                sender=model_class,
+                dispatch_uid=f"nautobot_device_onboarding.reference_cache.{signal_name}.{model_label}",
+            )
@@ -0,0 +1 @@
+"""Offline benchmarks of the onboarding jobs, run with `invoke benchmark`."""
@@ -0,0 +1,26 @@
+"""Run the benchmarks: `python -m nautobot_device_onboarding.tests.benchmarks [etl|command-getter|network-data-sync] [options]`."""
+
+import importlib
+import sys
+
+import nautobot
+
+# Benchmark suites by name, the ETL benchmarks run when no suite is named.
+SUITES = {
+    "etl": "nautobot_device_onboarding.tests.benchmarks.etl",
+    "command-getter": "nautobot_device_onboarding.tests.benchmarks.command_getter",
+    "network-data-sync": "nautobot_device_onboarding.tests.benchmarks.network_data_sync",
+}
+
+
+def main():
+    """Set up Nautobot, then run a benchmark suite."""
+    nautobot.setup()
+    argv = sys.argv[1:]
+    suite = argv.pop(0) if argv and argv[0] in SUITES else "etl"
+    # Imported once Django is set up, the benchmarked modules load Nautobot models.
+    return importlib.import_module(SUITES[suite]).main(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Raw CLI output of the mock devices, rendered from their parsed command outputs.
+
+The mock command outputs are stored parsed, as the command getter returns them. The device simulator has to send the
+raw text a device would, so the command getter parses it again: each renderer writes the lines its ntc-templates
+template reads back into the same entries.
+"""
+
+# Width of the VLAN name and status columns of `show vlan`, the ports column starts after them.
+VLAN_NAME_WIDTH = 32
+VLAN_STATUS_WIDTH = 9
+VLAN_PORTS_PER_LINE = 4
+
+
+def _lines(entries, render_entry):
+    """Join the lines rendered for each parsed entry."""
+    lines = []
+    for entry in entries:
+        lines.extend(render_entry(entry))
+    return "\n".join(lines) + "\n"
+
+
+def _cisco_ios_show_version(entry):
+    """Render the lines of `show version` for a parsed entry."""
+    lines = [
+        "Cisco IOS Software, Software "
+        f"({entry['software_image']}), Version {entry['version']}, RELEASE SOFTWARE ({entry['release']})",
+        "Technical Support: http://www.cisco.com/techsupport",
+        "Copyright (c) 1986-2024 by Cisco Systems, Inc.",
+        "",
+        f"ROM: {entry['rommon']}",
+        "",
+        f"{entry['hostname']} uptime is {entry['uptime']}",
+    ]
+    if entry.get("restarted"):
+        lines.append(f"System restarted at {entry['restarted']}")
+    lines.append(f'System image file is "flash:{entry["running_image"]}"')
+    if entry.get("reload_reason"):
+        lines.append(f"Last reload reason: {entry['reload_reason']}")
+    lines.append("")
+    for hardware in entry.get("hardware", []):
+        lines.append(f"cisco {hardware} (APM86XXX) processor (revision A0) with 524288K bytes of memory.")
+    for serial in entry.get("serial", []):
+        lines.append(f"Processor board ID {serial}")
+    for mac_address in entry.get("mac_address", []):
+        lines.append(f"Base ethernet MAC Address       : {mac_address}")
+    lines.append("")
+    lines.append(f"Configuration register is {entry['config_register']}")
+    return lines
+
+
+def _cisco_ios_show_interfaces(entry):
+    """Render the lines of `show interfaces` for a parsed entry."""
+    lines = [
+        f"{entry['interface']} is {entry['link_status']}, line protocol is {entry['protocol_status']}",
+        f"  Hardware is {entry['hardware_type']}, address is {entry['mac_address']} (bia {entry['bia']})",
+    ]
+    if entry.get("description"):
+        lines.append(f"  Description: {entry['description']}")
+    if entry.get("ip_address"):
+        lines.append(f"  Internet address is {entry['ip_address']}/{entry['prefix_length']}")
+    lines.extend(
+        [
+            f"  MTU {entry['mtu']} bytes, BW {entry['bandwidth']}/sec, DLY {entry['delay']},",
+            "     reliability 255/255, txload 1/255, rxload 1/255",
+        ]
+    )
+    if entry.get("vlan_id"):
+        lines.append(f"  Encapsulation {entry['encapsulation']}, Vlan ID  {entry['vlan_id']}.")
+    else:
+        lines.append(f"  Encapsulation {entry['encapsulation']}, loopback not set")
+    if entry.get("duplex"):
+        media_type = entry.get("media_type", "")
+        lines.append(f"  {entry['duplex']}, {entry['speed']}, media type is {media_type}".rstrip())
+    lines.extend(
+        [
+            f"  Last input {entry['last_input']}, output {entry['last_output']}, "
+            f"output hang {entry['last_output_hang']}",
+            f"  Queueing strategy: {entry['queue_strategy']}",
+            f"  5 minute input rate {entry['input_rate']} bits/sec, {entry['input_pps']} packets/sec",
+            f"  5 minute output rate {entry['output_rate']} bits/sec, {entry['output_pps']} packets/sec",
+            f"     {entry['input_packets']} packets input, 0 bytes, 0 no buffer",
+            f"     {entry['runts']} runts, {entry['giants']} giants, 0 throttles",
+        ]
+    )
+    input_errors = (
+        f"     {entry['input_errors']} input errors, {entry['crc']} CRC, {entry['frame']} frame, "
+        f"{entry['overrun']} overrun, 0 ignored"
+    )
+    if entry.get("abort"):
+        input_errors += f", {entry['abort']} abort"
+    lines.append(input_errors)
+    lines.append(f"     {entry['output_packets']} packets output, 0 bytes, 0 underruns")
+    if entry.get("output_errors"):
+        lines.append(f"     {entry['output_errors']} output errors, 0 collisions, 0 interface resets")
+    return lines
+
+
+def _cisco_ios_show_ip_interface(entry):
+    """Render the lines of `show ip interface` for a parsed entry."""
+    lines = [f"{entry['interface']} is {entry['link_status']}, line protocol is {entry['protocol_status']}"]
+    addresses = list(zip(entry.get("ip_address", []), entry.get("prefix_length", [])))
+    if not addresses:
+        lines.append("  Internet protocol processing disabled")
+        return lines
+    ip_address, prefix_length = addresses[0]
+    lines.append(f"  Internet address is {ip_address}/{prefix_length}")
+    lines.append("  Broadcast address is 255.255.255.255")
+    for ip_address, prefix_length in addresses[1:]:
+        lines.append(f"  Secondary address {ip_address}/{prefix_length}")
+    if entry.get("mtu"):
+        lines.append(f"  MTU is {entry['mtu']} bytes")
+    helpers = entry.get("ip_helper", [])
+    if helpers:
+        lines.append(f"  Helper addresses are {helpers[0]}")
+        lines.extend(f"                       {helper}" for helper in helpers[1:])
+    else:
+        lines.append("  Helper address is not set")
+    lines.append("  Directed broadcast forwarding is disabled")
+    if entry.get("vrf"):
+        lines.append(f'  VPN Routing/Forwarding "{entry["vrf"]}"')
+    lines.append(f"  Outgoing access list is {entry.get('outgoing_acl') or 'not set'}")
+    lines.append(f"  Inbound  access list is {entry.get('inbound_acl') or 'not set'}")
+    return lines
+
+
+def _cisco_ios_show_interfaces_switchport(entry):
+    """Render the lines of `show interfaces switchport` for a parsed entry."""
+    lines = [
+        f"Name: {entry['interface']}",
+        f"Switchport: {entry['switchport']}",
+        f"Administrative Mode: {entry['admin_mode']}",
+        f"Operational Mode: {entry['mode']}",
+        "Administrative Trunking Encapsulation: dot1q",
+        f"Negotiation of Trunking: {entry['switchport_negotiation']}",
+        f"Access Mode VLAN: {entry['access_vlan']}",
+        f"Trunking Native Mode VLAN: {entry['native_vlan']}",
+        f"Voice VLAN: {entry['voice_vlan']}",
+        f"Trunking VLANs Enabled: {','.join(entry['trunking_vlans'])}",
+        "Pruning VLANs Enabled: 2-1001",
+        "",
+    ]
+    return lines
+
+
+def render_show_vlan(entries):
+    """Render `show vlan`, the ports of each VLAN wrap over several lines like on a device."""
+    ports_column = " " * (4 + 1 + VLAN_NAME_WIDTH + 1 + VLAN_STATUS_WIDTH + 1)
+    lines = [
+        f"{'VLAN':<4} {'Name':<{VLAN_NAME_WIDTH}} {'Status':<{VLAN_STATUS_WIDTH}} Ports",
+        f"{'-' * 4} {'-' * VLAN_NAME_WIDTH} {'-' * VLAN_STATUS_WIDTH} {'-' * 31}",
+    ]
+    for entry in entries:
+        ports = entry.get("interfaces", [])
+        port_lines = [
+            ", ".join(ports[index : index + VLAN_PORTS_PER_LINE]) for index in range(0, len(ports), VLAN_PORTS_PER_LINE)
+        ] or [""]
+        vlan = f"{entry['vlan_id']:<4} {entry['vlan_name']:<{VLAN_NAME_WIDTH}} {entry['status']:<{VLAN_STATUS_WIDTH}}"
+        lines.append(f"{vlan} {port_lines[0]}".rstrip())
+        lines.extend(f"{ports_column}{port_line}" for port_line in port_lines[1:])
+    lines.extend(["", "VLAN Type  SAID       MTU   Parent RingNo BridgeNo Stp  BrdgMode Trans1 Trans2", ""])
+    return "\n".join(lines)
+
+
+RENDERERS = {
+    "cisco_ios": {
+        "show version": lambda entries: _lines(entries, _cisco_ios_show_version),
+        "show interfaces": lambda entries: _lines(entries, _cisco_ios_show_interfaces),
+        "show ip interface": lambda entries: _lines(entries, _cisco_ios_show_ip_interface),
+        "show interfaces switchport": lambda entries: _lines(entries, _cisco_ios_show_interfaces_switchport),
+        "show vlan": render_show_vlan,
+    },
+}
+
+
+def render_command_outputs(command_outputs, platform):
+    """
+    Return the raw output of each command of a mock device, by command.
+
+    Commands with no parsed entries are rendered as an empty output, which parses as no entries. Commands without a
+    renderer for the platform are left out, the simulator answers them as an invalid command.
+
+    Args:
+        command_outputs (dict): parsed command outputs of the mock device, by command
+        platform (str): network driver of the mock device
+    """
+    renderers = RENDERERS.get(platform, {})
+    raw_outputs = {}
+    for command, entries in command_outputs.items():
+        if not entries:
+            raw_outputs[command] = ""
+        elif command in renderers:
+            raw_outputs[command] = renderers[command](entries)
+    return raw_outputs
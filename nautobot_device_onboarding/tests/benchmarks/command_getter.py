@@ -0,0 +1,259 @@
+"""Throughput and concurrency benchmarks of the command getters, run against simulated devices over SSH."""
+
+import argparse
+import json
+import logging
+import time
+from collections import Counter
+from functools import partial
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.test import override_settings
+from nautobot.dcim.choices import InterfaceTypeChoices
+from nautobot.dcim.models import Device, DeviceType, Interface, Location, LocationType, Manufacturer, Platform
+from nautobot.extras.models import Role, Status
+from nautobot.ipam.choices import PrefixTypeChoices
+from nautobot.ipam.models import IPAddress, IPAddressToInterface, Namespace, Prefix
+from nautobot_plugin_nornir.constants import NORNIR_SETTINGS, PLUGIN_CFG
+
+from nautobot_device_onboarding.nornir_plays.command_getter import (
+    sync_devices_command_getter,
+    sync_network_data_command_getter,
+)
+from nautobot_device_onboarding.tests.benchmarks.fleet import FLEET_PLATFORM
+from nautobot_device_onboarding.tests.benchmarks.ssh_simulator import (
+    LOOPBACK_NETWORK,
+    SIMULATOR_PASSWORD,
+    SIMULATOR_USERNAME,
+    DeviceSimulator,
+    build_simulated_fleet,
+    raise_open_files_limit,
+)
+
+SCENARIOS = {
+    "sync-devices": {"job": "sync_devices", "device_count": 500, "interface_count": 0, "vlans_per_trunk": 0},
+    "sync-network-data": {
+        "job": "sync_network_data",
+        "device_count": 200,
+        "interface_count": 48,
+        "vlans_per_trunk": 50,
+    },
+}
+
+DEFAULT_WORKERS = (20, 100)
+
+# Seconds the simulated devices take to answer each command, plus up to the jitter at random.
+DEFAULT_LATENCY = 0.05
+DEFAULT_JITTER = 0.05
+
+
+class BenchmarkJobResult:
+    """Job result of the benchmarked command getters, counting the log entries by level instead of storing them."""
+
+    def __init__(self):
+        """Initialize the counts."""
+        self.log_counts = Counter()
+
+    def log(self, message, level_choice="info", **kwargs):  # pylint: disable=unused-argument
+        """Count a log entry."""
+        self.log_counts[level_choice] += 1
+
+
+class _Rollback(Exception):
+    """Raised to roll back the devices created for a benchmark."""
+
+
+def _runner_settings(num_workers, adaptive=False):
+    if adaptive:
+        return {"runner": {"plugin": "adaptive", "options": {"max_workers": num_workers}}}
+    return {"runner": {"plugin": "threaded", "options": {"num_workers": num_workers}}}
+
+
+def run_sync_devices(addresses, port, num_workers, adaptive=False):
+    """Run the command getter of the Sync Devices job against the simulated devices, returns its results."""
+    kwargs = {
+        "csv_file": None,
+        "ip_addresses": ",".join(addresses),
+        "port": port,
+        "platform": Platform(name=FLEET_PLATFORM, network_driver=FLEET_PLATFORM),
+        "secrets_group": None,
+        "debug": False,
+        "connectivity_test": False,
+    }
+    with override_settings(NAPALM_USERNAME=SIMULATOR_USERNAME, NAPALM_PASSWORD=SIMULATOR_PASSWORD):
+        with patch.dict(NORNIR_SETTINGS, _runner_settings(num_workers, adaptive)):
+            return sync_devices_command_getter(BenchmarkJobResult(), logging.WARNING, kwargs)
+
+
+def create_devices(addresses):
+    """Create a device managed on each simulated address, returns the queryset of the devices."""
+    status, _ = Status.objects.get_or_create(name="Active")
+    for model in (Device, Interface, IPAddress, Location, Prefix):
+        status.content_types.add(ContentType.objects.get_for_model(model))
+    location_type, _ = LocationType.objects.get_or_create(name="Benchmark Site")
+    location_type.content_types.add(ContentType.objects.get_for_model(Device))
+    location, _ = Location.objects.get_or_create(name="Benchmark Site", location_type=location_type, status=status)
+    role, _ = Role.objects.get_or_create(name="Benchmark Switch")
+    role.content_types.add(ContentType.objects.get_for_model(Device))
+    manufacturer, _ = Manufacturer.objects.get_or_create(name="Cisco")
+    device_type, _ = DeviceType.objects.get_or_create(model="WS-C3560CX-12PC-S", manufacturer=manufacturer)
+    platform, _ = Platform.objects.get_or_create(
+        name=FLEET_PLATFORM, defaults={"network_driver": FLEET_PLATFORM, "manufacturer": manufacturer}
+    )
+    namespace = Namespace.objects.get(name="Global")
+    Prefix.objects.get_or_create(
+        prefix=LOOPBACK_NETWORK,
+        namespace=namespace,
+        defaults={"status": status, "type": PrefixTypeChoices.TYPE_NETWORK},
+    )
+    prefix_length = LOOPBACK_NETWORK.split("/")[1]
+    devices = []
+    for index, address in enumerate(addresses):
+        device = Device.objects.create(
+            name=f"bench-sw-{index:05d}",
+            device_type=device_type,
+            role=role,
+            location=location,
+            status=status,
+            platform=platform,
+        )
+        interface = Interface.objects.create(
+            device=device, name="Vlan10", status=status, type=InterfaceTypeChoices.TYPE_VIRTUAL
+        )
+        ip_address = IPAddress.objects.create(address=f"{address}/{prefix_length}", namespace=namespace, status=status)
+        IPAddressToInterface.objects.create(interface=interface, ip_address=ip_address)
+        device.primary_ip4 = ip_address
+        device.save()
+        devices.append(device.pk)
+    return Device.objects.filter(pk__in=devices)
+
+
+def run_sync_network_data(devices, port, num_workers, adaptive=False):
+    """Run the command getter of the Sync Network Data job against the simulated devices, returns its results."""
+    kwargs = {
+        "devices": devices,
+        "sync_vlans": True,
+        "sync_vrfs": True,
+        "sync_cables": False,
+        "debug": False,
+        "connectivity_test": False,
+    }
+    credentials = {
+        "username": SIMULATOR_USERNAME,
+        "password": SIMULATOR_PASSWORD,
+        "connection_options": {"netmiko": {"port": port}},
+    }
+    nornir_settings = {
+        "credentials": "nautobot_plugin_nornir.plugins.credentials.settings_vars.CredentialsSettingsVars",
+        **_runner_settings(num_workers, adaptive),
+    }
+    with patch.dict(PLUGIN_CFG, credentials), patch.dict(NORNIR_SETTINGS, nornir_settings):
+        return sync_network_data_command_getter(BenchmarkJobResult(), logging.WARNING, kwargs)
+
+
+def measure(run, device_count):
+    """Time a run of a command getter, returns the throughput and the number of devices that failed."""
+    start = time.perf_counter()
+    results = run()
+    seconds = time.perf_counter() - start
+    failed = sum(1 for device_data in results.values() if device_data.get("failed"))
+    return {
+        "seconds": round(seconds, 3),
+        "devices_per_second": round(device_count / seconds, 2) if seconds else None,
+        "succeeded": len(results) - failed,
+        "failed": failed + device_count - len(results),
+    }
+
+
+def run_scenario(  # pylint: disable=too-many-arguments
+    job,
+    device_count,
+    interface_count,
+    vlans_per_trunk,
+    workers=DEFAULT_WORKERS,
+    latency=DEFAULT_LATENCY,
+    jitter=DEFAULT_JITTER,
+    auth_failure_rate=0.0,
+    hang_rate=0.0,
+    adaptive=False,
+):
+    """
+    Run a command getter against a simulated fleet once per number of workers, returns the measures by workers.
+
+    With `adaptive`, the command getter uses the adaptive runner, up to the number of workers.
+    """
+    results = {}
+    with DeviceSimulator() as simulator:
+        addresses = build_simulated_fleet(
+            simulator,
+            device_count,
+            interface_count=interface_count,
+            vlans_per_trunk=vlans_per_trunk,
+            latency=latency,
+            jitter=jitter,
+            auth_failure_rate=auth_failure_rate,
+            hang_rate=hang_rate,
+        )
+        try:
+            with transaction.atomic():
+                if job == "sync_devices":
+                    run, target = run_sync_devices, addresses
+                else:
+                    run, target = run_sync_network_data, create_devices(addresses)
+                for num_workers in workers:
+                    simulator.reset_statistics()
+                    measures = measure(partial(run, target, simulator.port, num_workers, adaptive), device_count)
+                    measures["max_open_sessions"] = simulator.statistics["max_open_sessions"]
+                    measures["auth_failures"] = simulator.statistics["auth_failures"]
+                    results[str(num_workers)] = measures
+                raise _Rollback
+        except _Rollback:
+            pass
+    return results
+
+
+def main(argv=None):
+    """Run the command getter benchmarks and print their results, returns the exit code."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Only run these scenarios.")
+    parser.add_argument("--devices", type=int, help="Number of simulated devices, overrides the scenario.")
+    parser.add_argument(
+        "--workers", type=int, action="append", help="Number of Nornir workers, may be repeated to compare them."
+    )
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY, help="Seconds to answer each command.")
+    parser.add_argument("--jitter", type=float, default=DEFAULT_JITTER, help="Random extra seconds per command.")
+    parser.add_argument("--auth-failure-rate", type=float, default=0.0, help="Fraction of devices failing login.")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Fraction of devices never answering.")
+    parser.add_argument("--adaptive", action="store_true", help="Use the adaptive runner, up to the number of workers.")
+    parser.add_argument("--output", help="JSON file to save the results to.")
+    args = parser.parse_args(argv)
+
+    raise_open_files_limit()
+    results = {}
+    for scenario in args.scenario or SCENARIOS:
+        parameters = dict(SCENARIOS[scenario])
+        if args.devices:
+            parameters["device_count"] = args.devices
+        results[scenario] = run_scenario(
+            **parameters,
+            workers=args.workers or DEFAULT_WORKERS,
+            latency=args.latency,
+            jitter=args.jitter,
+            auth_failure_rate=args.auth_failure_rate,
+            hang_rate=args.hang_rate,
+            adaptive=args.adaptive,
+        )
+        for num_workers, measures in results[scenario].items():
+            print(
+                f"{scenario:<18} {num_workers:>5} workers {measures['seconds']:>9.2f}s "
+                f"{measures['devices_per_second']:>9} devices/s {measures['failed']:>6} failed "
+                f"{measures['max_open_sessions']:>6} max concurrent sessions"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+            output_file.write("\n")
+    return 0
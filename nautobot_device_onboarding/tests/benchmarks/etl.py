@@ -0,0 +1,181 @@
+"""Benchmarks of the network data extraction, transformation and validation, run against synthetic fleets."""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+from jsonschema import validate
+from nornir.core.inventory import ConnectionOptions, Defaults, Host
+
+from nautobot_device_onboarding.jinja_filters import get_vlan_data
+from nautobot_device_onboarding.nornir_plays.formatter import extract_show_data
+from nautobot_device_onboarding.nornir_plays.schemas import NETWORK_DATA_SCHEMA
+from nautobot_device_onboarding.nornir_plays.transform import DATA_DIR, load_command_mappers_from_dir
+from nautobot_device_onboarding.tests.benchmarks.fleet import FLEET_PLATFORM, build_fleet
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "etl_baseline.json")
+
+# Allowed slowdown or memory growth over the baseline before a benchmark fails, 0.2 is 20%.
+DEFAULT_THRESHOLD = 0.2
+
+# Metrics compared with the baseline, higher is worse for both.
+COMPARED_METRICS = ("seconds", "peak_memory_bytes")
+
+SCENARIOS = {
+    "small": {"device_count": 10, "interface_count": 24, "vlans_per_trunk": 10},
+    "wide-devices": {"device_count": 10, "interface_count": 384, "vlans_per_trunk": 10},
+    "vlan-heavy": {"device_count": 10, "interface_count": 48, "vlans_per_trunk": 1000},
+    "fleet": {"device_count": 100, "interface_count": 48, "vlans_per_trunk": 50},
+}
+
+
+def build_host(name, platform_parsing_info):
+    """Return a Nornir host of the synthetic fleet, syncing VLANs and VRFs."""
+    return Host(
+        name=name,
+        hostname=name,
+        port=22,
+        username="username",
+        password="password",  # nosec
+        platform=FLEET_PLATFORM,
+        data={"platform_parsing_info": platform_parsing_info},
+        connection_options={"netmiko": ConnectionOptions(hostname=name, port=22, platform=FLEET_PLATFORM)},
+        defaults=Defaults(data={"sync_vlans": True, "sync_vrfs": True, "sync_cables": False}),
+    )
+
+
+def extract_fleet(hosts, fleet):
+    """Extract the network data of every device, as the command getter processor does."""
+    return {
+        name: extract_show_data(hosts[name], command_outputs, "sync_network_data", False)
+        for name, command_outputs in fleet.items()
+    }
+
+
+def get_fleet_vlan_data(fleet):
+    """Run the `get_vlan_data` filter on every switchport of every device, for tagged and untagged VLANs."""
+    for command_outputs in fleet.values():
+        vlan_mapping = {vlan["vlan_id"]: vlan["vlan_name"] for vlan in command_outputs["show vlan"]}
+        for switchport in command_outputs["show interfaces switchport"]:
+            get_vlan_data([switchport], vlan_mapping, "tagged")
+            get_vlan_data([switchport], vlan_mapping, "untagged")
+
+
+def validate_fleet(extracted_fleet):
+    """Validate the network data of every device against the schema of the network data sync."""
+    for device_data in extracted_fleet.values():
+        validate(device_data, NETWORK_DATA_SCHEMA)
+
+
+def measure(function, device_count, repeat=3):
+    """Time a benchmark and measure its peak memory allocation.
+
+    The time is the best of `repeat` runs. Memory is measured in a separate run, as tracing allocations slows the
+    code down.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    seconds = min(timings)
+    return {
+        "seconds": round(seconds, 6),
+        "devices_per_second": round(device_count / seconds, 2) if seconds else None,
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def run_scenario(device_count, interface_count, vlans_per_trunk, repeat=3):
+    """Run every benchmark against a synthetic fleet, returns the measures by benchmark name."""
+    platform_parsing_info = load_command_mappers_from_dir(DATA_DIR)[FLEET_PLATFORM]
+    fleet = build_fleet(device_count, interface_count, vlans_per_trunk)
+    hosts = {name: build_host(name, platform_parsing_info) for name in fleet}
+    extracted_fleet = extract_fleet(hosts, fleet)
+    return {
+        "extract_show_data": measure(lambda: extract_fleet(hosts, fleet), device_count, repeat),
+        "get_vlan_data": measure(lambda: get_fleet_vlan_data(fleet), device_count, repeat),
+        "schema_validation": measure(lambda: validate_fleet(extracted_fleet), device_count, repeat),
+    }
+
+
+def compare_to_baseline(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return a message for each measure exceeding its baseline by more than the threshold.
+
+    Benchmarks missing from the baseline are not compared.
+    """
+    regressions = []
+    for scenario, benchmarks in results.items():
+        for benchmark, measures in benchmarks.items():
+            baseline_measures = baseline.get(scenario, {}).get(benchmark)
+            if not baseline_measures:
+                continue
+            for metric in COMPARED_METRICS:
+                if not baseline_measures.get(metric):
+                    continue
+                ratio = measures[metric] / baseline_measures[metric]
+                if ratio > 1 + threshold:
+                    regressions.append(
+                        f"{scenario} {benchmark} {metric}: {measures[metric]} is {ratio:.2f}x "
+                        f"the baseline of {baseline_measures[metric]}"
+                    )
+    return regressions
+
+
+def load_baseline(path):
+    """Load the baseline results, an empty baseline if the file doesn't exist."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(path, results):
+    """Save results as the baseline."""
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(results, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write("\n")
+
+
+def main(argv=None):
+    """Run the ETL benchmarks and compare them with the baseline, returns the exit code."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="JSON file of the baseline results.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed regression over the baseline, as a fraction (0.2 allows 20%% slower or larger).",
+    )
+    parser.add_argument("--update-baseline", action="store_true", help="Save the results as the new baseline.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Only run these scenarios.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs of each benchmark.")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for scenario in args.scenario or SCENARIOS:
+        results[scenario] = run_scenario(**SCENARIOS[scenario], repeat=args.repeat)
+        for benchmark, measures in results[scenario].items():
+            print(
+                f"{scenario:<14} {benchmark:<18} {measures['seconds']:>10.4f}s "
+                f"{measures['devices_per_second']:>10} devices/s {measures['peak_memory_bytes'] / 2**20:>8.2f} MiB"
+            )
+
+    baseline = load_baseline(args.baseline)
+    if args.update_baseline or not baseline:
+        save_baseline(args.baseline, {**baseline, **results})
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    return 1 if regressions else 0
@@ -0,0 +1,87 @@
+"""Synthetic fleets of devices, built by scaling the mock command getter results."""
+
+import copy
+import json
+import os
+
+MOCK_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "mock")
+
+# The fleet is made of copies of this device, the cisco_ios mock includes every command the network data sync uses.
+FLEET_PLATFORM = "cisco_ios"
+FLEET_FIXTURE = "command_getter_result_1.json"
+
+
+def load_command_outputs(platform=FLEET_PLATFORM, fixture=FLEET_FIXTURE):
+    """Load the parsed command outputs of a mock device."""
+    with open(os.path.join(MOCK_DIR, platform, fixture), "r", encoding="utf-8") as command_info:
+        return json.loads(command_info.read())
+
+
+def _find_template(entries, prefix):
+    """Return the first parsed entry of an interface whose name starts with the prefix."""
+    for entry in entries:
+        if entry["interface"].startswith(prefix):
+            return entry
+    raise ValueError(f"No interface starting with {prefix} in the mock command outputs.")
+
+
+def scale_device(command_outputs, device_index, interface_count, vlans_per_trunk):
+    """Return the command outputs of a synthetic device.
+
+    The mock device gets a unique hostname and serial, `interface_count` additional trunk interfaces and the VLANs
+    carried by each trunk: VLAN 1 and `vlans_per_trunk` VLANs from 2 up.
+
+    Args:
+        command_outputs (dict): parsed command outputs of the mock device
+        device_index (int): index of the device in the fleet
+        interface_count (int): number of trunk interfaces added to the device
+        vlans_per_trunk (int): number of tagged VLANs on each trunk
+    """
+    outputs = copy.deepcopy(command_outputs)
+    version = outputs["show version"][0]
+    version["hostname"] = f"bench-sw-{device_index:05d}"
+    version["serial"] = [f"BENCH{device_index:07d}"]
+
+    interface_template = _find_template(command_outputs["show interfaces"], "GigabitEthernet")
+    ip_interface_template = _find_template(command_outputs["show ip interface"], "GigabitEthernet")
+    switchport_template = _find_template(command_outputs["show interfaces switchport"], "Gi")
+    trunking_vlans = [f"2-{vlans_per_trunk + 1}"] if vlans_per_trunk else ["1"]
+    for index in range(interface_count):
+        slot, port = divmod(index, 48)
+        name = f"GigabitEthernet{slot + 2}/0/{port + 1}"
+        mac_address = f"02{device_index:06x}{index:04x}"
+        outputs["show interfaces"].append(
+            {
+                **interface_template,
+                "interface": name,
+                "description": f"bench trunk {index}",
+                "mac_address": f"{mac_address[0:4]}.{mac_address[4:8]}.{mac_address[8:12]}",
+            }
+        )
+        outputs["show ip interface"].append({**ip_interface_template, "interface": name})
+        outputs["show interfaces switchport"].append(
+            {
+                **switchport_template,
+                "interface": f"Gi{slot + 2}/0/{port + 1}",
+                "mode": "trunk",
+                "admin_mode": "trunk",
+                "trunking_vlans": trunking_vlans,
+            }
+        )
+
+    vlan_ids = {vlan["vlan_id"] for vlan in outputs["show vlan"]}
+    for vid in range(2, vlans_per_trunk + 2):
+        if str(vid) not in vlan_ids:
+            outputs["show vlan"].append(
+                {"vlan_id": str(vid), "vlan_name": f"bench-vlan-{vid}", "status": "active", "interfaces": []}
+            )
+    return outputs
+
+
+def build_fleet(device_count, interface_count, vlans_per_trunk):
+    """Return the command outputs of a synthetic fleet, by management IP address of each device."""
+    command_outputs = load_command_outputs()
+    return {
+        f"198.18.{index // 256}.{index % 256}": scale_device(command_outputs, index, interface_count, vlans_per_trunk)
+        for index in range(device_count)
+    }
@@ -0,0 +1,343 @@
+"""Benchmarks of the network data sync adapters, with a budget of SQL queries for each phase of the sync.
+
+The Nautobot database is seeded with a synthetic fleet of devices, with interfaces, VLANs, VRFs and cables, and
+synced once. A few devices are then changed and the loads, diff and sync are measured. The adapters load every
+device in a handful of queries and the sync only writes the changed devices, so the query count of each phase
+must grow sublinearly with the number of devices: a query per device or per interface exceeds its budget.
+"""
+
+import argparse
+import copy
+import json
+import math
+import re
+import time
+from unittest.mock import patch
+
+import netaddr
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from nautobot.dcim.choices import InterfaceTypeChoices
+from nautobot.dcim.models import Cable, Device, DeviceType, Interface, Location, LocationType, Manufacturer, Platform
+from nautobot.extras.choices import CustomFieldTypeChoices
+from nautobot.extras.models import CustomField, JobResult, Role, Status
+from nautobot.ipam.choices import PrefixTypeChoices
+from nautobot.ipam.models import VLAN, VRF, IPAddress, IPAddressToInterface, Namespace, Prefix
+
+from nautobot_device_onboarding.diffsync.adapters.sync_network_data_adapters import (
+    SyncNetworkDataNautobotAdapter,
+    SyncNetworkDataNetworkAdapter,
+)
+from nautobot_device_onboarding.diffsync.diff import SyncNetworkDataDiff
+from nautobot_device_onboarding.jobs import SSOTSyncNetworkData
+from nautobot_device_onboarding.tests.benchmarks.fleet import FLEET_PLATFORM
+
+COMMAND_GETTER = (
+    "nautobot_device_onboarding.diffsync.adapters.sync_network_data_adapters.sync_network_data_command_getter"
+)
+
+PHASES = ("network_load", "nautobot_load", "diff", "sync")
+
+# Query budget of each phase, as a base and a number of queries per square root of the number of devices.
+QUERY_BUDGETS = {
+    "network_load": (10, 1),
+    "nautobot_load": (40, 2),
+    "diff": (5, 1),
+    "sync": (100, 2),
+}
+
+# Devices changed between the seeding sync and the measured one, the same number whatever the size of the fleet.
+CHANGED_DEVICE_COUNT = 2
+
+# Savepoints aren't counted, each transaction of the sync becomes one under the transaction of the benchmark.
+TRANSACTION_CONTROL = re.compile(r"^\s*(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.IGNORECASE)
+
+MANAGEMENT_NETWORK = "198.18.0.0/15"
+LOOPBACK_NETWORK = "100.64.0.0/10"
+MANAGEMENT_INTERFACE = "GigabitEthernet0/0"
+LAG_INTERFACE = "Port-channel1"
+
+SCENARIOS = {
+    "small": {"device_count": 20, "interface_count": 8, "vlan_count": 10, "vrf_count": 2},
+    "fleet": {"device_count": 200, "interface_count": 48, "vlan_count": 50, "vrf_count": 4},
+}
+
+
+class _Rollback(Exception):
+    """Raised to roll back the objects created for a benchmark."""
+
+
+def query_budget(phase, device_count):
+    """Return the number of queries a phase may run when syncing `device_count` devices."""
+    base, per_sqrt_device = QUERY_BUDGETS[phase]
+    return base + math.ceil(per_sqrt_device * math.sqrt(device_count))
+
+
+def _mac_address(device_index, interface_index):
+    """Return a MAC address unique to an interface of the fleet."""
+    mac_address = f"02{device_index:06x}{interface_index:04x}"
+    return f"{mac_address[0:4]}.{mac_address[4:8]}.{mac_address[8:12]}"
+
+
+def _interface(interface_type, mac_address, mode="", **kwargs):
+    """Return the network data of an interface, as returned by the command getter."""
+    return {
+        "type": interface_type,
+        "ip_addresses": [],
+        "mac_address": mac_address,
+        "mtu": "1500",
+        "description": "",
+        "link_status": True,
+        "802.1Q_mode": mode,
+        "lag": "",
+        "untagged_vlan": {},
+        "tagged_vlans": [],
+        "vrf": {},
+        **kwargs,
+    }
+
+
+def build_command_getter_result(device_count, interface_count, vlan_count, vrf_count):
+    """
+    Return the result of the command getter for a synthetic fleet, by device name.
+
+    Each device has a management interface, a LAG made of its first two interfaces, `interface_count` interfaces
+    alternating between access and trunk ports carrying `vlan_count` VLANs, and a loopback in each of `vrf_count`
+    VRFs. Consecutive devices are cabled together on their last interface.
+    """
+    management_hosts = netaddr.IPNetwork(MANAGEMENT_NETWORK).iter_hosts()
+    loopback_hosts = netaddr.IPNetwork(LOOPBACK_NETWORK).iter_hosts()
+    management_prefix_length = netaddr.IPNetwork(MANAGEMENT_NETWORK).prefixlen
+    vlans = [{"name": f"bench-vlan-{vid}", "id": str(vid)} for vid in range(2, vlan_count + 2)]
+    result = {}
+    for device_index in range(device_count):
+        interfaces = {
+            MANAGEMENT_INTERFACE: _interface(
+                InterfaceTypeChoices.TYPE_1GE_FIXED,
+                _mac_address(device_index, 0),
+                ip_addresses=[{"ip_address": str(next(management_hosts)), "prefix_length": management_prefix_length}],
+            ),
+            LAG_INTERFACE: _interface(InterfaceTypeChoices.TYPE_LAG, _mac_address(device_index, 1)),
+        }
+        for index in range(interface_count):
+            if index < 2:
+                interface = _interface(
+                    InterfaceTypeChoices.TYPE_1GE_FIXED, _mac_address(device_index, index + 2), lag=LAG_INTERFACE
+                )
+            elif index % 2 or not vlans:
+                interface = _interface(
+                    InterfaceTypeChoices.TYPE_1GE_FIXED,
+                    _mac_address(device_index, index + 2),
+                    mode="access" if vlans else "",
+                    untagged_vlan=vlans[index % len(vlans)] if vlans else {},
+                )
+            else:
+                interface = _interface(
+                    InterfaceTypeChoices.TYPE_1GE_FIXED,
+                    _mac_address(device_index, index + 2),
+                    mode="tagged",
+                    untagged_vlan=vlans[0],
+                    tagged_vlans=vlans,
+                )
+            interface["description"] = f"bench port {index}"
+            interfaces[f"GigabitEthernet1/0/{index + 1}"] = interface
+        for vrf_index in range(vrf_count):
+            interfaces[f"Loopback{vrf_index}"] = _interface(
+                InterfaceTypeChoices.TYPE_VIRTUAL,
+                _mac_address(device_index, interface_count + 2 + vrf_index),
+                ip_addresses=[{"ip_address": str(next(loopback_hosts)), "prefix_length": 32}],
+                vrf={"name": f"bench-vrf-{vrf_index}"},
+            )
+        result[f"bench-sw-{device_index:05d}"] = {"serial": f"BENCH{device_index:07d}", "interfaces": interfaces}
+
+    cable_interface = f"GigabitEthernet1/0/{interface_count}"
+    for device_data in result.values():
+        device_data["cables"] = []
+    if interface_count:
+        hostnames = list(result)
+        for local, remote in zip(hostnames[0::2], hostnames[1::2]):
+            result[local]["cables"].append(
+                {"remote_device": remote, "local_interface": cable_interface, "remote_interface": cable_interface}
+            )
+            result[remote]["cables"].append(
+                {"remote_device": local, "local_interface": cable_interface, "remote_interface": cable_interface}
+            )
+    return result
+
+
+def change_devices(command_getter_result, device_count=CHANGED_DEVICE_COUNT):
+    """Change the description of an interface on the first `device_count` devices, returns the changed result."""
+    changed_result = copy.deepcopy(command_getter_result)
+    for device_data in list(changed_result.values())[:device_count]:
+        device_data["interfaces"][MANAGEMENT_INTERFACE]["description"] = "changed by the benchmark"
+    return changed_result
+
+
+def seed_devices(command_getter_result):
+    """
+    Create the devices of the command getter result and the objects they need, returns the options of the sync.
+
+    Only the devices and their management interface and address are created, the rest is created by syncing.
+    """
+    status, _ = Status.objects.get_or_create(name="Active")
+    for model in (Device, Interface, IPAddress, Location, Prefix, VLAN, VRF):
+        status.content_types.add(ContentType.objects.get_for_model(model))
+    connected, _ = Status.objects.get_or_create(name="Connected")
+    connected.content_types.add(ContentType.objects.get_for_model(Cable))
+    location_type, _ = LocationType.objects.get_or_create(name="Benchmark Site")
+    location_type.content_types.add(ContentType.objects.get_for_model(Device))
+    location_type.content_types.add(ContentType.objects.get_for_model(VLAN))
+    location, _ = Location.objects.get_or_create(name="Benchmark Site", location_type=location_type, status=status)
+    role, _ = Role.objects.get_or_create(name="Benchmark Switch")
+    role.content_types.add(ContentType.objects.get_for_model(Device))
+    manufacturer, _ = Manufacturer.objects.get_or_create(name="Cisco")
+    device_type, _ = DeviceType.objects.get_or_create(model="WS-C3560CX-12PC-S", manufacturer=manufacturer)
+    platform, _ = Platform.objects.get_or_create(
+        name=FLEET_PLATFORM, defaults={"network_driver": FLEET_PLATFORM, "manufacturer": manufacturer}
+    )
+    namespace, _ = Namespace.objects.get_or_create(name="Global")
+    for network in (MANAGEMENT_NETWORK, LOOPBACK_NETWORK):
+        Prefix.objects.get_or_create(
+            prefix=network, namespace=namespace, defaults={"status": status, "type": PrefixTypeChoices.TYPE_NETWORK}
+        )
+    custom_field, _ = CustomField.objects.get_or_create(
+        key="last_network_data_sync",
+        defaults={"label": "Last Network Data Sync", "type": CustomFieldTypeChoices.TYPE_DATE, "required": False},
+    )
+    custom_field.content_types.add(ContentType.objects.get_for_model(Device))
+
+    for hostname, device_data in command_getter_result.items():
+        device = Device.objects.create(
+            name=hostname,
+            serial=device_data["serial"],
+            device_type=device_type,
+            role=role,
+            location=location,
+            status=status,
+            platform=platform,
+        )
+        management_data = device_data["interfaces"][MANAGEMENT_INTERFACE]
+        interface = Interface.objects.create(
+            device=device, name=MANAGEMENT_INTERFACE, status=status, type=management_data["type"], mgmt_only=True
+        )
+        address = management_data["ip_addresses"][0]
+        ip_address = IPAddress.objects.create(
+            address=f"{address['ip_address']}/{address['prefix_length']}", namespace=namespace, status=status
+        )
+        IPAddressToInterface.objects.create(interface=interface, ip_address=ip_address)
+        device.primary_ip4 = ip_address
+        device.save()
+    return {"namespace": namespace, "status": status, "location": location}
+
+
+def create_job(options, sync_cables=True):
+    """Return a Sync Network Data job with the options of the benchmark, as if it was run from its form."""
+    job = SSOTSyncNetworkData()
+    job.job_result = JobResult.objects.create(
+        name=job.class_path, user=None, task_name="network data sync benchmark", worker="default"
+    )
+    job.debug = False
+    job.namespace = options["namespace"]
+    job.interface_status = options["status"]
+    job.ip_address_status = options["status"]
+    job.default_prefix_status = options["status"]
+    job.location = options["location"]
+    job.sync_vlans = True
+    job.sync_vrfs = True
+    job.sync_cables = sync_cables
+    return job
+
+
+def measure(function):
+    """Run a phase of the sync, returns its result and its wall time and number of queries."""
+    with CaptureQueriesContext(connection) as context:
+        start = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - start
+    queries = [query for query in context.captured_queries if not TRANSACTION_CONTROL.match(query["sql"])]
+    return result, {"seconds": round(seconds, 6), "queries": len(queries)}
+
+
+def run_phases(job, command_getter_result):
+    """Load both adapters, then diff and sync them like the job does, returns the measures of each phase."""
+    measures = {}
+    source = SyncNetworkDataNetworkAdapter(job=job, sync=None)
+    with patch(COMMAND_GETTER, return_value=copy.deepcopy(command_getter_result)):
+        _, measures["network_load"] = measure(source.load)
+    target = SyncNetworkDataNautobotAdapter(job=job, sync=None)
+    _, measures["nautobot_load"] = measure(target.load)
+    diff, measures["diff"] = measure(
+        lambda: source.diff_to(target, diff_class=SyncNetworkDataDiff, flags=job.diffsync_flags)
+    )
+    _, measures["sync"] = measure(
+        lambda: source.sync_to(target, diff_class=SyncNetworkDataDiff, flags=job.diffsync_flags, diff=diff)
+    )
+    measures["diff"]["changes"] = sum(diff.summary()[action] for action in ("create", "update", "delete"))
+    return measures
+
+
+def run_scenario(device_count, interface_count, vlan_count, vrf_count, sync_cables=True):
+    """
+    Seed and sync a synthetic fleet, then change a few devices and measure each phase of syncing them again.
+
+    Everything the scenario creates is rolled back, returns the measures of each phase.
+    """
+    command_getter_result = build_command_getter_result(device_count, interface_count, vlan_count, vrf_count)
+    changed_result = change_devices(command_getter_result, min(device_count, CHANGED_DEVICE_COUNT))
+    measures = {}
+    try:
+        with transaction.atomic():
+            options = seed_devices(command_getter_result)
+            run_phases(create_job(options, sync_cables), command_getter_result)
+            measures = run_phases(create_job(options, sync_cables), changed_result)
+            raise _Rollback
+    except _Rollback:
+        pass
+    return measures
+
+
+def check_budgets(measures, device_count):
+    """Return a message for each phase running more queries than its budget."""
+    exceeded = []
+    for phase in PHASES:
+        budget = query_budget(phase, device_count)
+        if measures[phase]["queries"] > budget:
+            exceeded.append(
+                f"{phase} ran {measures[phase]['queries']} queries for {device_count} devices, over its budget of {budget}"
+            )
+    return exceeded
+
+
+def main(argv=None):
+    """Run the network data sync benchmarks and check their query budgets, returns the exit code."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Only run these scenarios.")
+    parser.add_argument("--devices", type=int, help="Number of devices, overrides the scenario.")
+    parser.add_argument("--no-cables", action="store_true", help="Don't sync cables.")
+    parser.add_argument("--output", help="JSON file to save the results to.")
+    args = parser.parse_args(argv)
+
+    results = {}
+    exceeded = []
+    for scenario in args.scenario or SCENARIOS:
+        parameters = dict(SCENARIOS[scenario])
+        if args.devices:
+            parameters["device_count"] = args.devices
+        results[scenario] = run_scenario(**parameters, sync_cables=not args.no_cables)
+        for phase, measures in results[scenario].items():
+            print(
+                f"{scenario:<8} {phase:<14} {measures['seconds']:>10.4f}s {measures['queries']:>6} queries "
+                f"(budget {query_budget(phase, parameters['device_count'])})"
+            )
+        exceeded.extend(
+            f"{scenario} {message}" for message in check_budgets(results[scenario], parameters["device_count"])
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+            output_file.write("\n")
+    for message in exceeded:
+        print(f"OVER BUDGET: {message}")
+    return 1 if exceeded else 0
@@ -0,0 +1,354 @@
+"""SSH simulator of network devices, serving the raw output of the mock devices to netmiko on loopback addresses."""
+
+import logging
+import random
+import selectors
+import socket
+import threading
+
+import netaddr
+import paramiko
+
+from nautobot_device_onboarding.tests.benchmarks.cli_output import render_command_outputs
+from nautobot_device_onboarding.tests.benchmarks.fleet import FLEET_PLATFORM, load_command_outputs, scale_device
+
+logger = logging.getLogger(__name__)
+# Clients closing their session without a goodbye are logged as errors by paramiko, they are expected here.
+logger.addHandler(logging.NullHandler())
+
+# Simulated devices listen on addresses of this network, on Linux the whole of 127.0.0.0/8 is routed to loopback.
+LOOPBACK_NETWORK = "127.1.0.0/16"
+
+SIMULATOR_USERNAME = "bench"
+SIMULATOR_PASSWORD = "bench"  # nosec
+
+# Seconds allowed to a client to authenticate and open its shell.
+SESSION_SETUP_TIMEOUT = 30
+
+INVALID_INPUT = "% Invalid input detected at '^' marker.\n"
+
+# Commands answered by the simulated devices with no output, the ones netmiko sends to prepare the session.
+SESSION_COMMANDS = ("terminal", "enable")
+EXIT_COMMANDS = ("exit", "logout", "quit")
+
+
+def loopback_addresses(count, network=LOOPBACK_NETWORK):
+    """Return `count` loopback addresses to run simulated devices on."""
+    hosts = netaddr.IPNetwork(network).iter_hosts()
+    addresses = []
+    for _ in range(count):
+        try:
+            addresses.append(str(next(hosts)))
+        except StopIteration as err:
+            raise ValueError(f"{network} has less than {count} host addresses.") from err
+    return addresses
+
+
+def raise_open_files_limit():
+    """Raise the limit of open files to its maximum, each simulated device and each session holds file descriptors."""
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return
+    _, hard_limit = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard_limit, hard_limit))
+
+
+class SimulatedDevice:
+    """
+    A device served by the simulator: its prompt, the raw output of its commands and how it misbehaves.
+
+    Every command is answered after `latency` seconds, plus up to `jitter` seconds at random. A device failing
+    authentication rejects any credentials. A hanging device accepts TCP connections but never starts the SSH
+    session, like a device whose SSH server is stuck, so clients block until their own timeout.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        hostname,
+        command_outputs,
+        username=SIMULATOR_USERNAME,
+        password=SIMULATOR_PASSWORD,
+        latency=0.0,
+        jitter=0.0,
+        fail_auth=False,
+        hang=False,
+    ):
+        """Initialize the device from the raw output of its commands, by command."""
+        self.hostname = hostname
+        self.command_outputs = {" ".join(command.split()): output for command, output in command_outputs.items()}
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_auth = fail_auth
+        self.hang = hang
+
+    @property
+    def prompt(self):
+        """Return the privileged prompt of the device."""
+        return f"{self.hostname}#"
+
+    def response_delay(self):
+        """Return the number of seconds to wait before answering a command."""
+        return self.latency + random.uniform(0, self.jitter)  # nosec
+
+    def run_command(self, command):
+        """Return the output of a command, None if it ends the session."""
+        command = " ".join(command.split())
+        if not command or command.split()[0] in SESSION_COMMANDS:
+            return ""
+        if command in EXIT_COMMANDS:
+            return None
+        return self.command_outputs.get(command, INVALID_INPUT)
+
+
+class _DeviceServerInterface(paramiko.ServerInterface):
+    """Authenticate the clients of a simulated device and give them an interactive shell."""
+
+    def __init__(self, device, on_auth_failure):
+        self.device = device
+        self.on_auth_failure = on_auth_failure
+        self.shell_requested = threading.Event()
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_auth_password(self, username, password):
+        if self.device.fail_auth or (username, password) != (self.device.username, self.device.password):
+            self.on_auth_failure()
+            return paramiko.AUTH_FAILED
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_pty_request(self, channel, term, width, height, pixelwidth, pixelheight, modes):  # pylint: disable=too-many-arguments
+        return True
+
+    def check_channel_shell_request(self, channel):
+        self.shell_requested.set()
+        return True
+
+
+class DeviceSimulator:
+    """
+    Serve simulated devices over SSH, each on its own loopback address and all on the same port.
+
+    A single thread accepts the connections of every device, each session is then served by a thread of its own.
+    The statistics count the connections, authentication failures and commands answered, and the highest number of
+    sessions open at the same time, the concurrency the clients actually reached.
+
+    Usage:
+        with DeviceSimulator() as simulator:
+            simulator.add_device("127.1.0.1", SimulatedDevice("sw1", {"show version": "..."}))
+            # Connect to 127.1.0.1 on simulator.port
+    """
+
+    def __init__(self, port=0, host_key=None):
+        """Initialize the simulator, port 0 picks a free port when the first device is added."""
+        self.port = port
+        self.host_key = host_key or paramiko.RSAKey.generate(2048)
+        self.devices = {}
+        self._lock = threading.Lock()
+        self.statistics = {}
+        self.reset_statistics()
+        self._selector = selectors.DefaultSelector()
+        self._stopped = threading.Event()
+        self._sockets = set()
+        self._thread = None
+
+    def __enter__(self):
+        """Start serving the devices."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop serving the devices."""
+        self.stop()
+
+    def add_device(self, address, device):
+        """Listen for the connections to a device on an address."""
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            listener.bind((address, self.port))
+            listener.listen(128)
+        except OSError:
+            listener.close()
+            raise
+        listener.setblocking(False)
+        self.port = listener.getsockname()[1]
+        self.devices[address] = device
+        self._selector.register(listener, selectors.EVENT_READ, device)
+
+    def start(self):
+        """Accept the connections to the devices in a background thread."""
+        self._thread = threading.Thread(target=self._accept_connections, name="device-simulator", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop accepting connections and close every session."""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+        for key in list(self._selector.get_map().values()):
+            self._selector.unregister(key.fileobj)
+            key.fileobj.close()
+        self._selector.close()
+        with self._lock:
+            sockets = list(self._sockets)
+        for sock in sockets:
+            sock.close()
+
+    def reset_statistics(self):
+        """Reset the statistics, the sessions still open are counted as open."""
+        with self._lock:
+            open_sessions = self.statistics.get("open_sessions", 0)
+            self.statistics = {
+                "connections": 0,
+                "auth_failures": 0,
+                "commands": 0,
+                "open_sessions": open_sessions,
+                "max_open_sessions": open_sessions,
+            }
+
+    def _count(self, statistic, increment=1):
+        with self._lock:
+            self.statistics[statistic] += increment
+            if statistic == "open_sessions":
+                self.statistics["max_open_sessions"] = max(
+                    self.statistics["max_open_sessions"], self.statistics["open_sessions"]
+                )
+
+    def _accept_connections(self):
+        while not self._stopped.is_set():
+            for key, _ in self._selector.select(timeout=0.1):
+                try:
+                    connection, _ = key.fileobj.accept()
+                except (BlockingIOError, OSError):
+                    continue
+                connection.setblocking(True)
+                with self._lock:
+                    self._sockets.add(connection)
+                self._count("connections")
+                threading.Thread(target=self._serve_connection, args=(connection, key.data), daemon=True).start()
+
+    def _serve_connection(self, connection, device):
+        try:
+            if device.hang:
+                # The connection stays open, the client never gets the SSH banner.
+                self._stopped.wait()
+                return
+            self._serve_session(connection, device)
+        finally:
+            with self._lock:
+                self._sockets.discard(connection)
+            connection.close()
+
+    def _serve_session(self, connection, device):
+        transport = paramiko.Transport(connection)
+        transport.set_log_channel(f"{__name__}.transport")
+        transport.add_server_key(self.host_key)
+        server = _DeviceServerInterface(device, on_auth_failure=lambda: self._count("auth_failures"))
+        try:
+            transport.start_server(server=server)
+            channel = transport.accept(SESSION_SETUP_TIMEOUT)
+            if channel is None or not server.shell_requested.wait(SESSION_SETUP_TIMEOUT):
+                return
+            self._count("open_sessions")
+            try:
+                self._run_shell(channel, device)
+            finally:
+                self._count("open_sessions", -1)
+                channel.close()
+        except (paramiko.SSHException, EOFError, OSError):
+            return
+        finally:
+            transport.close()
+
+    def _send(self, channel, text):
+        channel.sendall(text.replace("\n", "\r\n").encode())
+
+    def _run_shell(self, channel, device):
+        """Echo the input like a terminal, answering each line with the command output and the prompt."""
+        self._send(channel, f"\n{device.prompt}")
+        line = ""
+        previous = ""
+        while not self._stopped.is_set():
+            data = channel.recv(4096)
+            if not data:
+                return
+            echo = ""
+            for char in data.decode(errors="replace"):
+                if char == "\n" and previous == "\r":
+                    previous = char
+                    continue
+                previous = char
+                if char not in "\r\n":
+                    line += char
+                    echo += char
+                    continue
+                self._send(channel, f"{echo}\n")
+                echo = ""
+                output = device.run_command(line)
+                line = ""
+                if output is None:
+                    return
+                if output:
+                    self._count("commands")
+                    if self._stopped.wait(device.response_delay()):
+                        return
+                self._send(channel, f"{output}{device.prompt}")
+            if echo:
+                self._send(channel, echo)
+
+
+def build_simulated_fleet(  # pylint: disable=too-many-arguments
+    simulator,
+    device_count,
+    interface_count=0,
+    vlans_per_trunk=0,
+    latency=0.0,
+    jitter=0.0,
+    auth_failure_rate=0.0,
+    hang_rate=0.0,
+    seed=0,
+    network=LOOPBACK_NETWORK,
+):
+    """
+    Add a synthetic fleet of devices to the simulator, returns their addresses.
+
+    Each device serves the mock device of the synthetic fleets, with its management interface on the address the
+    device is simulated on. The devices failing authentication or hanging are drawn at random from `seed`, so the
+    same ones misbehave from one run to the next.
+    """
+    rng = random.Random(seed)  # nosec
+    command_outputs = load_command_outputs()
+    addresses = loopback_addresses(device_count, network)
+    for index, address in enumerate(addresses):
+        device_outputs = scale_device(command_outputs, index, interface_count, vlans_per_trunk)
+        _set_management_address(device_outputs, address)
+        simulator.add_device(
+            address,
+            SimulatedDevice(
+                hostname=device_outputs["show version"][0]["hostname"],
+                command_outputs=render_command_outputs(device_outputs, FLEET_PLATFORM),
+                latency=latency,
+                jitter=jitter,
+                fail_auth=rng.random() < auth_failure_rate,
+                hang=rng.random() < hang_rate,
+            ),
+        )
+    return addresses
+
+
+def _set_management_address(command_outputs, address):
+    """Move the address of the first interface with an IP address to the address the device is simulated on."""
+    for command in ("show interfaces", "show ip interface"):
+        for entry in command_outputs[command]:
+            if entry["ip_address"]:
+                entry["ip_address"] = [address] if isinstance(entry["ip_address"], list) else address
+                break
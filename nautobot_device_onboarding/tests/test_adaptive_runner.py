@@ -0,0 +1,157 @@
+"""Test the adaptive Nornir runner of the command getters."""
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from nornir.core.exceptions import NornirSubTaskError
+from nornir.core.inventory import Host
+from nornir.core.processor import Processors
+from nornir.core.task import Result, Task
+
+from nautobot_device_onboarding.nornir_plays import command_getter
+from nautobot_device_onboarding.nornir_plays.adaptive_runner import AdaptiveConcurrency, AdaptiveRunner
+
+
+class NetmikoTimeoutException(Exception):
+    """Stand-in for the netmiko exception, the runner matches exceptions by name."""
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    """Test the AIMD limit of the AdaptiveConcurrency class."""
+
+    def test_slow_start(self):
+        concurrency = AdaptiveConcurrency(initial_workers=2, max_workers=10)
+        for _ in range(5):
+            concurrency.complete(concurrency.start())
+        self.assertEqual(concurrency.workers, 7)
+        for _ in range(5):
+            concurrency.complete(concurrency.start())
+        self.assertEqual(concurrency.workers, 10)
+
+    def test_congestion(self):
+        concurrency = AdaptiveConcurrency(initial_workers=8, max_workers=10)
+        sequences = [concurrency.start() for _ in range(4)]
+        concurrency.complete(sequences[0], congested=True)
+        self.assertEqual(concurrency.workers, 4)
+        # Devices started before the decrease don't lower the limit again.
+        concurrency.complete(sequences[1], congested=True)
+        self.assertEqual(concurrency.workers, 4)
+        concurrency.complete(concurrency.start(), congested=True)
+        self.assertEqual(concurrency.workers, 2)
+        self.assertEqual(concurrency.decreases, 2)
+        self.assertEqual(concurrency.congested, 3)
+
+    def test_additive_increase(self):
+        concurrency = AdaptiveConcurrency(initial_workers=8, max_workers=10)
+        concurrency.complete(concurrency.start(), congested=True)
+        # One more device for each `limit` devices responding.
+        for _ in range(5):
+            concurrency.complete(concurrency.start())
+        self.assertEqual(concurrency.workers, 5)
+
+    def test_min_workers(self):
+        concurrency = AdaptiveConcurrency(initial_workers=2, max_workers=10, min_workers=2)
+        concurrency.complete(concurrency.start(), congested=True)
+        self.assertEqual(concurrency.workers, 2)
+
+    def test_latency(self):
+        concurrency = AdaptiveConcurrency(initial_workers=4, max_workers=10, latency_tolerance=2.0)
+        for _ in range(3):
+            concurrency.complete(concurrency.start(), latency=1.0)
+        self.assertEqual(concurrency.workers, 7)
+        for sequence in [concurrency.start() for _ in range(5)]:
+            concurrency.complete(sequence, latency=20.0)
+        self.assertEqual(concurrency.decreases, 1)
+        self.assertLess(concurrency.workers, 7)
+
+    def test_latency_ignored(self):
+        concurrency = AdaptiveConcurrency(initial_workers=4, max_workers=10, latency_tolerance=0)
+        for latency in (1.0, 1.0, 1.0, 20.0, 20.0):
+            concurrency.complete(concurrency.start(), latency=latency)
+        self.assertEqual(concurrency.decreases, 0)
+
+
+class TestAdaptiveRunner(unittest.TestCase):
+    """Test the AdaptiveRunner class."""
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.timing_out = set()
+
+    def send_command(self, task):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(0.01)
+            if task.host.name in self.timing_out:
+                raise NetmikoTimeoutException
+            return Result(host=task.host, result=task.host.name)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+    def send_commands(self, task):
+        try:
+            task.run(task=self.send_command)
+        except NornirSubTaskError:
+            return Result(host=task.host, result=f"{task.host.name} SSH Timeout Occured.", failed=True)
+        return None
+
+    def run_runner(self, runner, host_count):
+        hosts = [Host(name=f"sw{index}") for index in range(host_count)]
+        task = Task(self.send_commands, nornir=None, global_dry_run=False, processors=Processors())
+        return runner.run(task, hosts)
+
+    def test_run(self):
+        runner = AdaptiveRunner(max_workers=5, initial_workers=2)
+        result = self.run_runner(runner, 20)
+        self.assertEqual(list(result), [f"sw{index}" for index in range(20)])
+        self.assertEqual(result["sw3"][1].result, "sw3")
+        self.assertLessEqual(self.max_running, 5)
+        self.assertEqual(runner.statistics["max_running"], self.max_running)
+        self.assertEqual(runner.statistics["final_workers"], 5)
+        self.assertEqual(runner.statistics["decreases"], 0)
+
+    def test_run_congested(self):
+        self.timing_out = {f"sw{index}" for index in range(10)}
+        runner = AdaptiveRunner(max_workers=8, initial_workers=8, latency_tolerance=0)
+        result = self.run_runner(runner, 10)
+        self.assertTrue(result["sw0"].failed)
+        self.assertGreater(runner.statistics["decreases"], 1)
+        self.assertLess(runner.statistics["final_workers"], 4)
+        self.assertEqual(runner.statistics["congested"], 10)
+
+    def test_log_statistics(self):
+        runner = AdaptiveRunner(max_workers=2, initial_workers=2)
+        self.run_runner(runner, 2)
+        logger = MagicMock()
+        runner.log_statistics(logger)
+        logger.info.assert_called_once_with(
+            "Connected to up to 2 devices at the same time, ending at 2 (between 1 and 2), "
+            "backed off 0 times on 0 congested devices."
+        )
+
+
+class TestGetRunnerSettings(unittest.TestCase):
+    """Test the Nornir runner settings of the command getters."""
+
+    @patch.dict(command_getter.NORNIR_SETTINGS, {"runner": {"plugin": "threaded", "options": {"num_workers": 50}}})
+    @patch.dict(command_getter.app_settings, {"command_getter_adaptive_concurrency": False})
+    def test_disabled(self):
+        self.assertEqual(command_getter.get_runner_settings(), {"plugin": "threaded", "options": {"num_workers": 50}})
+
+    @patch.dict(command_getter.NORNIR_SETTINGS, {"runner": {"plugin": "threaded", "options": {"num_workers": 50}}})
+    @patch.dict(
+        command_getter.app_settings,
+        {"command_getter_adaptive_concurrency": True, "command_getter_initial_workers": 5},
+    )
+    def test_enabled(self):
+        self.assertEqual(
+            command_getter.get_runner_settings(),
+            {"plugin": "adaptive", "options": {"max_workers": 50, "initial_workers": 5}},
+        )
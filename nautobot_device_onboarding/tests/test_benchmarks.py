@@ -0,0 +1,34 @@
+"""Test the offline benchmarks."""
+
+import unittest
+
+from nautobot_device_onboarding.tests.benchmarks import etl
+from nautobot_device_onboarding.tests.benchmarks.fleet import build_fleet, load_command_outputs
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Test the synthetic fleets and the comparison with the baseline."""
+
+    def test_build_fleet(self):
+        mock_outputs = load_command_outputs()
+        fleet = build_fleet(device_count=2, interface_count=4, vlans_per_trunk=3)
+        self.assertEqual(len(fleet), 2)
+        hostnames = {outputs["show version"][0]["hostname"] for outputs in fleet.values()}
+        self.assertEqual(len(hostnames), 2)
+        for outputs in fleet.values():
+            self.assertEqual(len(outputs["show interfaces"]), len(mock_outputs["show interfaces"]) + 4)
+            self.assertEqual(outputs["show interfaces switchport"][-1]["trunking_vlans"], ["2-4"])
+
+    def test_run_scenario(self):
+        results = etl.run_scenario(device_count=2, interface_count=4, vlans_per_trunk=3, repeat=1)
+        self.assertEqual(set(results), {"extract_show_data", "get_vlan_data", "schema_validation"})
+        for measures in results.values():
+            self.assertGreater(measures["peak_memory_bytes"], 0)
+
+    def test_compare_to_baseline(self):
+        baseline = {"small": {"get_vlan_data": {"seconds": 1.0, "peak_memory_bytes": 1000}}}
+        results = {"small": {"get_vlan_data": {"seconds": 1.1, "peak_memory_bytes": 1500}}}
+        regressions = etl.compare_to_baseline(results, baseline, threshold=0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("peak_memory_bytes", regressions[0])
+        self.assertEqual(etl.compare_to_baseline(results, {}, threshold=0.2), [])
@@ -0,0 +1,109 @@
+"""Test the bulk writer."""
+
+from unittest.mock import MagicMock
+
+from diffsync.enum import DiffSyncStatus
+from diffsync.exceptions import ObjectNotCreated
+from django.db.models.signals import m2m_changed
+from nautobot.core.testing import TestCase
+from nautobot.dcim.choices import InterfaceModeChoices, InterfaceTypeChoices
+from nautobot.dcim.models import Interface
+
+from nautobot_device_onboarding.diffsync.models.sync_network_data_models import check_interface_created
+from nautobot_device_onboarding.tests import utils
+from nautobot_device_onboarding.utils.bulk_writer import InterfaceBulkWriter
+
+
+class TestInterfaceBulkWriter(TestCase):
+    """Test the InterfaceBulkWriter class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize test case."""
+        self.testing_objects = utils.sync_network_data_ensure_required_nautobot_objects()
+        self.job = MagicMock()
+        self.writer = InterfaceBulkWriter(job=self.job, batch_size=10)
+
+    def _new_interface(self, name, device=None, **kwargs):
+        return Interface(
+            device=device or self.testing_objects["device_1"],
+            name=name,
+            status=self.testing_objects["status"],
+            type=InterfaceTypeChoices.TYPE_1GE_FIXED,
+            **kwargs,
+        )
+
+    def test_queue_create_and_flush(self):
+        self.writer.queue_create(self._new_interface("GigabitEthernet2"), key="demo-cisco-1")
+        self.writer.queue_create(self._new_interface("GigabitEthernet3"), key="demo-cisco-1")
+        self.assertEqual(len(self.writer), 2)
+        self.assertFalse(Interface.objects.filter(name="GigabitEthernet2").exists())
+        self.writer.flush()
+        self.assertEqual(len(self.writer), 0)
+        self.assertEqual(self.writer.created, 2)
+        self.assertTrue(Interface.objects.filter(device__name="demo-cisco-1", name="GigabitEthernet3").exists())
+
+    def test_flush_on_key_change(self):
+        self.writer.queue_create(self._new_interface("GigabitEthernet2"), key="demo-cisco-1")
+        self.writer.queue_create(
+            self._new_interface("GigabitEthernet2", device=self.testing_objects["device_2"]), key="demo-cisco-2"
+        )
+        self.assertEqual(self.writer.created, 1)
+        self.assertEqual(len(self.writer), 1)
+
+    def test_flush_on_batch_size(self):
+        for index in range(10):
+            self.writer.queue_create(self._new_interface(f"GigabitEthernet1{index}"), key="demo-cisco-1")
+        self.assertEqual(len(self.writer), 0)
+        self.assertEqual(self.writer.created, 10)
+
+    def test_invalid_object_is_reported(self):
+        self.writer.queue_create(self._new_interface("GigabitEthernet2"), key="demo-cisco-1")
+        self.writer.queue_create(self._new_interface("GigabitEthernet3", mtu=100000), key="demo-cisco-1")
+        self.writer.flush()
+        self.assertEqual(self.writer.created, 1)
+        self.assertEqual(self.writer.failed, 1)
+        self.job.logger.error.assert_called_once()
+        self.assertIn("GigabitEthernet3", self.job.logger.error.call_args.args[0])
+
+    def test_failed_create_fails_diffsync_model(self):
+        diffsync_model = MagicMock()
+        diffsync_model.get_unique_id.return_value = "demo-cisco-1__GigabitEthernet3"
+        self.writer.queue_create(
+            self._new_interface("GigabitEthernet3", mtu=100000), key="demo-cisco-1", diffsync_model=diffsync_model
+        )
+        self.writer.flush()
+        self.assertEqual(diffsync_model.set_status.call_args.args[0], DiffSyncStatus.FAILURE)
+        self.assertIn("GigabitEthernet3", self.writer.failed_creates["demo-cisco-1__GigabitEthernet3"])
+
+    def test_check_interface_created(self):
+        adapter = MagicMock()
+        adapter.get_failed_create.return_value = "Interface GigabitEthernet3 failed to create"
+        with self.assertRaises(ObjectNotCreated):
+            check_interface_created(adapter, "vrf_to_interface", "demo-cisco-1", "GigabitEthernet3")
+        adapter.get_failed_create.assert_called_once_with("interface", "demo-cisco-1__GigabitEthernet3")
+        adapter.get_failed_create.return_value = None
+        check_interface_created(adapter, "vrf_to_interface", "demo-cisco-1", "GigabitEthernet2")
+
+    def test_duplicate_object_is_reported(self):
+        self.writer.queue_create(self._new_interface("GigabitEthernet1"), key="demo-cisco-1")
+        self.writer.queue_create(self._new_interface("GigabitEthernet2"), key="demo-cisco-1")
+        self.writer.flush()
+        self.assertEqual(self.writer.created, 1)
+        self.assertEqual(self.writer.failed, 1)
+        self.assertTrue(Interface.objects.filter(device__name="demo-cisco-1", name="GigabitEthernet2").exists())
+
+    def test_update_clears_tagged_vlans(self):
+        interface = Interface.objects.get(device__name="demo-cisco-1", name="GigabitEthernet1")
+        self.assertEqual(interface.tagged_vlans.count(), 1)
+        interface.mode = InterfaceModeChoices.MODE_ACCESS
+        interface.description = "access port"
+        receiver = MagicMock()
+        m2m_changed.connect(receiver, sender=Interface.tagged_vlans.through)
+        self.addCleanup(m2m_changed.disconnect, receiver, sender=Interface.tagged_vlans.through)
+        self.writer.queue_update(interface, fields=["mode", "description"], key="demo-cisco-1")
+        self.writer.flush()
+        interface.refresh_from_db()
+        self.assertEqual(self.writer.updated, 1)
+        self.assertEqual(interface.description, "access port")
+        self.assertEqual(interface.tagged_vlans.count(), 0)
+        self.assertIn("post_clear", [call.kwargs["action"] for call in receiver.call_args_list])
@@ -1,14 +1,19 @@
 """Test for nornir plays in command_getter."""
 
 import os
+import time
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 import yaml
 from nautobot.core.testing import TransactionTestCase
 from nautobot.extras.choices import SecretsGroupAccessTypeChoices, SecretsGroupSecretTypeChoices
 from nautobot.extras.models import Secret, SecretsGroup, SecretsGroupAssociation
+from nornir.core.inventory import Host
+from nornir.core.processor import Processors
+from nornir.core.task import Result, Task
 
+from nautobot_device_onboarding.nornir_plays import command_getter
 from nautobot_device_onboarding.nornir_plays.command_getter import _get_commands_to_run, _parse_credentials
 from nautobot_device_onboarding.nornir_plays.logger import NornirLogger
 
@@ -279,3 +284,149 @@ class TestSSHCredParsing(TransactionTestCase):
             "napalm_admin",
             "napalamP$$w0rd",
         )
+
+
+class ReadTimeout(Exception):
+    """Stand-in for the netmiko exception, transient exceptions are matched by name."""
+
+
+class NetmikoTimeoutException(Exception):
+    """Stand-in for the netmiko exception, matched by name."""
+
+
+class TestSendCommands(unittest.TestCase):
+    """Test the time budget and the deferral of the devices running their commands."""
+
+    commands = [
+        {"command": "show version", "parser": "raw"},
+        {"command": "show interfaces", "parser": "raw"},
+        {"command": "show vlan", "parser": "raw"},
+    ]
+
+    def setUp(self):
+        self.read_timeouts = []
+        self.delay = 0
+        self.exception = None
+
+    def send_command(self, task, command_string, read_timeout):
+        self.read_timeouts.append(read_timeout)
+        time.sleep(self.delay)
+        if self.exception:
+            raise self.exception
+        return Result(host=task.host, result=command_string)
+
+    def run_commands(self):
+        host = Host(name="sw1")
+        task = Task(
+            command_getter._send_commands,
+            nornir=None,
+            global_dry_run=False,
+            processors=Processors(),
+            commands=self.commands,
+            logger=MagicMock(),
+        )
+        with patch.object(command_getter, "netmiko_send_command", self.send_command):
+            return host, task.start(host)
+
+    @patch.dict(command_getter.app_settings, {"command_getter_device_timeout": 0, "command_getter_retries": 0})
+    def test_no_time_budget(self):
+        host, result = self.run_commands()
+        self.assertFalse(result.failed)
+        self.assertEqual(result[2].result, {"raw": "show interfaces"})
+        self.assertEqual(self.read_timeouts, [60, 60, 60])
+        self.assertNotIn("deferred", host.data)
+
+    @patch.dict(command_getter.app_settings, {"command_getter_device_timeout": 0.05, "command_getter_retries": 0})
+    def test_time_budget(self):
+        self.delay = 0.03
+        host, result = self.run_commands()
+        self.assertTrue(result[0].failed)
+        self.assertEqual(result[0].result, "sw1 exceeded its time budget of 0.05s.")
+        self.assertEqual(host.data["deferred"], "exceeded its time budget of 0.05s.")
+        self.assertEqual(len(self.read_timeouts), 2)
+        self.assertLessEqual(self.read_timeouts[0], 0.05)
+        self.assertLess(self.read_timeouts[1], self.read_timeouts[0])
+
+    @patch.dict(command_getter.app_settings, {"command_getter_device_timeout": 0, "command_getter_retries": 1})
+    def test_transient_exception_deferred(self):
+        self.exception = ReadTimeout()
+        host, result = self.run_commands()
+        self.assertTrue(result[0].failed)
+        self.assertEqual(host.data["deferred"], "failed with ReadTimeout on show version.")
+
+    @patch.dict(command_getter.app_settings, {"command_getter_device_timeout": 0, "command_getter_retries": 0})
+    def test_transient_exception_without_retries(self):
+        self.exception = ReadTimeout()
+        host, result = self.run_commands()
+        self.assertFalse(result.failed)
+        self.assertEqual(result[1].result, [])
+        self.assertNotIn("deferred", host.data)
+
+    @patch.dict(command_getter.app_settings, {"command_getter_device_timeout": 0, "command_getter_retries": 0})
+    def test_ssh_timeout_without_retries(self):
+        self.exception = NetmikoTimeoutException()
+        host, result = self.run_commands()
+        self.assertTrue(result[0].failed)
+        self.assertEqual(result[0].result, "sw1 SSH Timeout Occured.")
+        self.assertEqual(len(self.read_timeouts), 1)
+        self.assertNotIn("deferred", host.data)
+
+    @patch.dict(command_getter.app_settings, {"command_getter_device_timeout": 0, "command_getter_retries": 1})
+    def test_ssh_timeout_deferred(self):
+        self.exception = NetmikoTimeoutException()
+        host, result = self.run_commands()
+        self.assertTrue(result[0].failed)
+        self.assertEqual(host.data["deferred"], "SSH Timeout Occured.")
+
+
+@patch.object(command_getter.time, "sleep")
+@patch.dict(
+    command_getter.app_settings,
+    {"command_getter_retries": 2, "command_getter_retry_backoff": 10, "command_getter_retry_workers": 1},
+)
+class TestRunWithRetries(unittest.TestCase):
+    """Test the retries of the deferred devices after the main pass."""
+
+    def setUp(self):
+        self.hosts = {name: Host(name=name) for name in ("sw1", "sw2", "sw3")}
+        self.nornir_obj = MagicMock(runner=None)
+        self.nornir_obj.inventory.hosts = self.hosts
+        self.retry_nornir = self.nornir_obj.filter.return_value.with_runner.return_value
+        self.compiled_results = {name: {"failed": True} for name in self.hosts}
+
+    def defer(self, *names):
+        def run(**kwargs):  # pylint: disable=unused-argument
+            for name in names:
+                self.hosts[name].data["deferred"] = "SSH Timeout Occured."
+
+        return run
+
+    def test_retry(self, mock_sleep):
+        self.nornir_obj.run.side_effect = self.defer("sw1", "sw3")
+        # The retried devices succeed, netmiko_send_commands clears the deferral of the devices it runs.
+        self.retry_nornir.run.side_effect = lambda **kwargs: [
+            self.hosts[name].data.pop("deferred") for name in ("sw1", "sw3")
+        ]
+        command_getter.run_with_retries(self.nornir_obj, self.compiled_results, MagicMock(), command_getter_job="x")
+
+        mock_sleep.assert_called_once_with(10)
+        self.assertEqual(self.compiled_results, {"sw2": {"failed": True}})
+        self.nornir_obj.data.recover_host.assert_has_calls([call("sw1"), call("sw3")])
+        filter_func = self.nornir_obj.filter.call_args.kwargs["filter_func"]
+        self.assertEqual([name for name, host in self.hosts.items() if filter_func(host)], ["sw1", "sw3"])
+        self.assertEqual(self.retry_nornir.run.call_count, 1)
+        self.assertEqual(self.retry_nornir.run.call_args.kwargs["task"], command_getter.netmiko_send_commands)
+
+    def test_retries_exhausted(self, mock_sleep):
+        self.nornir_obj.run.side_effect = self.defer("sw2")
+        logger = MagicMock()
+        command_getter.run_with_retries(self.nornir_obj, self.compiled_results, logger, command_getter_job="x")
+
+        self.assertEqual(mock_sleep.call_args_list, [call(10), call(20)])
+        self.assertEqual(self.retry_nornir.run.call_count, 2)
+        logger.info.assert_called_with("1 devices still failed after 2 retries: ['sw2'].")
+
+    def test_nothing_deferred(self, mock_sleep):
+        command_getter.run_with_retries(self.nornir_obj, self.compiled_results, MagicMock(), command_getter_job="x")
+        mock_sleep.assert_not_called()
+        self.retry_nornir.run.assert_not_called()
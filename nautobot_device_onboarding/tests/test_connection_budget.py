@@ -0,0 +1,120 @@
+"""Test the budget of SSH sessions shared by all jobs."""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from nautobot.core.testing import TestCase
+
+from nautobot_device_onboarding.utils import connection_budget
+from nautobot_device_onboarding.utils.connection_budget import ConnectionBudget, ConnectionBudgetExhausted
+
+
+@patch.object(connection_budget, "POLL_INTERVAL", 0.01)
+class TestConnectionBudget(TestCase):
+    """Test the ConnectionBudget class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize test case."""
+        cache.clear()
+        region = SimpleNamespace(pk=1, name="Europe", parent=None)
+        self.location = SimpleNamespace(pk=2, name="DC1", parent=region)
+
+    def test_pools(self):
+        budget = ConnectionBudget(budget=10, per_location={"Europe": 5, "tag:Jump Host": 2, "DC2": 3})
+        tags = [SimpleNamespace(name="Jump Host"), SimpleNamespace(name="Core")]
+        self.assertEqual(budget.pools(location=self.location, tags=tags), ["Europe", "global", "tag:Jump Host"])
+        self.assertEqual(budget.pools(), ["global"])
+
+    def test_pools_location_looked_up_once(self):
+        budget = ConnectionBudget(budget=10, per_location={"Europe": 5})
+        budget.pools(location=self.location)
+        # The parent of DC2 was already looked up for DC1, it isn't fetched again.
+        location = SimpleNamespace(pk=3, name="DC2", parent_id=1)
+        self.assertEqual(budget.pools(location=location), ["Europe", "global"])
+        self.assertEqual(budget.location_names[3], ["DC2", "Europe"])
+
+    def test_pools_disabled(self):
+        budget = ConnectionBudget()
+        self.assertFalse(budget.enabled)
+        self.assertEqual(budget.pools(location=self.location), [])
+
+    def test_lease(self):
+        budget = ConnectionBudget(budget=1, acquire_timeout=0)
+        with budget.lease(["global"], "sw1"):
+            with self.assertRaises(ConnectionBudgetExhausted):
+                with budget.lease(["global"], "sw2"):
+                    pass
+        with budget.lease(["global"], "sw2"):
+            pass
+        self.assertEqual(budget.statistics()["leases"], 2)
+        self.assertEqual(budget.statistics()["exhausted"], 1)
+
+    def test_lease_shared(self):
+        # Each job has its own budget, the leases are shared through the cache.
+        with ConnectionBudget(budget=1).lease(["global"], "sw1"):
+            with self.assertRaises(ConnectionBudgetExhausted):
+                with ConnectionBudget(budget=1, acquire_timeout=0).lease(["global"], "sw2"):
+                    pass
+
+    def test_lease_all_pools(self):
+        budget = ConnectionBudget(budget=2, per_location={"DC1": 1}, acquire_timeout=0)
+        with budget.lease(["DC1", "global"], "sw1"):
+            with self.assertRaises(ConnectionBudgetExhausted):
+                with budget.lease(["DC1", "global"], "sw2"):
+                    pass
+            # The slot taken in the global pool was freed when the DC1 pool was full.
+            with budget.lease(["global"], "sw3"):
+                pass
+
+    def test_lease_waits(self):
+        budget = ConnectionBudget(budget=1, acquire_timeout=10)
+        acquired = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with budget.lease(["global"], "sw1"):
+                acquired.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        acquired.wait()
+        threading.Timer(0.1, release.set).start()
+        with budget.lease(["global"], "sw2") as waited:
+            self.assertGreater(waited, 0)
+        thread.join()
+        self.assertEqual(budget.statistics()["waited"], 1)
+
+    def test_lease_not_limited(self):
+        budget = ConnectionBudget(per_location={"DC1": 1}, acquire_timeout=0)
+        with budget.lease(["global"], "sw1"), budget.lease(["global"], "sw2"):
+            pass
+        self.assertEqual(budget.statistics()["leases"], 0)
+
+    def test_cache_unavailable(self):
+        budget = ConnectionBudget(budget=1, acquire_timeout=0)
+        with patch.object(connection_budget, "cache") as mock_cache:
+            mock_cache.add.side_effect = ConnectionError("Redis unavailable")
+            with self.assertLogs(connection_budget.logger, level="WARNING"):
+                with budget.lease(["global"], "sw1"), budget.lease(["global"], "sw2"):
+                    pass
+
+    def test_log_statistics(self):
+        budget = ConnectionBudget(budget=1)
+        with budget.lease(["global"], "sw1"):
+            pass
+        logger = MagicMock()
+        budget.log_statistics(logger)
+        logger.info.assert_called_once_with(
+            "Connection budget: 1 sessions, 0 waited 0.0s in total and up to 0.0s, 0 not connected in time."
+        )
+
+    def test_from_settings(self):
+        with patch.dict(
+            connection_budget.PLUGIN_SETTINGS,
+            {"ssh_concurrency_budget": 20, "ssh_concurrency_budget_per_location": {"DC1": 5}},
+        ):
+            budget = ConnectionBudget.from_settings()
+        self.assertEqual(budget.limits, {"global": 20, "DC1": 5})
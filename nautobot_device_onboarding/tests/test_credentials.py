@@ -0,0 +1,67 @@
+"""Test the job-scoped secrets group credential cache."""
+
+import os
+from unittest.mock import patch
+
+from nautobot.core.testing import TestCase
+from nautobot.extras.choices import SecretsGroupAccessTypeChoices, SecretsGroupSecretTypeChoices
+from nautobot.extras.models import Secret, SecretsGroup, SecretsGroupAssociation
+
+from nautobot_device_onboarding.utils.credentials import SecretsGroupCredentialCache
+
+
+@patch.dict(os.environ, {"ONBOARDING_USERNAME": "admin", "ONBOARDING_PASSWORD": "admin-password"})
+class TestSecretsGroupCredentialCache(TestCase):
+    """Test the SecretsGroupCredentialCache class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize test case."""
+        self.secrets_groups = [SecretsGroup.objects.create(name=f"test secrets group {index}") for index in range(3)]
+        for secret_type, variable in (
+            (SecretsGroupSecretTypeChoices.TYPE_USERNAME, "ONBOARDING_USERNAME"),
+            (SecretsGroupSecretTypeChoices.TYPE_PASSWORD, "ONBOARDING_PASSWORD"),
+        ):
+            secret = Secret.objects.create(
+                name=f"test {secret_type}", provider="environment-variable", parameters={"variable": variable}
+            )
+            for secrets_group in self.secrets_groups[:2]:
+                SecretsGroupAssociation.objects.create(
+                    secrets_group=secrets_group,
+                    secret=secret,
+                    access_type=SecretsGroupAccessTypeChoices.TYPE_GENERIC,
+                    secret_type=secret_type,
+                )
+        self.credential_cache = SecretsGroupCredentialCache()
+
+    def test_prefetch(self):
+        with patch.object(Secret, "get_value", autospec=True, side_effect=Secret.get_value) as mock_get_value:
+            self.credential_cache.prefetch(self.secrets_groups)
+            for secrets_group in self.secrets_groups[:2]:
+                credentials = self.credential_cache.get(secrets_group)
+                self.assertEqual(credentials.username, "admin")
+                self.assertEqual(credentials.password, "admin-password")
+                self.assertIsNone(credentials.secret)
+        # Each secret of each group is retrieved once.
+        self.assertEqual(mock_get_value.call_count, 4)
+
+    def test_missing_secrets(self):
+        credentials = self.credential_cache.get(self.secrets_groups[2])
+        self.assertIsNone(credentials.username)
+        self.assertIsNone(credentials.password)
+        errors = self.credential_cache.get_errors(self.secrets_groups[2])
+        self.assertIsInstance(errors[SecretsGroupSecretTypeChoices.TYPE_USERNAME], SecretsGroupAssociation.DoesNotExist)
+        self.assertIsInstance(errors[SecretsGroupSecretTypeChoices.TYPE_PASSWORD], SecretsGroupAssociation.DoesNotExist)
+
+    def test_provider_error(self):
+        with patch.dict(os.environ, clear=True):
+            self.credential_cache.prefetch(self.secrets_groups[:1])
+        credentials = self.credential_cache.get(self.secrets_groups[0])
+        self.assertIsNone(credentials.username)
+        self.assertEqual(
+            set(self.credential_cache.get_errors(self.secrets_groups[0])),
+            {
+                SecretsGroupSecretTypeChoices.TYPE_USERNAME,
+                SecretsGroupSecretTypeChoices.TYPE_PASSWORD,
+                SecretsGroupSecretTypeChoices.TYPE_SECRET,
+            },
+        )
@@ -0,0 +1,109 @@
+"""Test the concurrent, cached DNS resolver."""
+
+import socket
+import threading
+import unittest
+
+from nautobot_device_onboarding.exceptions import OnboardException
+from nautobot_device_onboarding.utils import dns_resolver
+from nautobot_device_onboarding.utils.helper import onboarding_task_fqdn_to_ip
+
+HOSTS = {"router1.example.com": "10.1.1.1", "router2.example.com": "10.1.1.2"}
+
+
+class FakeClock:
+    """Clock advanced by the tests."""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class StubResolve:
+    """Resolve names from a static table, recording each lookup."""
+
+    def __init__(self, hosts):
+        self.hosts = hosts
+        self.lookups = []
+
+    def __call__(self, name):
+        self.lookups.append(name)
+        try:
+            return self.hosts[name]
+        except KeyError as err:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known") from err
+
+
+class TestDNSResolver(unittest.TestCase):
+    """Test the DNSResolver class."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.resolve = StubResolve(HOSTS)
+        self.resolver = dns_resolver.DNSResolver(resolve=self.resolve, clock=self.clock)
+
+    def test_resolve_all(self):
+        results = self.resolver.resolve_all(["router1.example.com", "router2.example.com", "unknown.example.com"])
+        self.assertEqual(results["router1.example.com"], "10.1.1.1")
+        self.assertEqual(results["router2.example.com"], "10.1.1.2")
+        self.assertIsInstance(results["unknown.example.com"], socket.gaierror)
+
+    def test_resolve_all_concurrently(self):
+        barrier = threading.Barrier(len(HOSTS), timeout=5)
+
+        def resolve(name):
+            # Every lookup waits for the others, this only completes if they run at the same time.
+            barrier.wait()
+            return HOSTS[name]
+
+        resolver = dns_resolver.DNSResolver(resolve=resolve)
+        self.assertEqual(resolver.resolve_all(list(HOSTS)), HOSTS)
+
+    def test_resolve_cached(self):
+        self.assertEqual(self.resolver.resolve("router1.example.com"), "10.1.1.1")
+        self.assertEqual(self.resolver.resolve("router1.example.com"), "10.1.1.1")
+        self.assertEqual(self.resolve.lookups, ["router1.example.com"])
+
+    def test_resolve_cache_expires(self):
+        self.resolver.resolve("router1.example.com")
+        self.clock.now = self.resolver.cache_ttl
+        self.resolver.resolve("router1.example.com")
+        self.assertEqual(self.resolve.lookups, ["router1.example.com", "router1.example.com"])
+
+    def test_resolve_failure_cached(self):
+        for _ in range(2):
+            with self.assertRaises(socket.gaierror):
+                self.resolver.resolve("unknown.example.com")
+        self.assertEqual(self.resolve.lookups, ["unknown.example.com"])
+        self.clock.now = self.resolver.negative_cache_ttl
+        with self.assertRaises(socket.gaierror):
+            self.resolver.resolve("unknown.example.com")
+        self.assertEqual(len(self.resolve.lookups), 2)
+
+    def test_resolve_timeout(self):
+        release = threading.Event()
+
+        def resolve(name):
+            release.wait(5)
+            return HOSTS[name]
+
+        resolver = dns_resolver.DNSResolver(resolve=resolve, timeout=0.2)
+        try:
+            with self.assertRaises(socket.gaierror) as context:
+                resolver.resolve("router1.example.com")
+        finally:
+            release.set()
+        self.assertEqual(context.exception.errno, socket.EAI_AGAIN)
+
+    def test_get_host_names(self):
+        self.assertEqual(
+            dns_resolver.get_host_names(["10.1.1.1", "router1.example.com", "10.1.1.0/24"]), ["router1.example.com"]
+        )
+
+    def test_onboarding_task_fqdn_to_ip(self):
+        self.assertEqual(onboarding_task_fqdn_to_ip("router1.example.com", resolver=self.resolver), "10.1.1.1")
+        self.assertEqual(onboarding_task_fqdn_to_ip("10.1.1.5", resolver=self.resolver), "10.1.1.5")
+        with self.assertRaisesRegex(OnboardException, "fail-dns"):
+            onboarding_task_fqdn_to_ip("unknown.example.com", resolver=self.resolver)
@@ -0,0 +1,88 @@
+"""Test the IP address reconciler."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import netaddr
+from diffsync.enum import DiffSyncStatus
+from nautobot.core.testing import TestCase
+from nautobot.ipam.models import IPAddress, Prefix
+
+from nautobot_device_onboarding.tests import utils
+from nautobot_device_onboarding.utils.ip_reconciler import IPAddressReconciler, PrefixTree
+
+
+class TestPrefixTree(unittest.TestCase):
+    """Test the PrefixTree class."""
+
+    def setUp(self):
+        self.tree = PrefixTree()
+        self.tree.add(netaddr.IPNetwork("10.0.0.0/8"), "10.0.0.0/8")
+        self.tree.add(netaddr.IPNetwork("10.1.1.0/24"), "10.1.1.0/24")
+        self.tree.add(netaddr.IPNetwork("2001:db8::/32"), "2001:db8::/32")
+
+    def test_closest_parent(self):
+        self.assertEqual(self.tree.closest_parent("10.1.1.5"), "10.1.1.0/24")
+        self.assertEqual(self.tree.closest_parent("10.2.0.1"), "10.0.0.0/8")
+        self.assertEqual(self.tree.closest_parent("2001:db8::1"), "2001:db8::/32")
+        self.assertIsNone(self.tree.closest_parent("192.168.1.1"))
+
+    def test_has_subnets(self):
+        self.assertTrue(self.tree.has_subnets(netaddr.IPNetwork("10.0.0.0/8")))
+        self.assertTrue(self.tree.has_subnets(netaddr.IPNetwork("0.0.0.0/0")))
+        self.assertFalse(self.tree.has_subnets(netaddr.IPNetwork("10.1.1.0/24")))
+        self.assertFalse(self.tree.has_subnets(netaddr.IPNetwork("192.168.0.0/16")))
+
+
+class TestIPAddressReconciler(TestCase):
+    """Test the IPAddressReconciler class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize test case."""
+        self.testing_objects = utils.sync_network_data_ensure_required_nautobot_objects()
+        self.job = MagicMock()
+        self.reconciler = IPAddressReconciler(
+            job=self.job,
+            namespace=self.testing_objects["namespace"],
+            default_ip_status=self.testing_objects["status"],
+            default_prefix_status=self.testing_objects["status"],
+        )
+
+    def test_ip_address_with_existing_parent(self):
+        self.reconciler.queue(host="10.1.1.20", mask_length=24)
+        self.reconciler.flush()
+        ip_address = IPAddress.objects.get(host="10.1.1.20", parent__namespace=self.testing_objects["namespace"])
+        self.assertEqual(ip_address.parent, self.testing_objects["prefix"])
+        self.assertEqual(ip_address.mask_length, 24)
+
+    def test_ip_address_without_parent(self):
+        self.reconciler.queue(host="192.168.1.1", mask_length=24)
+        self.reconciler.queue(host="192.168.1.2", mask_length=24)
+        self.reconciler.flush()
+        prefix = Prefix.objects.get(prefix="192.168.1.0/24", namespace=self.testing_objects["namespace"])
+        self.assertEqual(prefix.ip_addresses.count(), 2)
+        self.job.logger.warning.assert_called_once()
+
+    def test_new_prefix_containing_existing_prefix(self):
+        self.reconciler.queue(host="10.1.2.1", mask_length=16)
+        self.reconciler.flush()
+        prefix = Prefix.objects.get(prefix="10.1.0.0/16", namespace=self.testing_objects["namespace"])
+        self.assertEqual(Prefix.objects.get(pk=self.testing_objects["prefix"].pk).parent, prefix)
+        self.assertEqual(IPAddress.objects.get(host="10.1.2.1").parent, prefix)
+
+    def test_existing_ip_address_is_skipped(self):
+        self.reconciler.queue(host="10.1.1.10", mask_length=24)
+        self.reconciler.flush()
+        self.assertEqual(IPAddress.objects.filter(host="10.1.1.10").count(), 1)
+
+    def test_failed_ip_address_fails_diffsync_model(self):
+        diffsync_model = MagicMock()
+        self.reconciler.queue(host="192.168.1.1", mask_length=24, diffsync_model=diffsync_model)
+        with patch.object(PrefixTree, "closest_parent", return_value=None):
+            self.reconciler.flush()
+        self.assertFalse(IPAddress.objects.filter(host="192.168.1.1").exists())
+        self.assertIn("192.168.1.1", self.reconciler.failed_creates)
+        diffsync_model.set_status.assert_called_once_with(
+            DiffSyncStatus.FAILURE, self.reconciler.failed_creates["192.168.1.1"]
+        )
+        self.job.logger.error.assert_called_once()
@@ -1,10 +1,11 @@
 """Test Jobs."""
 
+import io
 from unittest.mock import patch
 
 from nautobot.apps.testing import create_job_result_and_run_job
 from nautobot.core.testing import TransactionTestCase
-from nautobot.dcim.models import Device, Interface, Manufacturer, Platform
+from nautobot.dcim.models import Device, Interface, Location, LocationType, Manufacturer, Platform
 from nautobot.extras.choices import JobResultStatusChoices
 
 from nautobot_device_onboarding import jobs
@@ -52,6 +53,7 @@ class SSOTSyncDevicesTestCase(TransactionTestCase):
         )
 
         self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertTrue(job_result.files.filter(name="query_statistics.json").exists())
         self.assertEqual(2, Device.objects.all().count())
         for returned_device_ip, data in device_data.return_value.items():
             device = Device.objects.get(serial=data["serial"])
@@ -113,6 +115,31 @@ class SSOTSyncDevicesTestCase(TransactionTestCase):
             processed_csv_data = onboarding_job._process_csv_data(csv_file=csv_file)  # pylint: disable=protected-access
         self.assertEqual(processed_csv_data, None)
 
+    def test_process_csv_data__duplicate_location(self):
+        """Test a CSV row matching two locations with the same name and parent name is reported."""
+        region_type = LocationType.objects.get(name="Region")
+        site_type = LocationType.objects.get(name="Site")
+        status = self.testing_objects["status"]
+        for region_name in ("Region 1", "Region 2"):
+            region = Location.objects.create(name=region_name, location_type=region_type, status=status)
+            parent = Location.objects.create(
+                name="Duplicate Parent", parent=region, location_type=region_type, status=status
+            )
+            Location.objects.create(name="Duplicate Site", parent=parent, location_type=site_type, status=status)
+        csv_file = io.BytesIO(
+            b"ip_address_host,location_parent_name,location_name,namespace,port,timeout,set_mgmt_only,"
+            b"update_devices_without_primary_ip,device_role_name,device_status_name,interface_status_name,"
+            b"ip_address_status_name,secrets_group_name,platform_name\n"
+            b"10.1.1.10,Duplicate Parent,Duplicate Site,Global,22,30,TRUE,TRUE,Network,Active,Active,Active,"
+            b"test secrets group,\n"
+        )
+        onboarding_job = jobs.SSOTSyncDevices()
+        with patch.object(onboarding_job, "logger") as logger:
+            processed_csv_data = onboarding_job._process_csv_data(csv_file=csv_file)  # pylint: disable=protected-access
+        self.assertEqual(processed_csv_data, None)
+        logger.error.assert_called_once()
+        self.assertIn("returned more than one Location", logger.error.call_args.args[0])
+
     def test_process_csv_data__empty_file(self):
         """Test error checking of a bad CSV file used for onboarding jobs."""
         onboarding_job = jobs.SSOTSyncDevices()
@@ -131,6 +158,7 @@ class SSOTSyncNetworkDataTestCase(TransactionTestCase):
         # Setup Nautobot Objects
         self.testing_objects = utils.sync_network_data_ensure_required_nautobot_objects()
 
+    @patch.dict(jobs.PLUGIN_SETTINGS, {"sync_memory_snapshots": True})
     @patch("nautobot_device_onboarding.diffsync.adapters.sync_network_data_adapters.sync_network_data_command_getter")
     def test_sync_network_data__success(self, device_data):
         """Test a successful run of the 'Sync Network Data From Network' job"""
@@ -160,6 +188,8 @@ class SSOTSyncNetworkDataTestCase(TransactionTestCase):
         )
 
         self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS, job_result.traceback)
+        self.assertTrue(job_result.files.filter(name="query_statistics.json").exists())
+        self.assertTrue(job_result.files.filter(name="memory_snapshots.json").exists())
         for returned_device_hostname, data in device_data.return_value.items():
             device = Device.objects.get(serial=data["serial"])
             self.assertEqual(device.name, returned_device_hostname)
@@ -188,3 +218,58 @@ class SSOTSyncNetworkDataTestCase(TransactionTestCase):
 
                 if interface_data["vrf"]:
                     self.assertEqual(interface.vrf.name, interface_data["vrf"]["name"])
+
+
+@patch.dict(jobs.PLUGIN_SETTINGS, {"onboarding_task_workers": 4})
+class OnboardingTaskTestCase(TransactionTestCase):
+    """Test OnboardingTask class."""
+
+    databases = ("default", "job_logs")
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize test case."""
+        self.testing_objects = utils.sync_devices_ensure_required_nautobot_objects__jobs_testing()
+        self.job_form_inputs = {
+            "location": self.testing_objects["location_1"].pk,
+            "ip_address": "10.1.1.10,10.1.1.11,10.1.1.12",
+            "port": 22,
+            "timeout": 30,
+            "credentials": None,
+            "platform": None,
+            "role": None,
+            "device_type": None,
+            "continue_on_failure": True,
+        }
+
+    @staticmethod
+    def _collect_facts(address):
+        if address == "10.1.1.11":
+            raise jobs.OnboardException("fail-connect - device unreachable")
+        return address, {"netdev_hostname": address}
+
+    @patch.object(jobs.OnboardingTask, "_write_device")
+    @patch.object(jobs.OnboardingTask, "_collect_facts")
+    def test_onboard_concurrently(self, mock_collect_facts, mock_write_device):
+        """Test devices are written in order, skipping the devices that failed."""
+        mock_collect_facts.side_effect = self._collect_facts
+        job_result = create_job_result_and_run_job(
+            module="nautobot_device_onboarding.jobs", name="OnboardingTask", **self.job_form_inputs
+        )
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(mock_collect_facts.call_count, 3)
+        self.assertEqual(
+            [call.args[0] for call in mock_write_device.call_args_list],
+            ["10.1.1.10", "10.1.1.12"],
+        )
+
+    @patch.object(jobs.OnboardingTask, "_write_device")
+    @patch.object(jobs.OnboardingTask, "_collect_facts")
+    def test_onboard_concurrently__stop_on_failure(self, mock_collect_facts, mock_write_device):
+        """Test the job stops at the first device that failed when it doesn't continue on failure."""
+        mock_collect_facts.side_effect = self._collect_facts
+        self.job_form_inputs["continue_on_failure"] = False
+        job_result = create_job_result_and_run_job(
+            module="nautobot_device_onboarding.jobs", name="OnboardingTask", **self.job_form_inputs
+        )
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_FAILURE)
+        self.assertEqual([call.args[0] for call in mock_write_device.call_args_list], ["10.1.1.10"])
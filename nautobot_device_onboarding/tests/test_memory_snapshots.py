@@ -0,0 +1,96 @@
+"""Test the memory snapshots of the sync jobs."""
+
+import json
+import sys
+import tracemalloc
+from unittest.mock import MagicMock
+
+from diffsync import Adapter, DiffSyncModel
+from nautobot.core.testing import TestCase
+
+from nautobot_device_onboarding.utils.memory_snapshots import MemorySnapshots, retained_size, store_models
+
+
+class Interface(DiffSyncModel):
+    """Interface model of the test adapter."""
+
+    _modelname = "interface"
+    _identifiers = ("name",)
+    _attributes = ("description",)
+
+    name: str
+    description: str = ""
+
+
+class InterfaceAdapter(Adapter):
+    """Adapter holding interfaces."""
+
+    interface = Interface
+    top_level = ["interface"]
+
+
+class TestRetainedSize(TestCase):
+    """Test the retained_size function."""
+
+    def test_containers(self):
+        data = {"interfaces": ["GigabitEthernet1", "GigabitEthernet2"]}
+        expected = (
+            sys.getsizeof(data)
+            + sys.getsizeof("interfaces")
+            + sys.getsizeof(data["interfaces"])
+            + sys.getsizeof("GigabitEthernet1")
+            + sys.getsizeof("GigabitEthernet2")
+        )
+        self.assertEqual(retained_size(data), expected)
+
+    def test_shared_objects_counted_once(self):
+        description = "uplink" * 100
+        self.assertLess(retained_size([description, description]), 2 * sys.getsizeof(description))
+
+    def test_store_models(self):
+        adapter = InterfaceAdapter()
+        adapter.job = {"large": "x" * 100000}
+        for index in range(10):
+            adapter.add(Interface(name=f"GigabitEthernet{index}", description="uplink", adapter=adapter))
+        models = store_models(adapter)
+        self.assertEqual(len(models["interface"]), 10)
+        # The models point back to their adapter, which is not part of the store.
+        self.assertLess(retained_size(models), 100000)
+
+
+class TestMemorySnapshots(TestCase):
+    """Test the MemorySnapshots class."""
+
+    def test_take(self):
+        memory_snapshots = MemorySnapshots(enabled=True)
+        with memory_snapshots.record():
+            command_getter_result = {"sw1": {"serial": "1234"}}
+            memory_snapshots.take("collection", {"command_getter_result": command_getter_result, "diff": None})
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(len(memory_snapshots.snapshots), 1)
+        snapshot = memory_snapshots.snapshots[0]
+        self.assertEqual(snapshot["name"], "collection")
+        self.assertEqual(snapshot["retained"], {"command_getter_result": retained_size(command_getter_result)})
+        self.assertGreaterEqual(snapshot["peak"], snapshot["traced"])
+        self.assertTrue(snapshot["sites"])
+
+    def test_take_disabled(self):
+        memory_snapshots = MemorySnapshots()
+        with memory_snapshots.record():
+            self.assertFalse(tracemalloc.is_tracing())
+            memory_snapshots.take("collection", {"command_getter_result": {}})
+        self.assertEqual(memory_snapshots.snapshots, [])
+
+    def test_report(self):
+        job = MagicMock()
+        memory_snapshots = MemorySnapshots(enabled=True)
+        with memory_snapshots.record():
+            memory_snapshots.take("execute_sync", {"command_getter_result": {}})
+        memory_snapshots.report(job)
+
+        job.logger.info.assert_any_call(
+            f"Memory after execute_sync: command_getter_result retains {sys.getsizeof({})} bytes."
+        )
+        filename, content = job.create_file.call_args.args
+        self.assertEqual(filename, "memory_snapshots.json")
+        self.assertEqual(json.loads(content)["snapshots"][0]["name"], "execute_sync")
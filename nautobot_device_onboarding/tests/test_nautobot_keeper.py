@@ -1,14 +1,17 @@
 """Unit tests for nautobot_device_onboarding.onboard module and its classes."""
 
+from unittest.mock import patch
+
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError
 from django.test import TestCase
 from nautobot.dcim.choices import InterfaceTypeChoices
 from nautobot.dcim.models import Device, DeviceType, Interface, Location, LocationType, Manufacturer, Platform
 from nautobot.extras.choices import CustomFieldTypeChoices
 from nautobot.extras.models import CustomField, Role, Status
 from nautobot.extras.models.secrets import SecretsGroup
-from nautobot.ipam.models import IPAddress
+from nautobot.ipam.models import IPAddress, Prefix
 
 from nautobot_device_onboarding.exceptions import OnboardException
 from nautobot_device_onboarding.nautobot_keeper import NautobotKeeper
@@ -591,3 +594,85 @@ class NautobotKeeperTestCase(TestCase):
 
         nbk.ensure_secret_group()
         self.assertEqual(nbk.netdev_nb_credentials.name, test_secret_group.name)
+
+    def test_ensure_devices(self):
+        """Verify devices are onboarded in a batch, a failing device being rolled back."""
+        onboarding_kwargs = {
+            "netdev_nb_role_name": "switch",
+            "netdev_vendor": "Cisco",
+            "netdev_model": "c2960",
+            "netdev_nb_location_name": self.site1.name,
+            "netdev_netmiko_device_type": "cisco_ios",
+            "netdev_mgmt_ifname": "Management0",
+            "netdev_mgmt_pflen": 24,
+        }
+        devices_onboarding_kwargs = [
+            {**onboarding_kwargs, "netdev_hostname": "sw1", "netdev_mgmt_ip_address": "192.0.2.15"},
+            # No device type can be found for this device, once its manufacturer was created.
+            {
+                **onboarding_kwargs,
+                "netdev_hostname": "rtr1",
+                "netdev_vendor": "Juniper",
+                "netdev_model": None,
+                "netdev_mgmt_ip_address": "192.0.2.16",
+            },
+            {**onboarding_kwargs, "netdev_hostname": "sw2", "netdev_mgmt_ip_address": "192.0.2.17"},
+        ]
+
+        results = NautobotKeeper.ensure_devices(devices_onboarding_kwargs)
+
+        self.assertIsInstance(results[0], NautobotKeeper)
+        self.assertIsInstance(results[1], OnboardException)
+        self.assertIsInstance(results[2], NautobotKeeper)
+        self.assertEqual(results[0].nb_device_type, results[2].nb_device_type)
+        self.assertFalse(Manufacturer.objects.filter(name="Juniper").exists())
+        self.assertFalse(Device.objects.filter(name="rtr1").exists())
+        self.assertEqual(Prefix.objects.filter(network="192.0.2.0", prefix_length=24).count(), 1)
+        device = Device.objects.get(name="sw2")
+        self.assertEqual(device.cf["cf_device"], False)
+        self.assertEqual(device.primary_ip.cf["cf_ipaddress"], "http://example.com/")
+
+    def test_ensure_devices_stop_on_failure(self):
+        """Verify the batch stops at the first device failing to onboard when it doesn't continue on failure."""
+        devices_onboarding_kwargs = [
+            {
+                "netdev_hostname": "sw1",
+                "netdev_nb_role_name": "switch",
+                "netdev_vendor": "Cisco",
+                "netdev_model": "c2960",
+                "netdev_nb_location_name": "Missing",
+                "netdev_netmiko_device_type": "cisco_ios",
+            },
+        ]
+        with self.assertRaises(OnboardException):
+            NautobotKeeper.ensure_devices(devices_onboarding_kwargs, continue_on_failure=False)
+
+    def test_ensure_devices_unexpected_failure(self):
+        """Verify a device failing with an error other than OnboardException is rolled back and recorded."""
+        onboarding_kwargs = {
+            "netdev_nb_role_name": "switch",
+            "netdev_vendor": "Cisco",
+            "netdev_model": "c2960",
+            "netdev_nb_location_name": self.site1.name,
+            "netdev_netmiko_device_type": "cisco_ios",
+            "netdev_mgmt_ifname": "Management0",
+            "netdev_mgmt_pflen": 24,
+        }
+        devices_onboarding_kwargs = [
+            {**onboarding_kwargs, "netdev_hostname": "sw1", "netdev_mgmt_ip_address": "192.0.2.15"},
+            {**onboarding_kwargs, "netdev_hostname": "sw2", "netdev_mgmt_ip_address": "192.0.2.16"},
+        ]
+        ensure_device = NautobotKeeper.ensure_device
+
+        def ensure_device_failing_sw1(nb_k):
+            ensure_device(nb_k)
+            if nb_k.netdev_hostname == "sw1":
+                raise IntegrityError("duplicate key value violates unique constraint")
+
+        with patch.object(NautobotKeeper, "ensure_device", autospec=True, side_effect=ensure_device_failing_sw1):
+            results = NautobotKeeper.ensure_devices(devices_onboarding_kwargs)
+
+        self.assertIsInstance(results[0], IntegrityError)
+        self.assertIsInstance(results[1], NautobotKeeper)
+        self.assertFalse(Device.objects.filter(name="sw1").exists())
+        self.assertTrue(Device.objects.filter(name="sw2").exists())
@@ -0,0 +1,85 @@
+"""Test the memoized normalization of the command getter data."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from netaddr.core import AddrFormatError
+
+from nautobot_device_onboarding.utils import normalizer
+
+
+class TestNormalizer(unittest.TestCase):
+    """Test the normalizer module."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize test case."""
+        for memoized_function in normalizer.MEMO_TABLES.values():
+            memoized_function.cache_clear()
+
+    def test_normalize_mac_address(self):
+        self.assertEqual(normalizer.normalize_mac_address("0050.5684.2ef6"), "00:50:56:84:2E:F6")
+        self.assertEqual(normalizer.normalize_mac_address(""), "")
+        self.assertEqual(normalizer.normalize_mac_address([]), "")
+
+    def test_normalize_mtu(self):
+        self.assertEqual(normalizer.normalize_mtu(9000), "9000")
+        self.assertEqual(normalizer.normalize_mtu(""), "1500")
+        self.assertEqual(normalizer.normalize_mtu([]), "1500")
+
+    def test_normalize_network_data(self):
+        command_getter_result = {
+            "demo-cisco-1": {
+                "interfaces": {
+                    "GigabitEthernet1": {"mac_address": "0050.5684.2ef6", "mtu": "1500"},
+                    "GigabitEthernet2": {"mac_address": "0050.5684.2ef6", "mtu": ""},
+                    "GigabitEthernet3": {"mac_address": "invalid", "mtu": 9000},
+                },
+                "cables": [
+                    {"local_interface": "Gi1", "remote_interface": "Gi2", "remote_device": "demo-cisco-2"},
+                    {"local_interface": "Gi1"},
+                ],
+            },
+            "demo-cisco-2": {"failed": True},
+        }
+        normalizer.normalize_network_data(command_getter_result)
+        interfaces = command_getter_result["demo-cisco-1"]["interfaces"]
+        self.assertEqual(interfaces["GigabitEthernet1"], {"mac_address": "00:50:56:84:2E:F6", "mtu": "1500"})
+        self.assertEqual(interfaces["GigabitEthernet2"], {"mac_address": "00:50:56:84:2E:F6", "mtu": "1500"})
+        self.assertEqual(interfaces["GigabitEthernet3"]["mac_address"], "invalid")
+        self.assertEqual(interfaces["GigabitEthernet3"]["mtu"], "9000")
+        normalizer.check_interface(interfaces["GigabitEthernet1"])
+        with self.assertRaises(AddrFormatError):
+            normalizer.check_interface(interfaces["GigabitEthernet3"])
+        self.assertEqual(
+            command_getter_result["demo-cisco-1"]["cables"],
+            [
+                {
+                    "local_interface": "GigabitEthernet1",
+                    "remote_interface": "GigabitEthernet2",
+                    "remote_device": "demo-cisco-2",
+                },
+                {"local_interface": "GigabitEthernet1"},
+            ],
+        )
+        mac_cache_info = normalizer.MEMO_TABLES["mac address"].cache_info()
+        self.assertEqual((mac_cache_info.hits, mac_cache_info.misses), (1, 2))
+
+    def test_log_cache_statistics(self):
+        normalizer.normalize_interface_name("Gi1")
+        normalizer.normalize_interface_name("Gi1")
+        logger = MagicMock()
+        normalizer.log_cache_statistics(logger)
+        logger.info.assert_any_call(
+            f"Normalizer interface name cache: 1 hits, 1 misses, 1/{normalizer.NORMALIZER_CACHE_SIZE} entries."
+        )
+
+    def test_log_cache_statistics_since(self):
+        normalizer.normalize_interface_name("Gi1")
+        since = normalizer.cache_statistics()
+        normalizer.normalize_interface_name("Gi1")
+        normalizer.normalize_interface_name("Gi2")
+        logger = MagicMock()
+        normalizer.log_cache_statistics(logger, since=since)
+        logger.info.assert_any_call(
+            f"Normalizer interface name cache: 1 hits, 1 misses, 2/{normalizer.NORMALIZER_CACHE_SIZE} entries."
+        )
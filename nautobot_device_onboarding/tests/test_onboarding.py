@@ -1,9 +1,13 @@
 """Unit tests for nautobot_device_onboarding.netdev_keeper module and its classes."""
 
 # from unittest import mock
+import unittest
+from unittest.mock import MagicMock, patch
 
 from django.conf import settings
 
+from nautobot_device_onboarding.netdev_keeper import NetdevKeeper, PersistentSSHDetect
+
 # from django.test import TestCase
 # from django.contrib.contenttypes.models import ContentType
 
@@ -134,3 +138,72 @@ class SSHDetectMock:
 #         self.assertEqual(on_manager.created_device.platform.name, "arista_eos")
 #         self.assertEqual(on_manager.created_device.platform.napalm_driver, "eos")
 #         self.assertEqual(str(on_manager.created_device.primary_ip4), "2.2.2.2/32")
+
+
+class NetdevKeeperSessionTestCase(unittest.TestCase):
+    """Test handing the SSH session of the device type detection over to the NAPALM driver."""
+
+    def setUp(self):
+        self.netdev = NetdevKeeper(hostname="1.1.1.1", username="user", password="pass")
+        self.connection = MagicMock()
+        self.connection.is_alive.return_value = True
+        self.netdev.netmiko_connection = self.connection
+        self.napalm_device = MagicMock(transport="ssh", force_no_enable=False)
+
+    @patch("nautobot_device_onboarding.netdev_keeper.redispatch")
+    def test_open_napalm_device__reuses_session(self, mock_redispatch):
+        self.netdev.napalm_driver = "nxos_ssh"
+        self.netdev.open_napalm_device(self.napalm_device)
+        mock_redispatch.assert_called_once_with(self.connection, device_type="cisco_nxos")
+        self.connection.enable.assert_called_once()
+        self.napalm_device.open.assert_not_called()
+        self.assertIs(self.napalm_device.device, self.connection)
+        self.assertIsNone(self.netdev.netmiko_connection)
+        self.connection.disconnect.assert_not_called()
+
+    @patch("nautobot_device_onboarding.netdev_keeper.redispatch")
+    def test_open_napalm_device__unsupported_driver(self, mock_redispatch):
+        self.netdev.napalm_driver = "junos"
+        self.netdev.open_napalm_device(self.napalm_device)
+        mock_redispatch.assert_not_called()
+        self.connection.disconnect.assert_called_once()
+        self.napalm_device.open.assert_called_once()
+
+    @patch("nautobot_device_onboarding.netdev_keeper.redispatch")
+    def test_open_napalm_device__session_not_reusable(self, mock_redispatch):
+        mock_redispatch.side_effect = ValueError("Unsupported device_type")
+        self.netdev.napalm_driver = "ios"
+        self.netdev.open_napalm_device(self.napalm_device)
+        self.connection.disconnect.assert_called_once()
+        self.napalm_device.open.assert_called_once()
+
+    @patch("nautobot_device_onboarding.netdev_keeper.redispatch")
+    def test_open_napalm_device__applies_netmiko_args(self, mock_redispatch):
+        self.netdev.napalm_driver = "ios"
+        self.connection.global_cmd_verify = False
+        self.connection.session_log = None
+        self.napalm_device.netmiko_optional_args = {"fast_cli": False, "session_log": "session.log"}
+        self.netdev.open_napalm_device(self.napalm_device)
+        mock_redispatch.assert_called_once()
+        self.assertIs(self.connection.fast_cli, False)
+        self.assertIsNone(self.connection.global_cmd_verify)
+        # Arguments only used to connect are left alone.
+        self.assertIsNone(self.connection.session_log)
+
+
+class PersistentSSHDetectTestCase(unittest.TestCase):
+    """Test keeping the SSH session of the device type detection open."""
+
+    def test_autodetect_keeps_session_open(self):
+        session = MagicMock()
+
+        def connect(guesser, **kwargs):
+            guesser.connection = session
+
+        with patch("nautobot_device_onboarding.netdev_keeper.SSHDetect.__init__", autospec=True, side_effect=connect):
+            guesser = PersistentSSHDetect(device_type="autodetect", host="1.1.1.1")
+        self.assertIs(guesser.session, session)
+        guesser.connection.write_channel("show version\n")
+        guesser.connection.disconnect()
+        session.write_channel.assert_called_once_with("show version\n")
+        session.disconnect.assert_not_called()
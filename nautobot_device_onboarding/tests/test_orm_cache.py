@@ -0,0 +1,47 @@
+"""Test the job-scoped ORM cache."""
+
+from unittest.mock import MagicMock
+
+from nautobot.core.testing import TestCase
+from nautobot.extras.models import Status
+
+from nautobot_device_onboarding.utils.orm_cache import ORMCache
+
+
+class TestORMCache(TestCase):
+    """Test the ORMCache class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize test case."""
+        self.orm_cache = ORMCache()
+        self.status = Status.objects.get(name="Active")
+
+    def test_get(self):
+        self.assertEqual(self.orm_cache.get({"name": "Active"}, Status), self.status)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.orm_cache.get({"name": "Active"}, Status), self.status)
+        self.assertEqual(self.orm_cache.hits["extras.status"], 1)
+        self.assertEqual(self.orm_cache.misses["extras.status"], 1)
+
+    def test_get_does_not_exist(self):
+        with self.assertRaises(Status.DoesNotExist):
+            self.orm_cache.get({"name": "Not A Status"}, Status)
+
+    def test_set(self):
+        self.orm_cache.set({"pk": self.status.pk}, Status, self.status)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.orm_cache.get({"pk": self.status.pk}, Status), self.status)
+
+    def test_invalidate(self):
+        self.orm_cache.get({"name": "Active"}, Status)
+        self.orm_cache.invalidate()
+        self.assertEqual(self.orm_cache.misses["extras.status"], 0)
+        with self.assertNumQueries(1):
+            self.orm_cache.get({"name": "Active"}, Status)
+
+    def test_log_statistics(self):
+        logger = MagicMock()
+        self.orm_cache.get({"name": "Active"}, Status)
+        self.orm_cache.get({"name": "Active"}, Status)
+        self.orm_cache.log_statistics(logger)
+        logger.info.assert_called_once_with("ORM cache extras.status: 1 hits, 1 misses.")
@@ -0,0 +1,125 @@
+"""Test calculating diffs in parallel."""
+
+import unittest
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+from diffsync import Adapter, DiffSyncModel
+from diffsync.enum import DiffSyncActions, DiffSyncFlags
+
+from nautobot_device_onboarding.diffsync import parallel_diff
+from nautobot_device_onboarding.diffsync.adapters.sync_network_data_adapters import SyncNetworkDataNetworkAdapter
+from nautobot_device_onboarding.diffsync.diff import SyncNetworkDataDiff
+
+
+class DeviceModel(DiffSyncModel):
+    """Diffsync model of a device."""
+
+    _modelname = "device"
+    _identifiers = ("name",)
+    _attributes = ("serial",)
+
+    name: str
+    serial: Optional[str] = None
+
+
+class InterfaceModel(DiffSyncModel):
+    """Diffsync model of an interface assignment."""
+
+    _modelname = "ipaddress_to_interface"
+    _identifiers = ("interface__device__name", "interface__name", "ip_address__host")
+
+    interface__device__name: str
+    interface__name: str
+    ip_address__host: str
+
+
+class VlanModel(DiffSyncModel):
+    """Diffsync model of a VLAN."""
+
+    _modelname = "vlan"
+    _identifiers = ("vid",)
+
+    vid: int
+
+
+class DemoAdapter(Adapter):
+    """Adapter holding devices, interface assignments and VLANs."""
+
+    device = DeviceModel
+    ipaddress_to_interface = InterfaceModel
+    vlan = VlanModel
+    top_level = ["vlan", "device", "ipaddress_to_interface"]
+
+
+def _build_adapter(serial_suffix=""):
+    adapter = DemoAdapter()
+    adapter.add(VlanModel(vid=10))
+    for index in range(6):
+        device_name = f"demo-cisco-{index}"
+        adapter.add(DeviceModel(name=device_name, serial=f"{device_name}{serial_suffix}"))
+        adapter.add(
+            InterfaceModel(
+                interface__device__name=device_name, interface__name="GigabitEthernet1", ip_address__host="10.1.1.8"
+            )
+        )
+    return adapter
+
+
+class TestParallelDiff(unittest.TestCase):
+    """Test the parallel_diff module."""
+
+    def test_partition_adapter(self):
+        device_partitions = {}
+        partitions = parallel_diff.partition_adapter(_build_adapter(), device_partitions, partition_count=4)
+        self.assertEqual(partitions[None], [("vlan", {"vid": 10, "model_flags": 0})])
+        self.assertEqual(len(device_partitions), 6)
+        self.assertEqual(set(partitions), {None, 0, 1, 2, 3})
+        for partition, objects in partitions.items():
+            if partition is None:
+                continue
+            for model_name, data in objects:
+                device_name = data["name"] if model_name == "device" else data["interface__device__name"]
+                self.assertEqual(device_partitions[device_name], partition)
+
+    @patch("nautobot_device_onboarding.diffsync.parallel_diff.connections")
+    def test_calculate_diff(self, mock_connections):
+        source = _build_adapter(serial_suffix="-new")
+        target = _build_adapter()
+        diff = parallel_diff.calculate_diff(
+            source, target, diff_class=SyncNetworkDataDiff, flags=DiffSyncFlags.NONE, processes=2
+        )
+        mock_connections.close_all.assert_called_once()
+        serial_diff = target.diff_from(source, diff_class=SyncNetworkDataDiff)
+        self.assertEqual(diff.summary(), serial_diff.summary())
+        self.assertEqual(diff.groups(), ["vlan", "device", "ipaddress_to_interface"])
+        self.assertEqual([element.action for element in diff.children["device"].values()], [DiffSyncActions.UPDATE] * 6)
+
+
+class TestSyncNetworkDataNetworkAdapterDiff(unittest.TestCase):
+    """Test calculating the diff of the network data adapter."""
+
+    def setUp(self):
+        self.source = SyncNetworkDataNetworkAdapter(job=MagicMock())
+        self.target = MagicMock()
+
+    @patch.object(parallel_diff, "calculate_diff")
+    def test_diff_to(self, mock_calculate_diff):
+        self.source.diff_to(self.target, flags=DiffSyncFlags.NONE)
+        mock_calculate_diff.assert_not_called()
+        self.target.diff_from.assert_called_once_with(
+            self.source, diff_class=SyncNetworkDataDiff, flags=DiffSyncFlags.NONE, callback=None
+        )
+
+    @patch.object(parallel_diff, "calculate_diff")
+    def test_diff_to_in_processes(self, mock_calculate_diff):
+        with patch.dict(
+            "nautobot_device_onboarding.diffsync.adapters.sync_network_data_adapters.app_settings",
+            {"sync_network_data_diff_processes": 2},
+        ):
+            diff = self.source.diff_to(self.target, flags=DiffSyncFlags.NONE)
+        self.assertIs(diff, mock_calculate_diff.return_value)
+        mock_calculate_diff.assert_called_once_with(
+            self.source, self.target, diff_class=SyncNetworkDataDiff, flags=DiffSyncFlags.NONE, processes=2
+        )
+        self.target.diff_from.assert_not_called()
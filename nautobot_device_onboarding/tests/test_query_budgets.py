@@ -0,0 +1,40 @@
+"""Test the query budgets of the network data sync."""
+
+from nautobot.core.testing import TransactionTestCase
+
+from nautobot_device_onboarding.tests.benchmarks import network_data_sync
+
+
+class NetworkDataSyncQueryBudgetTestCase(TransactionTestCase):
+    """Test that each phase of the network data sync stays within its query budget."""
+
+    databases = ("default", "job_logs")
+
+    def test_build_command_getter_result(self):
+        result = network_data_sync.build_command_getter_result(
+            device_count=3, interface_count=4, vlan_count=3, vrf_count=2
+        )
+        self.assertEqual(list(result), ["bench-sw-00000", "bench-sw-00001", "bench-sw-00002"])
+        interfaces = result["bench-sw-00000"]["interfaces"]
+        self.assertEqual(len(interfaces), 8)
+        self.assertEqual(interfaces["GigabitEthernet1/0/1"]["lag"], network_data_sync.LAG_INTERFACE)
+        self.assertEqual(len(interfaces["GigabitEthernet1/0/3"]["tagged_vlans"]), 3)
+        self.assertEqual(interfaces["Loopback1"]["vrf"], {"name": "bench-vrf-1"})
+        self.assertEqual(result["bench-sw-00001"]["cables"][0]["remote_device"], "bench-sw-00000")
+        self.assertEqual(result["bench-sw-00002"]["cables"], [])
+
+    def test_query_budgets(self):
+        measures = {}
+        for device_count in (2, 8):
+            measures[device_count] = network_data_sync.run_scenario(
+                device_count=device_count, interface_count=4, vlan_count=3, vrf_count=1
+            )
+            self.assertEqual(network_data_sync.check_budgets(measures[device_count], device_count), [])
+            self.assertGreater(measures[device_count]["diff"]["changes"], 0)
+        # The queries grow no faster than the budgets do, whatever the size of their base.
+        for phase in network_data_sync.PHASES:
+            self.assertLessEqual(
+                measures[8][phase]["queries"] - measures[2][phase]["queries"],
+                network_data_sync.query_budget(phase, 8) - network_data_sync.query_budget(phase, 2),
+                phase,
+            )
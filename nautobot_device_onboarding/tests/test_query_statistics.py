@@ -0,0 +1,98 @@
+"""Test the SQL query statistics of the sync jobs."""
+
+import json
+from unittest.mock import MagicMock
+
+from nautobot.core.testing import TestCase
+from nautobot.extras.models import Status
+
+from nautobot_device_onboarding.utils import query_statistics
+from nautobot_device_onboarding.utils.query_statistics import QueryStatistics, normalize_sql
+
+
+class TestNormalizeSQL(TestCase):
+    """Test the normalize_sql function."""
+
+    def test_literals(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM \"dcim_device\" WHERE name = 'sw1' AND  position = 10"),
+            'SELECT * FROM "dcim_device" WHERE name = ? AND position = ?',
+        )
+
+    def test_parameters(self):
+        self.assertEqual(
+            normalize_sql('SELECT * FROM "dcim_device" WHERE name = %s'),
+            'SELECT * FROM "dcim_device" WHERE name = ?',
+        )
+
+    def test_value_lists(self):
+        self.assertEqual(
+            normalize_sql('SELECT * FROM "dcim_device" WHERE id IN (%s, %s, %s)'),
+            normalize_sql('SELECT * FROM "dcim_device" WHERE id IN (%s)'),
+        )
+        self.assertEqual(
+            normalize_sql('INSERT INTO "dcim_interface" (name, mtu) VALUES (%s, %s), (%s, %s)'),
+            'INSERT INTO "dcim_interface" (name, mtu) VALUES (...)',
+        )
+
+    def test_identifiers_kept(self):
+        self.assertEqual(
+            normalize_sql('SELECT "ipam_vlan"."vid" FROM "ipam_vlan"'), 'SELECT "ipam_vlan"."vid" FROM "ipam_vlan"'
+        )
+
+
+class TestQueryStatistics(TestCase):
+    """Test the QueryStatistics class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize test case."""
+        self.query_statistics = QueryStatistics()
+
+    def test_record(self):
+        with self.query_statistics.record():
+            with query_statistics.phase("load_target_adapter"), query_statistics.model_scope("vlan"):
+                Status.objects.get(name="Active")
+                Status.objects.get(name="Planned")
+            Status.objects.count()
+        Status.objects.count()
+
+        self.assertEqual(self.query_statistics.phases["load_target_adapter"]["queries"], 2)
+        self.assertEqual(self.query_statistics.phases["other"]["queries"], 1)
+        self.assertEqual(self.query_statistics.models["vlan"]["queries"], 2)
+        self.assertEqual(self.query_statistics.models["other"]["queries"], 1)
+        repeated = self.query_statistics.repeated_shapes()
+        self.assertEqual(len(repeated), 1)
+        self.assertEqual(repeated[0][1]["queries"], 2)
+        self.assertIn('"extras_status"', repeated[0][0])
+
+    def test_record_disabled(self):
+        self.query_statistics = QueryStatistics(enabled=False)
+        with self.query_statistics.record():
+            Status.objects.count()
+        self.assertEqual(self.query_statistics.phases, {})
+
+    def test_phase_decorator(self):
+        @query_statistics.phase("execute_sync")
+        def execute_sync():
+            return Status.objects.count()
+
+        with self.query_statistics.record():
+            execute_sync()
+        self.assertEqual(dict(self.query_statistics.phases).keys(), {"execute_sync"})
+
+    def test_report(self):
+        job = MagicMock()
+        with self.query_statistics.record():
+            Status.objects.count()
+            Status.objects.count()
+        self.query_statistics.report(job)
+
+        job.logger.info.assert_any_call(
+            f"SQL queries in phase other: 2 in {self.query_statistics.phases['other']['seconds']:.3f}s."
+        )
+        filename, content = job.create_file.call_args.args
+        self.assertEqual(filename, "query_statistics.json")
+        content = json.loads(content)
+        self.assertEqual(content["phases"]["other"]["queries"], 2)
+        self.assertEqual(content["models"]["other"]["queries"], 2)
+        self.assertEqual(content["repeated_queries"][0]["queries"], 2)
@@ -0,0 +1,89 @@
+"""Test the reference cache shared by all jobs."""
+
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import transaction
+from nautobot.core.testing import TestCase
+from nautobot.dcim.models import Location, Manufacturer
+
+from nautobot_device_onboarding.utils import reference_cache
+
+
+@patch.dict(reference_cache.PLUGIN_SETTINGS, {"reference_cache_timeout": 60})
+class TestReferenceCache(TestCase):
+    """Test the reference_cache module."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize test case."""
+        cache.clear()
+        self.manufacturer = Manufacturer.objects.create(name="Cisco")
+
+    def test_get_cached(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(reference_cache.get({"name": "Cisco"}, Manufacturer), self.manufacturer)
+        with self.assertNumQueries(0):
+            self.assertEqual(reference_cache.get({"name": "Cisco"}, Manufacturer), self.manufacturer)
+
+    def test_get_not_found_is_not_cached(self):
+        with self.assertRaises(Manufacturer.DoesNotExist):
+            reference_cache.get({"name": "Juniper"}, Manufacturer)
+        juniper = Manufacturer.objects.create(name="Juniper")
+        self.assertEqual(reference_cache.get({"name": "Juniper"}, Manufacturer), juniper)
+
+    def test_invalidated_on_save(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            reference_cache.get({"name": "Cisco"}, Manufacturer)
+        self.manufacturer.name = "Cisco Systems"
+        self.manufacturer.save()
+        with self.assertRaises(Manufacturer.DoesNotExist):
+            reference_cache.get({"name": "Cisco"}, Manufacturer)
+
+    def test_invalidated_on_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            reference_cache.get({"name": "Cisco"}, Manufacturer)
+        self.manufacturer.delete()
+        with self.assertRaises(Manufacturer.DoesNotExist):
+            reference_cache.get({"name": "Cisco"}, Manufacturer)
+
+    def test_not_cached_until_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            reference_cache.get({"name": "Cisco"}, Manufacturer)
+            with self.assertNumQueries(1):
+                reference_cache.get({"name": "Cisco"}, Manufacturer)
+        self.assertEqual(len(callbacks), 2)
+
+    def test_rolled_back_not_cached(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Manufacturer.objects.create(name="Juniper")
+                reference_cache.get({"name": "Juniper"}, Manufacturer)
+                raise RuntimeError
+        with self.assertRaises(Manufacturer.DoesNotExist):
+            reference_cache.get({"name": "Juniper"}, Manufacturer)
+
+    def test_invalidated_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.manufacturer.name = "Cisco Systems"
+            self.manufacturer.save()
+            generation = cache.get(reference_cache._generation_key(Manufacturer))  # pylint: disable=protected-access
+            # Another job caching the object as it was before the commit.
+            cache.set(
+                reference_cache._object_key(Manufacturer, generation, {"name": "Cisco"}),  # pylint: disable=protected-access
+                self.manufacturer,
+            )
+        for callback in callbacks:
+            callback()
+        with self.assertRaises(Manufacturer.DoesNotExist):
+            reference_cache.get({"name": "Cisco"}, Manufacturer)
+
+    def test_get_not_reference_model(self):
+        with self.assertRaises(Location.DoesNotExist):
+            reference_cache.get({"name": "Cisco"}, Location)
+        self.assertIsNone(cache.get(reference_cache._generation_key(Location)))  # pylint: disable=protected-access
+
+    def test_disabled(self):
+        with patch.dict(reference_cache.PLUGIN_SETTINGS, {"reference_cache_timeout": 0}):
+            reference_cache.get({"name": "Cisco"}, Manufacturer)
+            with self.assertNumQueries(1):
+                reference_cache.get({"name": "Cisco"}, Manufacturer)
@@ -0,0 +1,103 @@
+"""Test the SSH simulator of network devices and the raw output it serves."""
+
+import unittest
+
+from netmiko import ConnectHandler, NetmikoAuthenticationException, NetmikoTimeoutException
+from ntc_templates.parse import parse_output
+
+from nautobot_device_onboarding.tests.benchmarks import command_getter
+from nautobot_device_onboarding.tests.benchmarks.cli_output import render_command_outputs
+from nautobot_device_onboarding.tests.benchmarks.fleet import load_command_outputs
+from nautobot_device_onboarding.tests.benchmarks.ssh_simulator import (
+    SIMULATOR_PASSWORD,
+    SIMULATOR_USERNAME,
+    DeviceSimulator,
+    SimulatedDevice,
+    build_simulated_fleet,
+)
+
+
+class TestCliOutput(unittest.TestCase):
+    """Test the raw output rendered from the parsed mock command outputs."""
+
+    def test_render_command_outputs_parses_back(self):
+        for fixture in ("command_getter_result_1.json", "command_getter_result_2.json"):
+            command_outputs = load_command_outputs(fixture=fixture)
+            raw_outputs = render_command_outputs(command_outputs, "cisco_ios")
+            self.assertEqual(set(raw_outputs), set(command_outputs))
+            for command, raw_output in raw_outputs.items():
+                parsed = parse_output(platform="cisco_ios", command=command, data=raw_output)
+                self.assertEqual(len(parsed), len(command_outputs[command]), command)
+                for parsed_entry, entry in zip(parsed, command_outputs[command]):
+                    for key, value in entry.items():
+                        if key == "trunking_vlans":
+                            # Some mock entries hold the VLAN list as a single string, the template splits it.
+                            self.assertEqual(",".join(parsed_entry[key]), ",".join(value))
+                        else:
+                            self.assertEqual(parsed_entry[key], value, f"{command} {key}")
+
+    def test_render_command_outputs_unknown_platform(self):
+        self.assertEqual(
+            render_command_outputs({"show version": [{"hostname": "sw1"}], "show lldp": []}, "unknown"),
+            {"show lldp": ""},
+        )
+
+
+class TestDeviceSimulator(unittest.TestCase):
+    """Test netmiko sessions to the simulated devices."""
+
+    def setUp(self):
+        self.simulator = DeviceSimulator()
+        self.addCleanup(self.simulator.stop)
+
+    def connect(self, address, **kwargs):
+        return ConnectHandler(
+            device_type="cisco_ios",
+            host=address,
+            port=self.simulator.port,
+            username=SIMULATOR_USERNAME,
+            password=SIMULATOR_PASSWORD,
+            **kwargs,
+        )
+
+    def test_send_command(self):
+        addresses = build_simulated_fleet(self.simulator, 2, interface_count=2, vlans_per_trunk=2)
+        self.simulator.start()
+        connection = self.connect(addresses[1])
+        try:
+            self.assertEqual(connection.find_prompt(), "bench-sw-00001#")
+            version = parse_output(
+                platform="cisco_ios", command="show version", data=connection.send_command("show version")
+            )
+            self.assertEqual(version[0]["hostname"], "bench-sw-00001")
+            interfaces = parse_output(
+                platform="cisco_ios", command="show interfaces", data=connection.send_command("show interfaces")
+            )
+            self.assertIn(addresses[1], [interface["ip_address"] for interface in interfaces])
+            self.assertIn("Invalid input detected", connection.send_command("show unknown"))
+        finally:
+            connection.disconnect()
+        self.assertEqual(self.simulator.statistics["connections"], 1)
+        self.assertEqual(self.simulator.statistics["max_open_sessions"], 1)
+
+    def test_auth_failure(self):
+        self.simulator.add_device("127.1.0.1", SimulatedDevice("sw1", {}, fail_auth=True))
+        self.simulator.start()
+        with self.assertRaises(NetmikoAuthenticationException):
+            self.connect("127.1.0.1")
+        self.assertEqual(self.simulator.statistics["auth_failures"], 1)
+
+    def test_hang(self):
+        self.simulator.add_device("127.1.0.1", SimulatedDevice("sw1", {}, hang=True))
+        self.simulator.start()
+        with self.assertRaises(NetmikoTimeoutException):
+            self.connect("127.1.0.1", conn_timeout=1, banner_timeout=1, auth_timeout=1)
+
+    def test_sync_devices_command_getter(self):
+        addresses = build_simulated_fleet(self.simulator, 3)
+        self.simulator.devices[addresses[2]].fail_auth = True
+        self.simulator.start()
+        results = command_getter.run_sync_devices(addresses, self.simulator.port, num_workers=3)
+        self.assertEqual(results[addresses[0]]["hostname"], "bench-sw-00000")
+        self.assertEqual(results[addresses[1]]["serial"], "BENCH0000001")
+        self.assertTrue(results[addresses[2]]["failed"])
@@ -150,3 +150,41 @@ class SyncDevicesNautobotAdapterTestCase(TransactionTestCase):
             device = self.testing_objects["device_2"]
             unique_id = f"{device.location.name}__{device.name}__{device.serial}"
             diffsync_obj = self.sync_devices_adapter.get("device", unique_id)
+
+    def test_load_devices_queries(self):
+        """Test loading devices with a constant number of queries."""
+        self.job.debug = False
+        self.job.ip_addresses = ["10.1.1.10", "10.1.1.11", "192.1.1.10"]
+        # One query for the devices and their related objects, one for their primary IP interfaces.
+        with self.assertNumQueries(2):
+            self.sync_devices_adapter.load_devices()
+        self.assertEqual(
+            len(self.sync_devices_adapter.get_all("device")),
+            Device.objects.filter(primary_ip4__host__in=self.job.ip_addresses).count(),
+        )
+
+    def test_load_scoped_to_network_data(self):
+        """Test loading only the manufacturers, platforms and device types returned by the network."""
+        juniper = Manufacturer.objects.create(name="Juniper")
+        Platform.objects.create(name="juniper_junos", network_driver="juniper_junos", manufacturer=juniper)
+        DeviceType.objects.create(model="MX480", manufacturer=juniper)
+        self.job.debug = False
+        self.job.ip_addresses = ["10.1.1.10"]
+        self.job.source_adapter = SyncDevicesNetworkAdapter(job=self.job, sync=None)
+        self.job.source_adapter.add(self.job.source_adapter.manufacturer(name="Cisco"))
+        self.job.source_adapter.add(
+            self.job.source_adapter.platform(name="cisco_nxos", manufacturer__name="Cisco", network_driver="cisco_nxos")
+        )
+        self.job.source_adapter.add(
+            self.job.source_adapter.device_type(
+                model="CSR1000V17", part_number="CSR1000V17", manufacturer__name="Cisco"
+            )
+        )
+
+        self.sync_devices_adapter.load_manufacturers()
+        self.sync_devices_adapter.load_platforms()
+        self.sync_devices_adapter.load_device_types()
+
+        self.assertEqual([obj.name for obj in self.sync_devices_adapter.get_all("manufacturer")], ["Cisco"])
+        self.assertEqual([obj.name for obj in self.sync_devices_adapter.get_all("platform")], ["cisco_nxos"])
+        self.assertEqual([obj.model for obj in self.sync_devices_adapter.get_all("device_type")], ["CSR1000V17"])
@@ -1,5 +1,6 @@
 """Test Cisco Support adapter."""
 
+import copy
 from unittest.mock import MagicMock, patch
 
 from nautobot.core.testing import TransactionTestCase
@@ -14,6 +15,7 @@ from nautobot_device_onboarding.diffsync.adapters.sync_network_data_adapters imp
 from nautobot_device_onboarding.jobs import SSOTSyncDevices
 from nautobot_device_onboarding.tests import utils
 from nautobot_device_onboarding.tests.fixtures import sync_network_data_fixture
+from nautobot_device_onboarding.utils import normalizer
 
 
 class SyncNetworkDataNetworkAdapterTestCase(TransactionTestCase):
@@ -31,7 +33,7 @@ class SyncNetworkDataNetworkAdapterTestCase(TransactionTestCase):
         self.job.job_result = JobResult.objects.create(
             name=self.job.class_path, user=None, task_name="fake task", worker="default"
         )
-        self.job.command_getter_result = sync_network_data_fixture.sync_network_mock_data_valid
+        self.job.command_getter_result = copy.deepcopy(sync_network_data_fixture.sync_network_mock_data_valid)
 
         # Form inputs
         self.job.interface_status = self.testing_objects["status"]
@@ -70,6 +72,7 @@ class SyncNetworkDataNetworkAdapterTestCase(TransactionTestCase):
 
     def test_load_devices(self):
         """Test loading device data returned from command getter into the diffsync store."""
+        normalizer.normalize_network_data(self.job.command_getter_result)
         self.sync_network_data_adapter.load_devices()
 
         # test loaded devices
@@ -87,16 +90,36 @@ class SyncNetworkDataNetworkAdapterTestCase(TransactionTestCase):
                 self.assertEqual(hostname, diffsync_obj.device__name)
                 self.assertEqual(interface_name, diffsync_obj.name)
                 self.assertEqual(self.testing_objects["status"].name, diffsync_obj.status__name)
-                self.assertEqual(
-                    self.sync_network_data_adapter._process_mac_address(  # pylint: disable=protected-access
-                        mac_address=interface_data["mac_address"]
-                    ),
-                    diffsync_obj.mac_address,
-                )
+                raw_mac_address = sync_network_data_fixture.sync_network_mock_data_valid[hostname]["interfaces"][
+                    interface_name
+                ]["mac_address"]
+                self.assertEqual(normalizer.normalize_mac_address(raw_mac_address), diffsync_obj.mac_address)
+                self.assertEqual(interface_data["mtu"], diffsync_obj.mtu)
                 self.assertEqual(interface_data["802.1Q_mode"], diffsync_obj.mode)
                 self.assertEqual(interface_data["link_status"], diffsync_obj.enabled)
                 self.assertEqual(interface_data["description"], diffsync_obj.description)
 
+    def test_load_devices_invalid_mac_address(self):
+        """Test an interface with an invalid MAC address is not loaded, and the error is reported."""
+        hostname, device_data = next(iter(self.job.command_getter_result.items()))
+        interface_names = list(device_data["interfaces"])
+        device_data["interfaces"][interface_names[0]]["mac_address"] = "not-a-mac-address"
+        normalizer.normalize_network_data(self.job.command_getter_result)
+        with patch.object(
+            self.sync_network_data_adapter,
+            "_handle_general_load_exception",
+            wraps=self.sync_network_data_adapter._handle_general_load_exception,  # pylint: disable=protected-access
+        ) as mock_handle_exception:
+            self.sync_network_data_adapter.load_devices()
+
+        mock_handle_exception.assert_called_once()
+        self.assertEqual(mock_handle_exception.call_args.kwargs["model_type"], "interface")
+        self.assertIsNone(self.sync_network_data_adapter.get_or_none("interface", f"{hostname}__{interface_names[0]}"))
+        for interface_name in interface_names[1:]:
+            self.assertIsNotNone(
+                self.sync_network_data_adapter.get_or_none("interface", f"{hostname}__{interface_name}")
+            )
+
     def test_load_ip_addresses(self):
         """Test loading ip address data returned from command getter into the diffsync store."""
         self.sync_network_data_adapter.load_ip_addresses()
@@ -204,6 +227,27 @@ class SyncNetworkDataNetworkAdapterTestCase(TransactionTestCase):
                 self.assertEqual(interface_name, diffsync_obj.name)
                 self.assertEqual(interface_data["vrf"], diffsync_obj.vrf)
 
+    def test_load_device_data(self):
+        """Test that loading all models in a single pass loads the same data as the per-model loaders."""
+        self.job.devices_to_load = Device.objects.all()
+        location_names = self.sync_network_data_adapter._get_location_names()  # pylint: disable=protected-access
+        for hostname, device_data in self.job.command_getter_result.items():
+            self.sync_network_data_adapter.load_device_data(
+                hostname, device_data, location_name=location_names.get(hostname, "")
+            )
+
+        per_model_adapter = SyncNetworkDataNetworkAdapter(job=self.job, sync=None)
+        per_model_adapter.load_ip_addresses()
+        per_model_adapter.load_vlans()
+        per_model_adapter.load_vrfs()
+        per_model_adapter.load_devices()
+        per_model_adapter.load_ip_address_to_interfaces()
+        per_model_adapter.load_tagged_vlans_to_interface()
+        per_model_adapter.load_untagged_vlan_to_interface()
+        per_model_adapter.load_lag_to_interface()
+        per_model_adapter.load_vrf_to_interface()
+        self.assertEqual(self.sync_network_data_adapter.dict(), per_model_adapter.dict())
+
     def test_load_cables(self):
         """Test loading cable data returned from command getter into the diffsync store."""
         self.sync_network_data_adapter.load_cables()
@@ -373,3 +417,30 @@ class SyncNetworkDataNautobotAdapterTestCase(TransactionTestCase):
         self.sync_network_data_adapter.sync_complete(source=None, diff=None)
         for device in self.job.devices_to_load.all():
             self.assertEqual(self.sync_network_data_adapter.primary_ips[device.id], device.primary_ip.id)
+
+    def test_get_vlan_pk(self):
+        """Test looking up vlans in the vlan index."""
+        vlan = self.testing_objects["vlan_1"]
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                vlan.pk, self.sync_network_data_adapter.get_vlan_pk(location=self.job.location, vid="40", name="vlan40")
+            )
+            self.assertIsNone(
+                self.sync_network_data_adapter.get_vlan_pk(location=self.job.location, vid="40", name="missing")
+            )
+            self.assertEqual(
+                self.testing_objects["vlan_2"].pk,
+                self.sync_network_data_adapter.get_vlan_pk(location=self.job.location, vid=50, name="vlan50"),
+            )
+
+    def test_tagged_vlans_to_interface_update(self):
+        """Test that tagged vlans are added and removed as set differences."""
+        interface = Interface.objects.get(device__name="demo-cisco-1", name="GigabitEthernet1")
+        diffsync_obj = self.sync_network_data_adapter.tagged_vlans_to_interface(
+            adapter=self.sync_network_data_adapter,
+            device__name="demo-cisco-1",
+            name="GigabitEthernet1",
+            tagged_vlans=[{"name": "vlan40", "id": "40"}],
+        )
+        diffsync_obj.update(attrs={"tagged_vlans": [{"name": "vlan50", "id": "50"}]})
+        self.assertEqual(list(interface.tagged_vlans.all()), [self.testing_objects["vlan_2"]])
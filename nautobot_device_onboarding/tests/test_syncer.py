@@ -0,0 +1,147 @@
+"""Test the per-device transaction syncer."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from diffsync import Adapter, DiffSyncModel
+from diffsync.diff import DiffElement
+from diffsync.enum import DiffSyncFlags
+from diffsync.exceptions import ObjectNotCreated
+from nautobot.core.testing import TestCase
+from nautobot.extras.models import Tag
+
+from nautobot_device_onboarding.diffsync.diff import SyncNetworkDataDiff
+from nautobot_device_onboarding.diffsync.syncer import ChunkedTransactionAdapterMixin, ChunkedTransactionSyncer
+
+
+def _build_diff():
+    diff = SyncNetworkDataDiff()
+    diff.add(DiffElement("ip_address", "10.1.1.8", {"host": "10.1.1.8"}))
+    for device_name in ("demo-cisco-1", "demo-cisco-2"):
+        diff.add(DiffElement("device", device_name, {"name": device_name, "serial": device_name}))
+    for device_name in ("demo-cisco-1", "demo-cisco-2"):
+        diff.add(
+            DiffElement(
+                "ipaddress_to_interface",
+                f"{device_name}__GigabitEthernet1",
+                {"interface__device__name": device_name, "interface__name": "GigabitEthernet1"},
+            )
+        )
+    diff.add(DiffElement("cable", "cable", {"termination_a__device__name": "demo-cisco-1"}))
+    return diff
+
+
+class TestSyncNetworkDataDiff(unittest.TestCase):
+    """Test the SyncNetworkDataDiff class."""
+
+    def test_get_children_device_by_device(self):
+        diff = _build_diff()
+        completed_groups = []
+        diff.group_complete_callbacks.append(completed_groups.append)
+        self.assertEqual(
+            [element.name for element in diff.get_children()],
+            [
+                "10.1.1.8",
+                "demo-cisco-1",
+                "demo-cisco-1__GigabitEthernet1",
+                "demo-cisco-2",
+                "demo-cisco-2__GigabitEthernet1",
+                "cable",
+            ],
+        )
+        self.assertEqual(
+            completed_groups,
+            ["ip_address", "device", "ipaddress_to_interface", "device", "ipaddress_to_interface", "cable"],
+        )
+
+
+class TestChunkedTransactionSyncer(unittest.TestCase):
+    """Test the ChunkedTransactionSyncer class."""
+
+    def _synced_chunks(self, chunk_size):
+        """Return the element names synced in each transaction."""
+        chunks = []
+        syncer = ChunkedTransactionSyncer(
+            diff=_build_diff(),
+            src_diffsync=MagicMock(),
+            dst_diffsync=MagicMock(),
+            flags=DiffSyncFlags.NONE,
+            chunk_size=chunk_size,
+        )
+
+        def sync_diff_element(element):
+            chunks[-1].append(element.name)
+            return True
+
+        with patch("nautobot_device_onboarding.diffsync.syncer.transaction") as mock_transaction:
+            mock_transaction.atomic.return_value.__enter__.side_effect = lambda: chunks.append([])
+            with patch.object(syncer, "sync_diff_element", side_effect=sync_diff_element):
+                self.assertTrue(syncer.perform_sync())
+        return chunks
+
+    def test_one_transaction_per_device(self):
+        self.assertEqual(
+            self._synced_chunks(chunk_size=1),
+            [
+                ["10.1.1.8"],
+                ["demo-cisco-1", "demo-cisco-1__GigabitEthernet1"],
+                ["demo-cisco-2", "demo-cisco-2__GigabitEthernet1"],
+                ["cable"],
+            ],
+        )
+
+    def test_chunk_of_devices(self):
+        self.assertEqual(
+            self._synced_chunks(chunk_size=2),
+            [
+                ["10.1.1.8", "demo-cisco-1", "demo-cisco-1__GigabitEthernet1"],
+                ["demo-cisco-2", "demo-cisco-2__GigabitEthernet1", "cable"],
+            ],
+        )
+
+
+class TagModel(DiffSyncModel):
+    """Diffsync model writing a tag, failing after the write for the tag named `bad`."""
+
+    _modelname = "tag"
+    _identifiers = ("name",)
+
+    name: str
+
+    @classmethod
+    def create(cls, adapter, ids, attrs):
+        """Create the tag."""
+        Tag.objects.create(name=ids["name"])
+        if ids["name"] == "bad":
+            raise ObjectNotCreated("bad tag")
+        return super().create(adapter, ids, attrs)
+
+
+class TagAdapter(ChunkedTransactionAdapterMixin, Adapter):
+    """Adapter syncing tags in transactions."""
+
+    tag = TagModel
+    top_level = ["tag"]
+
+
+class TestChunkedTransactionAdapterMixin(TestCase):
+    """Test syncing objects in savepoints."""
+
+    def _sync_tags(self):
+        source = TagAdapter()
+        for name in ("good", "bad"):
+            source.add(TagModel(name=name))
+        TagAdapter().sync_from(source, flags=DiffSyncFlags.CONTINUE_ON_FAILURE)
+
+    @patch.dict("nautobot_device_onboarding.diffsync.syncer.app_settings", {"sync_transaction_chunk_size": 1})
+    def test_failed_object_is_rolled_back(self):
+        self._sync_tags()
+        self.assertTrue(Tag.objects.filter(name="good").exists())
+        self.assertFalse(Tag.objects.filter(name="bad").exists())
+
+    def test_no_savepoints_by_default(self):
+        with patch("nautobot_device_onboarding.diffsync.syncer.transaction") as mock_transaction:
+            self._sync_tags()
+        mock_transaction.atomic.assert_not_called()
+        # Without a savepoint, what the failed object wrote is kept.
+        self.assertTrue(Tag.objects.filter(name="bad").exists())
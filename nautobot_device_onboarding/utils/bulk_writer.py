@@ -0,0 +1,205 @@
+"""Queue ORM writes and flush them in bulk."""
+
+from diffsync.enum import DiffSyncStatus
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from nautobot.dcim.choices import InterfaceModeChoices
+from nautobot.dcim.models import Interface
+from nautobot.ipam.models import IPAddress
+
+
+class BulkWriter:
+    """
+    Queue creates and updates for a single model and write them with `bulk_create` and `bulk_update`.
+
+    Queued objects are validated in memory with `full_clean()` when they are flushed. Objects failing validation
+    are logged and dropped, the rest of the chunk is still written. If the database rejects a chunk, the chunk is
+    written again one object at a time so the error can be attributed to the object that caused it.
+
+    Queued writes are flushed when the key they are queued under changes (e.g. the device name), when `batch_size`
+    objects are queued, and whenever `flush()` is called.
+
+    The diffsync model an object is queued for has its status set to failure if the object fails to be written, and
+    the reason a create failed is kept in `failed_creates` by the model's unique id, so the objects depending on it
+    can be skipped.
+    """
+
+    def __init__(self, model, job, batch_size=500):
+        """Initialize the writer for the given Django model."""
+        self.model = model
+        self.job = job
+        self.batch_size = batch_size
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self._key = None
+        self._creates = []
+        self._updates = []
+        self._update_fields = set()
+        self._diffsync_models = {}
+        self.failed_creates = {}
+
+    def __len__(self):
+        """Return the number of queued writes."""
+        return len(self._creates) + len(self._updates)
+
+    def _switch_key(self, key):
+        """Flush the queue if writes for a new key are about to be queued."""
+        if key != self._key:
+            self.flush()
+            self._key = key
+
+    def queue_create(self, obj, key=None, diffsync_model=None):
+        """Queue an unsaved object to be created, for the given diffsync model."""
+        self._switch_key(key)
+        self._creates.append(obj)
+        if diffsync_model is not None:
+            self._diffsync_models[id(obj)] = diffsync_model
+        if len(self) >= self.batch_size:
+            self.flush()
+
+    def queue_update(self, obj, fields, key=None, diffsync_model=None):
+        """Queue an existing object to be updated, for the given diffsync model, only the given fields are written."""
+        self._switch_key(key)
+        self._updates.append(obj)
+        if diffsync_model is not None:
+            self._diffsync_models[id(obj)] = diffsync_model
+        self._update_fields.update(fields)
+        if len(self) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write all queued objects to the database."""
+        creates, self._creates = self._creates, []
+        updates, self._updates = self._updates, []
+        update_fields, self._update_fields = self._update_fields, set()
+        if creates:
+            self._flush_creates(creates)
+        if updates:
+            self._flush_updates(updates, update_fields)
+        self._diffsync_models = {}
+
+    def log_summary(self):
+        """Log the number of objects written by this writer."""
+        self.job.logger.info(
+            f"Bulk {self.model._meta.verbose_name_plural}: {self.created} created, "
+            f"{self.updated} updated, {self.failed} failed."
+        )
+
+    def _handle_failure(self, obj, action, err):
+        """Log an object that could not be written, and fail its diffsync model."""
+        self.failed += 1
+        message = f"{self.model._meta.verbose_name} {obj} failed to {action}, {err}"
+        self.job.logger.error(message)
+        diffsync_model = self._diffsync_models.pop(id(obj), None)
+        if diffsync_model is not None:
+            diffsync_model.set_status(DiffSyncStatus.FAILURE, message)
+            if action == "create":
+                self.failed_creates[diffsync_model.get_unique_id()] = message
+
+    def _validate(self, objs, action):
+        """Return the objects that pass model validation, logging the ones that do not."""
+        valid_objs = []
+        for obj in objs:
+            try:
+                self.validate_object(obj)
+            except ValidationError as err:
+                self._handle_failure(obj, action, err)
+                continue
+            valid_objs.append(obj)
+        return valid_objs
+
+    def validate_object(self, obj):
+        """Validate a single object in memory, override in subclasses."""
+        # Uniqueness is guaranteed by the diffsync identifiers, checking it here would cost a query per object.
+        obj.full_clean(validate_unique=False)
+
+    def _save_single(self, obj, action, update_fields=None):
+        """Save a single object in its own savepoint, returning whether it was written."""
+        if action == "create":
+            obj._state.adding = True  # pylint: disable=protected-access
+        try:
+            with transaction.atomic():
+                obj.save(update_fields=update_fields)
+        except (DatabaseError, ValidationError) as err:
+            self._handle_failure(obj, action, err)
+            return False
+        if action == "create":
+            self.created += 1
+        else:
+            self.updated += 1
+        return True
+
+    def _flush_creates(self, objs):
+        """Validate and bulk create objects, falling back to saving them one by one if the chunk fails."""
+        objs = self._validate(objs, "create")
+        if not objs:
+            return
+        try:
+            with transaction.atomic():
+                self.model.objects.bulk_create(objs, batch_size=self.batch_size)
+            self.created += len(objs)
+        except DatabaseError:
+            objs = [obj for obj in objs if self._save_single(obj, "create")]
+        self.after_write(objs, created=True)
+
+    def _flush_updates(self, objs, fields):
+        """Validate and bulk update objects, falling back to saving them one by one if the chunk fails."""
+        objs = self._validate(objs, "update")
+        if not objs:
+            return
+        now = timezone.now()
+        for obj in objs:
+            obj.last_updated = now
+        fields = sorted(fields | {"last_updated"})
+        try:
+            with transaction.atomic():
+                self.model.objects.bulk_update(objs, fields=fields, batch_size=self.batch_size)
+            self.updated += len(objs)
+        except DatabaseError:
+            objs = [obj for obj in objs if self._save_single(obj, "update", update_fields=fields)]
+        self.after_write(objs, created=False)
+
+    def after_write(self, objs, created):
+        """Apply the side effects that the model's `save()` would have had, override in subclasses."""
+
+
+class InterfaceBulkWriter(BulkWriter):
+    """Bulk writer for interfaces, mirroring the side effects of `Interface.save()`."""
+
+    def __init__(self, job, batch_size=500):
+        """Initialize the writer for interfaces."""
+        super().__init__(Interface, job, batch_size=batch_size)
+
+    def after_write(self, objs, created):
+        """
+        Remove tagged VLANs from updated interfaces that are no longer in tagged mode.
+
+        The interfaces that still have tagged VLANs are found with a single query, and only those are cleared through
+        the related manager so the change is recorded like it is by `Interface.save()`.
+        """
+        if created:
+            return
+        untagged_interfaces = {obj.pk: obj for obj in objs if obj.mode != InterfaceModeChoices.MODE_TAGGED}
+        if not untagged_interfaces:
+            return
+        tagged_interface_ids = set(
+            Interface.tagged_vlans.through.objects.filter(interface_id__in=list(untagged_interfaces)).values_list(
+                "interface_id", flat=True
+            )
+        )
+        for interface_id in tagged_interface_ids:
+            untagged_interfaces[interface_id].tagged_vlans.clear()
+
+
+class IPAddressBulkWriter(BulkWriter):
+    """Bulk writer for IP addresses whose parent prefix has already been resolved."""
+
+    def __init__(self, job, batch_size=500):
+        """Initialize the writer for IP addresses."""
+        super().__init__(IPAddress, job, batch_size=batch_size)
+
+    def validate_object(self, obj):
+        """Validate the IP address fields, `IPAddress.clean()` would look up the parent prefix again."""
+        obj.clean_fields(exclude=["parent"])
@@ -0,0 +1,212 @@
+"""Budget of SSH sessions open at the same time by all jobs, shared through the Django cache backend."""
+
+import hashlib
+import logging
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+PLUGIN_SETTINGS = settings.PLUGINS_CONFIG["nautobot_device_onboarding"]
+
+CACHE_KEY_PREFIX = "nautobot_device_onboarding.connection_budget"
+
+# Name of the pool every device belongs to, limited by `ssh_concurrency_budget`.
+GLOBAL_POOL = "global"
+# Prefix of the pools of the devices with a given tag in `ssh_concurrency_budget_per_location`.
+TAG_POOL_PREFIX = "tag:"
+
+# Seconds between attempts to take a lease while the budget is exhausted, randomized by half of it either way so the
+# workers waiting on the same pool don't retry in lockstep.
+POLL_INTERVAL = 1.0
+
+
+class ConnectionBudgetExhausted(Exception):
+    """No lease could be taken on the connection budget before the acquire timeout."""
+
+
+def _slot_key(pool, slot):
+    """Return the cache key of a slot of a pool, pool names are hashed as they may not be valid cache keys."""
+    pool_hash = hashlib.sha256(pool.encode()).hexdigest()
+    return f"{CACHE_KEY_PREFIX}.{pool_hash}.{slot}"
+
+
+class ConnectionBudget:
+    """
+    Number of SSH sessions open at the same time by all the jobs, on every worker, overall and by location or tag.
+
+    Each pool of the budget has a number of slots, one cache key each. A lease takes a free slot in the global pool and
+    in each pool of the device with `cache.add()`, which only sets a key that doesn't exist yet, so two workers can't
+    take the same slot. The slots are freed when the session is closed, or expire after `lease_timeout` seconds if the
+    worker holding them died. Waiting for a lease times out after `acquire_timeout` seconds.
+
+    The budget is shared by the workers using the same cache backend: with a cache local to each process the budget
+    only applies to the jobs of a worker. If the cache backend is unavailable, the devices are connected to without a
+    lease.
+    """
+
+    def __init__(self, budget=0, per_location=None, lease_timeout=600, acquire_timeout=900):
+        """Initialize the budget, `budget` and `per_location` of 0 or empty don't limit the sessions."""
+        self.limits = {pool: limit for pool, limit in (per_location or {}).items() if limit}
+        if budget:
+            self.limits[GLOBAL_POOL] = budget
+        self.lease_timeout = lease_timeout
+        self.acquire_timeout = acquire_timeout
+        self.lock = threading.Lock()
+        self.leases = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.exhausted = 0
+        self.location_names = {}
+
+    @classmethod
+    def from_settings(cls):
+        """Return the budget set in the app settings."""
+        return cls(
+            budget=PLUGIN_SETTINGS.get("ssh_concurrency_budget", 0),
+            per_location=PLUGIN_SETTINGS.get("ssh_concurrency_budget_per_location", {}),
+            lease_timeout=PLUGIN_SETTINGS.get("ssh_concurrency_lease_timeout", 600),
+            acquire_timeout=PLUGIN_SETTINGS.get("ssh_concurrency_acquire_timeout", 900),
+        )
+
+    @property
+    def enabled(self):
+        """Return True if any pool is limited."""
+        return bool(self.limits)
+
+    def pools(self, location=None, tags=None):
+        """
+        Return the limited pools of a device: the global pool, its location and the locations above it, its tags.
+
+        The tags are only iterated, and the locations above the device's looked up, if pools are set for them.
+        """
+        pools = [GLOBAL_POOL]
+        if location is not None and any(not pool.startswith(TAG_POOL_PREFIX) for pool in self.limits):
+            pools.extend(self._location_names(location))
+        if tags is not None and any(pool.startswith(TAG_POOL_PREFIX) for pool in self.limits):
+            pools.extend(f"{TAG_POOL_PREFIX}{tag.name}" for tag in tags)
+        return sorted({pool for pool in pools if pool in self.limits})
+
+    def _location_names(self, location):
+        """Return the names of a location and of the locations above it, each location is looked up once."""
+        if location.pk not in self.location_names:
+            parent_pk = getattr(location, "parent_id", None)
+            if parent_pk in self.location_names:
+                parent_names = self.location_names[parent_pk]
+            elif location.parent is not None:
+                parent_names = self._location_names(location.parent)
+            else:
+                parent_names = []
+            self.location_names[location.pk] = [location.name, *parent_names]
+        return self.location_names[location.pk]
+
+    def _take_slot(self, pool, lease_id):
+        """Take a free slot of a pool, returns its key or None if the pool is full."""
+        slots = list(range(self.limits[pool]))
+        random.shuffle(slots)
+        for slot in slots:
+            key = _slot_key(pool, slot)
+            if cache.add(key, lease_id, timeout=self.lease_timeout):
+                return key
+        return None
+
+    def _take_slots(self, pools, lease_id):
+        """Take a free slot in each pool, returns the keys of the slots or None if a pool is full."""
+        keys = []
+        for pool in pools:
+            key = self._take_slot(pool, lease_id)
+            if key is None:
+                self._free_slots(keys, lease_id)
+                return None
+            keys.append(key)
+        return keys
+
+    @staticmethod
+    def _free_slots(keys, lease_id):
+        """Free the slots still held by a lease, slots that expired may have been taken by another lease since."""
+        for key in keys:
+            if cache.get(key) == lease_id:
+                cache.delete(key)
+
+    def _count(self, waited, exhausted=False):
+        with self.lock:
+            if exhausted:
+                self.exhausted += 1
+            else:
+                self.leases += 1
+            if waited > 0:
+                self.waited += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def _acquire(self, pools, lease_id, started):
+        """Take a slot in each pool, retrying while any is full, returns the keys of the slots."""
+        keys = self._take_slots(pools, lease_id)
+        if keys is not None:
+            self._count(0.0)
+            return keys
+        while keys is None:
+            if time.monotonic() - started > self.acquire_timeout:
+                self._count(time.monotonic() - started, exhausted=True)
+                raise ConnectionBudgetExhausted(
+                    f"waited {self.acquire_timeout}s for an SSH session in the budget of {', '.join(pools)}."
+                )
+            time.sleep(random.uniform(0.5, 1.5) * POLL_INTERVAL)  # noqa: S311
+            keys = self._take_slots(pools, lease_id)
+        self._count(time.monotonic() - started)
+        return keys
+
+    @contextmanager
+    def lease(self, pools, name=""):
+        """
+        Hold a slot in each of the `pools` while in this context, yields the seconds waited for them.
+
+        Raises ConnectionBudgetExhausted if the slots couldn't be taken in `acquire_timeout` seconds.
+        """
+        # Pools are taken in the same order by every lease, so two leases rarely hold each a slot the other needs.
+        pools = sorted({pool for pool in pools if pool in self.limits})
+        lease_id = uuid.uuid4().hex
+        started = time.monotonic()
+        keys = []
+        try:
+            if pools:
+                keys = self._acquire(pools, lease_id, started)
+        except ConnectionBudgetExhausted:
+            raise
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            logger.warning("Connection budget unavailable, connecting to %s without a lease: %s", name, err)
+        try:
+            yield time.monotonic() - started
+        finally:
+            try:
+                self._free_slots(keys, lease_id)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                logger.warning("Unable to free the connection budget of %s: %s", name, err)
+
+    def statistics(self):
+        """Return the number of leases taken, waited for and not taken in time."""
+        return {
+            "leases": self.leases,
+            "waited": self.waited,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+            "exhausted": self.exhausted,
+        }
+
+    def log_statistics(self, logger):  # pylint: disable=redefined-outer-name
+        """Log the time waited for the connection budget, if any pool is limited."""
+        if not self.enabled:
+            return
+        statistics = self.statistics()
+        logger.info(
+            f"Connection budget: {statistics['leases']} sessions, {statistics['waited']} waited "
+            f"{statistics['wait_seconds']:.1f}s in total and up to {statistics['max_wait_seconds']:.1f}s, "
+            f"{statistics['exhausted']} not connected in time."
+        )
@@ -1,5 +1,25 @@
 """User credentials helper module for device onboarding."""
 
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Tuple
+from uuid import UUID
+
+from django.db import connections
+from django.utils.module_loading import import_string
+from nautobot.extras.choices import SecretsGroupAccessTypeChoices, SecretsGroupSecretTypeChoices
+from nautobot.extras.models import SecretsGroup, SecretsGroupAssociation
+from nautobot_plugin_nornir.constants import PLUGIN_CFG as NORNIR_PLUGIN_CONFIG
+
+# Maximum number of secrets retrieved from the secrets providers at the same time.
+SECRETS_PROVIDER_WORKERS = 8
+
+CREDENTIAL_SECRET_TYPES = (
+    SecretsGroupSecretTypeChoices.TYPE_USERNAME,
+    SecretsGroupSecretTypeChoices.TYPE_PASSWORD,
+    SecretsGroupSecretTypeChoices.TYPE_SECRET,
+)
+
 
 class Credentials:
     """Class used to hide user's credentials in RQ worker and Django."""
@@ -39,3 +59,118 @@ def onboarding_credentials_serializer(credentials):
         "password": credentials.password,
         "secret": credentials.secret,
     }
+
+
+class SecretsGroupCredentialCache:
+    """
+    Job-scoped cache of the generic username, password and secret of secrets groups, keyed by SecretsGroup id.
+
+    The secrets of all the groups to resolve are looked up with a single query and their values are retrieved from
+    the secrets providers concurrently, so each secret is only retrieved once per job however many devices use it.
+    Errors are kept per secret type, the secret values themselves are never logged.
+    """
+
+    def __init__(self, max_workers=SECRETS_PROVIDER_WORKERS):
+        """Initialize an empty cache."""
+        self.max_workers = max_workers
+        self._credentials: Dict[UUID, Credentials] = {}
+        self._errors: Dict[UUID, Dict[str, Exception]] = {}
+
+    def prefetch(self, secrets_groups: Iterable[SecretsGroup]):
+        """Resolve the credentials of the given secrets groups that are not cached yet."""
+        secrets_group_ids = {secrets_group.pk for secrets_group in secrets_groups if secrets_group}
+        secrets_group_ids -= set(self._credentials)
+        if not secrets_group_ids:
+            return
+        secrets = {
+            (association.secrets_group_id, association.secret_type): association.secret
+            for association in SecretsGroupAssociation.objects.filter(
+                secrets_group__in=secrets_group_ids,
+                access_type=SecretsGroupAccessTypeChoices.TYPE_GENERIC,
+                secret_type__in=CREDENTIAL_SECRET_TYPES,
+            ).select_related("secret")
+        }
+        values = {}
+        errors = defaultdict(dict)
+        if secrets:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(secrets))) as executor:
+                futures = {key: executor.submit(_get_secret_value, secret) for key, secret in secrets.items()}
+            for (secrets_group_id, secret_type), future in futures.items():
+                try:
+                    values[(secrets_group_id, secret_type)] = future.result()
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    errors[secrets_group_id][secret_type] = err
+        for secrets_group_id in secrets_group_ids:
+            for secret_type in CREDENTIAL_SECRET_TYPES:
+                if (secrets_group_id, secret_type) not in secrets:
+                    errors[secrets_group_id][secret_type] = SecretsGroupAssociation.DoesNotExist(
+                        f"No {secret_type} secret with the generic access type in this secrets group."
+                    )
+            self._credentials[secrets_group_id] = Credentials(
+                username=values.get((secrets_group_id, SecretsGroupSecretTypeChoices.TYPE_USERNAME)),
+                password=values.get((secrets_group_id, SecretsGroupSecretTypeChoices.TYPE_PASSWORD)),
+                secret=values.get((secrets_group_id, SecretsGroupSecretTypeChoices.TYPE_SECRET)),
+            )
+            self._errors[secrets_group_id] = errors[secrets_group_id]
+
+    def get(self, secrets_group: SecretsGroup) -> Credentials:
+        """Return the credentials of a secrets group, resolving them if they are not cached yet."""
+        self.prefetch([secrets_group])
+        return self._credentials[secrets_group.pk]
+
+    def get_errors(self, secrets_group: SecretsGroup) -> Dict[str, Exception]:
+        """Return the errors raised resolving the credentials of a secrets group, by secret type."""
+        self.prefetch([secrets_group])
+        return self._errors[secrets_group.pk]
+
+
+def _get_secret_value(secret):
+    """Retrieve the value of a secret from its provider, run in a worker thread."""
+    try:
+        return secret.get_value()
+    finally:
+        # Close any database connection opened by the secrets provider in this thread.
+        connections.close_all()
+
+
+class SecretsGroupCachingCredentials:
+    """
+    Nornir inventory credentials class sharing the credentials of devices using the same secrets group.
+
+    Wraps the credentials class configured for `nautobot_plugin_nornir`, which is only called for the first device of
+    each secrets group. Groups with secrets rendered per device, or an access type set per device by config context,
+    are not shared and every device is passed to the wrapped class.
+    """
+
+    def __init__(self, params=None):
+        """Initialize the wrapped credentials class from `params["credentials_class"]`."""
+        params = dict(params or {})
+        credentials_class = import_string(params.pop("credentials_class"))
+        credentials_params = params.pop("credentials_params", None)
+        self.credentials = credentials_class(params=credentials_params) if credentials_params else credentials_class()
+        self._device_credentials: Dict[UUID, Tuple] = {}
+        self._shareable: Dict[UUID, bool] = {}
+
+    def _is_shareable(self, secrets_group):
+        """Return True if all devices using the secrets group get the same credentials."""
+        if secrets_group.pk not in self._shareable:
+            per_device_access_type = NORNIR_PLUGIN_CONFIG.get("use_config_context", {}).get("secrets")
+            # Secret parameters are Jinja templates rendered with the device, e.g. a Vault path including its name.
+            templated = any(
+                "{" in str(value) for secret in secrets_group.secrets.all() for value in secret.parameters.values()
+            )
+            self._shareable[secrets_group.pk] = not (per_device_access_type or templated)
+        return self._shareable[secrets_group.pk]
+
+    def get_device_creds(self, device):
+        """Return the username, password and secret of a device."""
+        secrets_group = device.secrets_group
+        if secrets_group is None or not self._is_shareable(secrets_group):
+            return self.credentials.get_device_creds(device=device)
+        if secrets_group.pk not in self._device_credentials:
+            self._device_credentials[secrets_group.pk] = self.credentials.get_device_creds(device=device)
+        return self._device_credentials[secrets_group.pk]
+
+    def get_group_creds(self, group_name):
+        """Return the credentials of a Nornir group."""
+        return self.credentials.get_group_creds(group_name)
@@ -0,0 +1,148 @@
+"""Concurrent, cached resolution of the host names entered to onboard devices."""
+
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+
+import netaddr
+from django.conf import settings
+
+PLUGIN_SETTINGS = settings.PLUGINS_CONFIG["nautobot_device_onboarding"]
+
+# Maximum number of names resolved at the same time.
+DNS_RESOLVER_WORKERS = 32
+
+
+class DNSResolver:
+    """
+    Resolve host names to IPv4 addresses concurrently, with a timeout per lookup and a TTL cache of the results.
+
+    Failed lookups, including lookups timing out, are reported as `socket.gaierror` like `socket.gethostbyname`.
+    Failures are cached for `negative_cache_ttl` seconds only, so a name failing to resolve is not looked up again by
+    the same job. The `resolve` callable defaults to `socket.gethostbyname` and can be replaced by a stub.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        resolve=socket.gethostbyname,
+        timeout=10,
+        cache_ttl=300,
+        negative_cache_ttl=30,
+        max_workers=DNS_RESOLVER_WORKERS,
+        clock=time.monotonic,
+    ):
+        """Initialize the resolver with an empty cache."""
+        self.resolve_name = resolve
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.negative_cache_ttl = negative_cache_ttl
+        self.max_workers = max_workers
+        self.clock = clock
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _get_cached(self, name):
+        """Return the cached address or error of a name, or None if it isn't cached or has expired."""
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached is None:
+                return None
+            result, expires = cached
+            if self.clock() >= expires:
+                del self._cache[name]
+                return None
+            return result
+
+    def _set_cached(self, name, result):
+        """Cache the address or error a name resolved to."""
+        ttl = self.negative_cache_ttl if isinstance(result, socket.gaierror) else self.cache_ttl
+        if ttl:
+            with self._lock:
+                self._cache[name] = (result, self.clock() + ttl)
+
+    def clear_cache(self):
+        """Remove all the cached addresses."""
+        with self._lock:
+            self._cache = {}
+
+    def resolve_all(self, names):
+        """
+        Resolve host names concurrently.
+
+        Returns:
+            dict: name -> resolved IP address, or the `socket.gaierror` raised if the lookup failed or timed out
+        """
+        results = {}
+        for name in names:
+            result = self._get_cached(name)
+            if result is not None:
+                results[name] = result
+        names_to_resolve = list(dict.fromkeys(name for name in names if name not in results))
+        if not names_to_resolve:
+            return results
+
+        started = {}
+
+        def lookup(name):
+            started[name] = self.clock()
+            return self.resolve_name(name)
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(names_to_resolve)))
+        try:
+            futures = {executor.submit(lookup, name): name for name in names_to_resolve}
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=min(self.timeout, 0.1))
+                for future in done:
+                    name = futures[future]
+                    try:
+                        results[name] = future.result()
+                    except socket.gaierror as err:
+                        results[name] = err
+                    self._set_cached(name, results[name])
+                now = self.clock()
+                for future in list(pending):
+                    name = futures[future]
+                    if name in started and now - started[name] >= self.timeout:
+                        # The lookup can't be interrupted, it is abandoned to its worker thread.
+                        results[name] = socket.gaierror(socket.EAI_AGAIN, f"DNS lookup timed out after {self.timeout}s")
+                        self._set_cached(name, results[name])
+                        pending.discard(future)
+        finally:
+            # Lookups still queued behind a timed out one are cancelled, those that timed out keep their thread.
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        return results
+
+    def resolve(self, name):
+        """Resolve a single host name, raising `socket.gaierror` if the lookup fails or times out."""
+        result = self.resolve_all([name])[name]
+        if isinstance(result, socket.gaierror):
+            raise result
+        return result
+
+
+def get_host_names(addresses):
+    """Return the entries of a list of addresses that are host names rather than IP addresses, in order."""
+    host_names = []
+    for address in addresses:
+        try:
+            netaddr.IPAddress(address)
+        except netaddr.AddrFormatError:
+            host_names.append(address)
+        except ValueError:
+            # Prefixes are reported as such when the address is onboarded.
+            continue
+    return host_names
+
+
+@lru_cache(maxsize=None)
+def get_resolver():
+    """Return the resolver shared by the jobs of this worker process, so they share its cache."""
+    return DNSResolver(
+        timeout=PLUGIN_SETTINGS.get("dns_resolver_timeout", 10),
+        cache_ttl=PLUGIN_SETTINGS.get("dns_resolver_cache_ttl", 300),
+    )
@@ -10,6 +10,7 @@ from netaddr.core import AddrFormatError
 from nornir_nautobot.exceptions import NornirNautobotException
 
 from nautobot_device_onboarding.exceptions import OnboardException
+from nautobot_device_onboarding.utils import dns_resolver
 
 FIELDS_PK = {
     "location",
@@ -56,12 +57,16 @@ def get_job_filter(data=None):
     return devices_filtered.qs
 
 
-def onboarding_task_fqdn_to_ip(address):
+def onboarding_task_fqdn_to_ip(address, resolver=None):
     """Method to assure OT has FQDN resolved to IP address and rewritten into OT.
 
     If it is a DNS name, attempt to resolve the DNS address and assign the IP address to the
     name.
 
+    Args:
+        address (str): IP address or DNS name
+        resolver (DNSResolver): resolver to use, defaults to the resolver shared by the worker process
+
     Returns:
         None
 
@@ -82,7 +87,7 @@ def onboarding_task_fqdn_to_ip(address):
     except AddrFormatError:
         try:
             # Perform DNS Lookup
-            return socket.gethostbyname(address)
+            return (resolver or dns_resolver.get_resolver()).resolve(address)
         except socket.gaierror as err:
             # DNS Lookup has failed, Raise an exception for unable to complete DNS lookup
             raise OnboardException(f"fail-dns - ERROR failed to complete DNS lookup: {address}") from err
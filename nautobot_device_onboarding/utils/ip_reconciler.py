@@ -0,0 +1,200 @@
+"""Batch creation of IP addresses and their parent prefixes."""
+
+import netaddr
+from diffsync.enum import DiffSyncStatus
+from django.core.exceptions import ValidationError
+from nautobot.apps.choices import PrefixTypeChoices
+from nautobot.ipam.models import IPAddress, Prefix
+
+from nautobot_device_onboarding.utils.bulk_writer import BulkWriter, IPAddressBulkWriter
+
+
+class _Node:  # pylint: disable=too-few-public-methods
+    """A node of the prefix tree, one per bit of a stored prefix."""
+
+    __slots__ = ("children", "value")
+
+    def __init__(self):
+        self.children = [None, None]
+        self.value = None
+
+
+class PrefixTree:
+    """
+    In-memory binary radix tree of prefixes.
+
+    Used to find the closest parent prefix of an address, the same way `PrefixQuerySet.get_closest_parent()` does,
+    without a query per address.
+    """
+
+    def __init__(self):
+        """Initialize an empty tree for each IP version."""
+        self._roots = {4: _Node(), 6: _Node()}
+
+    @staticmethod
+    def _bits(network):
+        """Yield the network bits of the given netaddr.IPNetwork, most significant first."""
+        width = 32 if network.version == 4 else 128
+        value = int(network.network)
+        for position in range(network.prefixlen):
+            yield (value >> (width - position - 1)) & 1
+
+    def add(self, network, value):
+        """Store a value for the given netaddr.IPNetwork."""
+        node = self._roots[network.version]
+        for bit in self._bits(network):
+            if node.children[bit] is None:
+                node.children[bit] = _Node()
+            node = node.children[bit]
+        node.value = value
+
+    def closest_parent(self, host):
+        """Return the value of the longest prefix containing the given host address, or None."""
+        address = netaddr.IPNetwork(host)
+        address = netaddr.IPNetwork(f"{address.ip}/{32 if address.version == 4 else 128}")
+        node = self._roots[address.version]
+        closest = node.value
+        for bit in self._bits(address):
+            node = node.children[bit]
+            if node is None:
+                break
+            if node.value is not None:
+                closest = node.value
+        return closest
+
+    def has_subnets(self, network):
+        """Return whether any prefix longer than the given netaddr.IPNetwork is stored inside it."""
+        node = self._roots[network.version]
+        for bit in self._bits(network):
+            node = node.children[bit]
+            if node is None:
+                return False
+        return any(child is not None for child in node.children)
+
+
+class IPAddressReconciler:
+    """
+    Create IP addresses in batches, creating missing parent prefixes along the way.
+
+    This is the batch equivalent of `diffsync_utils.get_or_create_ip_address()`. The prefixes of the namespace are
+    loaded once into a `PrefixTree`, the parent of every queued IP address is found in memory, and the missing
+    prefixes and then the IP addresses are created in bulk.
+
+    Like the bulk writer, the diffsync model of an IP address that fails to be created has its status set to failure,
+    and the reason is kept in `failed_creates` by host.
+    """
+
+    def __init__(self, job, namespace, default_ip_status, default_prefix_status, batch_size=500):
+        """Initialize the reconciler for a namespace."""
+        self.job = job
+        self.namespace = namespace
+        self.default_ip_status = default_ip_status
+        self.default_prefix_status = default_prefix_status
+        self.prefix_writer = BulkWriter(Prefix, job, batch_size=batch_size)
+        self.ip_address_writer = IPAddressBulkWriter(job, batch_size=batch_size)
+        self._pending = {}
+        self._diffsync_models = {}
+        self._tree = None
+        self.failed_creates = {}
+
+    def __len__(self):
+        """Return the number of queued IP addresses."""
+        return len(self._pending)
+
+    def queue(self, host, mask_length, diffsync_model=None):
+        """Queue an IP address to be created if it does not exist yet, for the given diffsync model."""
+        self._pending.setdefault(host, mask_length)
+        if diffsync_model is not None:
+            self._diffsync_models[host] = diffsync_model
+
+    def _handle_failure(self, host, message, diffsync_model=None):
+        """Log an IP address that could not be created, and fail its diffsync model."""
+        self.job.logger.error(message)
+        self.failed_creates[host] = message
+        if diffsync_model is not None:
+            diffsync_model.set_status(DiffSyncStatus.FAILURE, message)
+
+    def _load_tree(self):
+        """Load the prefixes of the namespace into the prefix tree."""
+        self._tree = PrefixTree()
+        for pk, network, prefix_length in Prefix.objects.filter(namespace=self.namespace).values_list(
+            "pk", "network", "prefix_length"
+        ):
+            self._tree.add(netaddr.IPNetwork(f"{network}/{prefix_length}"), pk)
+
+    def flush(self):
+        """Create the missing prefixes and then the queued IP addresses."""
+        pending, self._pending = self._pending, {}
+        diffsync_models, self._diffsync_models = self._diffsync_models, {}
+        if not pending:
+            return
+        if self._tree is None:
+            self._load_tree()
+        existing_hosts = set(
+            IPAddress.objects.filter(host__in=list(pending), parent__namespace=self.namespace).values_list(
+                "host", flat=True
+            )
+        )
+
+        new_prefixes = {}
+        for host, mask_length in pending.items():
+            if host in existing_hosts or self._tree.closest_parent(host) is not None:
+                continue
+            self.job.logger.warning(
+                f"No suitable parent Prefix exists for IP {host} in "
+                f"Namespace {self.namespace.name}, a new Prefix will be created."
+            )
+            network = netaddr.IPNetwork(f"{host}/{mask_length}").cidr
+            prefix = Prefix(
+                prefix=str(network),
+                namespace=self.namespace,
+                type=PrefixTypeChoices.TYPE_NETWORK,
+                status=self.default_prefix_status,
+            )
+            self._tree.add(network, prefix.pk)
+            new_prefixes[network] = prefix
+        self._create_prefixes(new_prefixes)
+
+        for host, mask_length in pending.items():
+            if host in existing_hosts:
+                continue
+            parent_pk = self._tree.closest_parent(host)
+            if parent_pk is None:
+                self._handle_failure(
+                    host,
+                    f"IP Address {host} failed to create, no parent Prefix could be created.",
+                    diffsync_model=diffsync_models.get(host),
+                )
+                continue
+            self.ip_address_writer.queue_create(
+                IPAddress(address=f"{host}/{mask_length}", status=self.default_ip_status, parent_id=parent_pk),
+                diffsync_model=diffsync_models.get(host),
+            )
+        self.ip_address_writer.flush()
+        self.failed_creates.update(self.ip_address_writer.failed_creates)
+
+    def _create_prefixes(self, prefixes):
+        """
+        Create new prefixes.
+
+        A new prefix containing other prefixes needs them reparented, so it is saved on its own with
+        `validated_save()`, shortest prefix first. All other new prefixes have no parent and no children and are
+        created in bulk.
+        """
+        nested_prefixes = []
+        for network, prefix in prefixes.items():
+            if self._tree.has_subnets(network):
+                nested_prefixes.append(prefix)
+            else:
+                self.prefix_writer.queue_create(prefix)
+        self.prefix_writer.flush()
+        for prefix in sorted(nested_prefixes, key=lambda prefix: prefix.prefix_length):
+            try:
+                prefix.validated_save()
+            except ValidationError as err:
+                self.job.logger.error(f"Prefix {prefix} failed to create, {err}")
+
+        # Prefixes that failed to create can't be used as parents.
+        for network, prefix in prefixes.items():
+            if prefix._state.adding:  # pylint: disable=protected-access
+                self._tree.add(network, None)
@@ -0,0 +1,150 @@
+"""Memory snapshots of a job at the boundaries of the phases of the sync, by allocation site and by data structure."""
+
+import json
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+
+from diffsync import Adapter
+from django.db.models import Model
+
+# Number of allocation sites reported for each snapshot in the job log, the artifact holds more of them.
+LOGGED_SITES = 5
+SAVED_SITES = 25
+ARTIFACT_NAME = "memory_snapshots.json"
+
+# Allocations made by tracemalloc itself and by the import machinery are not the job's.
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+# Objects not followed when sizing a structure: they are shared by the whole job, not held by the structure.
+_SHARED_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType, Adapter, Model)
+
+
+def retained_size(obj):
+    """
+    Return the size in bytes of an object and of every object it references, each counted once.
+
+    References to adapters, Django model instances, classes, modules and functions are not followed, so the size of
+    a diffsync store does not include the adapter its models point back to, nor the rest of the job.
+    """
+    seen = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SHARED_TYPES):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif not isinstance(current, (str, bytes, int, float)):
+            if hasattr(current, "__dict__"):
+                stack.append(vars(current))
+            for cls in type(current).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if slot != "__dict__" and hasattr(current, slot):
+                        stack.append(getattr(current, slot))
+    return size
+
+
+def store_models(adapter):
+    """Return the models of the diffsync store of an adapter, by model name, to size the store without its logger."""
+    return {model_name: adapter.get_all(model_name) for model_name in adapter.get_all_model_names()}
+
+
+def sync_objects(job, command_getter_result):
+    """Return the structures of an SSoT job worth sizing, by name: the command getter result, the stores and the diff."""
+    objects = {"command_getter_result": command_getter_result}
+    if job.source_adapter is not None:
+        objects["source_store"] = store_models(job.source_adapter)
+    if job.target_adapter is not None:
+        objects["target_store"] = store_models(job.target_adapter)
+    if job.diff is not None:
+        objects["diff"] = job.diff
+    return objects
+
+
+class MemorySnapshots:
+    """
+    Snapshots of the memory allocated by a job, taken with tracemalloc at the end of each phase of the sync.
+
+    Each snapshot holds the memory traced and its peak so far, the allocation sites holding the most memory, and the
+    retained size of the data structures of the job, so the structure growing out of bounds on a large fleet can be
+    told apart. Memory is traced in every thread, the allocations made while parsing the command outputs during the
+    collection are attributed to the lines of the formatter.
+
+    Tracing slows the job down and the snapshots are only taken if enabled. The tracemalloc snapshots are dropped once
+    summarized, to not add their own size to a job already short of memory.
+    """
+
+    def __init__(self, enabled=False):
+        """Initialize an empty list of snapshots, `record()` traces nothing unless enabled."""
+        self.enabled = enabled
+        self.snapshots = []
+
+    @contextmanager
+    def record(self):
+        """Trace the memory allocated in this context, if enabled and not traced already."""
+        if not self.enabled or tracemalloc.is_tracing():
+            yield
+            return
+        tracemalloc.start()
+        try:
+            yield
+        finally:
+            tracemalloc.stop()
+
+    def take(self, name, objects=None):
+        """Take a snapshot named after the phase that just ended, sizing the `objects` given by name."""
+        if not self.enabled or not tracemalloc.is_tracing():
+            return
+        traced, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        sites = [
+            {"site": str(statistic.traceback), "size": statistic.size, "count": statistic.count}
+            for statistic in snapshot.statistics("lineno")[:SAVED_SITES]
+        ]
+        del snapshot
+        self.snapshots.append(
+            {
+                "name": name,
+                "traced": traced,
+                "peak": peak,
+                "retained": {key: retained_size(value) for key, value in (objects or {}).items() if value is not None},
+                "sites": sites,
+            }
+        )
+
+    def as_dict(self):
+        """Return the snapshots as a dictionary, to be saved as JSON."""
+        return {"snapshots": self.snapshots}
+
+    def log_statistics(self, logger):
+        """Log the memory traced, the retained size of each structure and the top allocation sites of each snapshot."""
+        for snapshot in self.snapshots:
+            logger.info(
+                f"Memory after {snapshot['name']}: {snapshot['traced']} bytes traced, {snapshot['peak']} bytes peak."
+            )
+            for key, size in snapshot["retained"].items():
+                logger.info(f"Memory after {snapshot['name']}: {key} retains {size} bytes.")
+            for site in snapshot["sites"][:LOGGED_SITES]:
+                logger.info(
+                    f"Memory after {snapshot['name']}: {site['size']} bytes in {site['count']} blocks at {site['site']}."
+                )
+
+    def report(self, job):
+        """Log the snapshots to the job log and save them as a file of the job result, if enabled."""
+        if not self.enabled:
+            return
+        self.log_statistics(job.logger)
+        job.create_file(ARTIFACT_NAME, json.dumps(self.as_dict(), indent=2))
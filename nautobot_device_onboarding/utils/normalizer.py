@@ -0,0 +1,165 @@
+"""Memoized normalization of the values returned by the command getter."""
+
+from functools import lru_cache
+
+from netaddr import EUI, mac_unix_expanded
+from netaddr.core import AddrFormatError
+from netutils.interface import canonical_interface_name
+
+from nautobot_device_onboarding.constants import INTERFACE_TYPE_MAP_STATIC
+
+# Upper bound of each memo table. Interface names, MAC addresses and types recur across a fleet, but MAC addresses
+# are mostly unique: the tables are bounded so a large job can't grow them without limit in a long-lived worker.
+NORMALIZER_CACHE_SIZE = 8192
+
+DEFAULT_MTU = "1500"
+
+# Key of an interface's data recording the errors raised normalizing its values, by value name.
+NORMALIZATION_ERRORS_KEY = "normalization_errors"
+
+PORT_MODE_MAP = {
+    "access": "access",
+    "trunk": "tagged",
+    "bridged": "tagged",
+    "routed": "",
+}
+
+
+class MacUnixExpandedUppercase(mac_unix_expanded):
+    """Mac Unix Expanded Uppercase."""
+
+    word_fmt = "%.2X"
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def normalize_interface_name(interface_name):
+    """Return the canonical name of an interface, e.g. `Gi1/0/1` -> `GigabitEthernet1/0/1`."""
+    return canonical_interface_name(interface_name)
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def _format_mac_address(mac_address):
+    """Format a mac address the way Nautobot stores it."""
+    return str(EUI(mac_address, version=48, dialect=MacUnixExpandedUppercase))
+
+
+def normalize_mac_address(mac_address):
+    """Convert a mac address to match the value stored by Nautobot, an empty value is returned as an empty string."""
+    # Empty values may be unhashable (e.g. `[]` when nothing was extracted), keep them out of the memo table.
+    if mac_address:
+        return _format_mac_address(mac_address)
+    return ""
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def _format_mtu(mtu):
+    """Format an MTU as a string."""
+    return str(mtu)
+
+
+def normalize_mtu(mtu):
+    """Return the MTU of an interface as a string, defaulting to 1500 when the device didn't return one."""
+    if mtu:
+        return _format_mtu(mtu)
+    return DEFAULT_MTU
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def normalize_interface_type(interface_type):
+    """Map a device interface type to a Nautobot interface type."""
+    return INTERFACE_TYPE_MAP_STATIC.get(interface_type, "other")
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def normalize_port_mode(port_mode):
+    """Map a device port mode to a Nautobot interface mode."""
+    return PORT_MODE_MAP.get(port_mode, "")
+
+
+MEMO_TABLES = {
+    "interface name": normalize_interface_name,
+    "mac address": _format_mac_address,
+    "mtu": _format_mtu,
+    "interface type": normalize_interface_type,
+    "port mode": normalize_port_mode,
+}
+
+
+def _normalize_interface(interface_data):
+    """Normalize the MAC address and MTU of a single interface in place."""
+    if "mac_address" in interface_data:
+        try:
+            interface_data["mac_address"] = normalize_mac_address(interface_data["mac_address"])
+        except (AddrFormatError, TypeError) as err:
+            # Keep the value as returned and record the error, `check_interface()` raises it when the interface is
+            # loaded so only that interface is skipped.
+            interface_data.setdefault(NORMALIZATION_ERRORS_KEY, {})["mac_address"] = err
+    if "mtu" in interface_data:
+        try:
+            interface_data["mtu"] = normalize_mtu(interface_data["mtu"])
+        except TypeError:
+            pass
+
+
+def check_interface(interface_data):
+    """Raise the error recorded normalizing a value of an interface, if any."""
+    errors = interface_data.get(NORMALIZATION_ERRORS_KEY)
+    if errors:
+        raise next(iter(errors.values()))
+
+
+def _normalize_cable(neighbor_data):
+    """Normalize the local and remote interface names of a single cable in place."""
+    for key in ("local_interface", "remote_interface"):
+        if isinstance(neighbor_data.get(key), str):
+            neighbor_data[key] = normalize_interface_name(neighbor_data[key])
+
+
+def normalize_network_data(command_getter_result):
+    """
+    Normalize the data extracted from every device in place, before it is loaded into the DiffSync store.
+
+    MAC addresses and MTUs of the interfaces and the interface names of the cable endpoints are normalized through the
+    memo tables, so a value seen on any device is only computed once. Data in an unexpected format is left as is for
+    the adapter to report.
+    """
+    for device_data in command_getter_result.values():
+        if not isinstance(device_data, dict):
+            continue
+        interfaces = device_data.get("interfaces")
+        if isinstance(interfaces, dict):
+            for interface_data in interfaces.values():
+                if isinstance(interface_data, dict):
+                    _normalize_interface(interface_data)
+        cables = device_data.get("cables")
+        if isinstance(cables, list):
+            for neighbor_data in cables:
+                if isinstance(neighbor_data, dict):
+                    _normalize_cable(neighbor_data)
+    return command_getter_result
+
+
+def cache_statistics():
+    """Return the hits and misses of each memo table so far, to log only those of a job when it ends."""
+    statistics = {}
+    for table_name, memoized_function in MEMO_TABLES.items():
+        cache_info = memoized_function.cache_info()
+        statistics[table_name] = (cache_info.hits, cache_info.misses)
+    return statistics
+
+
+def log_cache_statistics(logger, since=None):
+    """
+    Log the hits, misses and size of each memo table.
+
+    The memo tables are shared by every job run by the worker process, `since` is the `cache_statistics()` taken when
+    the job started so only the hits and misses of that job are logged. The size is the size of the whole table.
+    """
+    since = since or {}
+    for table_name, memoized_function in MEMO_TABLES.items():
+        cache_info = memoized_function.cache_info()
+        hits, misses = since.get(table_name, (0, 0))
+        logger.info(
+            f"Normalizer {table_name} cache: {cache_info.hits - hits} hits, {cache_info.misses - misses} misses, "
+            f"{cache_info.currsize}/{cache_info.maxsize} entries."
+        )
@@ -0,0 +1,67 @@
+"""Job-scoped cache of ORM lookups."""
+
+from collections import defaultdict
+from typing import DefaultDict, Dict, FrozenSet, Hashable, Tuple, Type
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Model
+
+from nautobot_device_onboarding.utils import reference_cache
+
+ParameterSet = FrozenSet[Tuple[str, Hashable]]
+
+
+class ORMCache:
+    """
+    Cache of objects retrieved with `Model.objects.get()`, keyed by model and lookup parameters.
+
+    One cache is created per job and shared by its adapters and diffsync models, so lookups that resolve to the same
+    handful of rows (statuses, roles, platforms, locations...) only query the database once per job. Reference objects
+    missing from the cache are looked up in the cache shared by all jobs, if enabled, before querying the database.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._cache: DefaultDict[str, Dict[ParameterSet, Model]] = defaultdict(dict)
+        self._model_keys: Dict[Type[Model], str] = {}
+        self.hits: DefaultDict[str, int] = defaultdict(int)
+        self.misses: DefaultDict[str, int] = defaultdict(int)
+
+    def get_model_key(self, model_class: Type[Model]):
+        """Return the `app_label.model` cache key of a model class, looking up its content type only once."""
+        if model_class not in self._model_keys:
+            content_type = ContentType.objects.get_for_model(model_class)
+            self._model_keys[model_class] = f"{content_type.app_label}.{content_type.model}"
+        return self._model_keys[model_class]
+
+    def get(self, parameters: Dict, model_class: Type[Model]):
+        """Retrieve an object from the cache, or from the ORM on a cache miss."""
+        parameter_set = frozenset(parameters.items())
+        model_cache_key = self.get_model_key(model_class)
+        if cached_object := self._cache[model_cache_key].get(parameter_set):
+            self.hits[model_cache_key] += 1
+            return cached_object
+        self.misses[model_cache_key] += 1
+        # As we are using `get` here, this will error if there is not exactly one object that corresponds to the
+        # parameter set. We intentionally pass these errors through.
+        self._cache[model_cache_key][parameter_set] = reference_cache.get(dict(parameter_set), model_class)
+        return self._cache[model_cache_key][parameter_set]
+
+    def set(self, parameters: Dict, model_class: Type[Model], obj: Model):
+        """Add an already retrieved object to the cache."""
+        self._cache[self.get_model_key(model_class)][frozenset(parameters.items())] = obj
+
+    def invalidate(self, zero_out_hits=True):
+        """Invalidate all the objects in the cache."""
+        self._cache = defaultdict(dict)
+        if zero_out_hits:
+            self.hits = defaultdict(int)
+            self.misses = defaultdict(int)
+
+    def log_statistics(self, logger):
+        """Log the number of cache hits and misses of each model."""
+        for model_cache_key in sorted(set(self.hits) | set(self.misses)):
+            logger.info(
+                f"ORM cache {model_cache_key}: {self.hits[model_cache_key]} hits, "
+                f"{self.misses[model_cache_key]} misses."
+            )
@@ -0,0 +1,154 @@
+"""Statistics of the SQL queries run by a job, by phase of the sync, by diffsync model and by query shape."""
+
+import json
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+from django.db import connection
+
+# Phase and model of the queries run outside of any phase or model scope.
+UNSCOPED = "other"
+
+_current_phase = ContextVar("query_statistics_phase", default=UNSCOPED)
+_current_model = ContextVar("query_statistics_model", default=UNSCOPED)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_VALUE_LISTS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Number of repeated query shapes reported in the job log, the artifact holds more of them.
+LOGGED_SHAPES = 10
+SAVED_SHAPES = 100
+ARTIFACT_NAME = "query_statistics.json"
+LOGGED_SHAPE_LENGTH = 500
+
+
+@lru_cache(maxsize=4096)
+def normalize_sql(sql):
+    """
+    Return the shape of a query, its SQL with the literals and parameters replaced by `?`.
+
+    Lists of values are collapsed to `(...)`, so the same query run with a different number of values, e.g. an `IN`
+    filter or a bulk insert, has the same shape.
+    """
+    shape = _STRING_LITERAL.sub("?", sql)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = shape.replace("%s", "?")
+    shape = _VALUE_LIST.sub("(...)", shape)
+    shape = _REPEATED_VALUE_LISTS.sub("(...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@contextmanager
+def phase(name):
+    """Attribute the queries run in this context to a phase of the sync, can also decorate a method."""
+    token = _current_phase.set(name)
+    try:
+        yield
+    finally:
+        _current_phase.reset(token)
+
+
+@contextmanager
+def model_scope(name):
+    """Attribute the queries run in this context to a diffsync model."""
+    token = _current_model.set(name)
+    try:
+        yield
+    finally:
+        _current_model.reset(token)
+
+
+def _new_counter():
+    return {"queries": 0, "seconds": 0.0}
+
+
+class QueryStatistics:
+    """
+    Count the queries of a job and the time spent running them, by phase, by diffsync model and by query shape.
+
+    The statistics are an execute wrapper of the database connection, installed with `record()`. Only the queries of
+    the thread running the job are counted, not those run in worker threads such as the command getter's.
+
+    Queries of the same shape repeated many times, e.g. a lookup per interface, point at a missing
+    `select_related()`, `prefetch_related()` or cache.
+    """
+
+    def __init__(self, enabled=True):
+        """Initialize empty statistics, `record()` counts nothing unless enabled."""
+        self.enabled = enabled
+        self.phases = defaultdict(_new_counter)
+        self.models = defaultdict(_new_counter)
+        self.shapes = defaultdict(_new_counter)
+
+    def __call__(self, execute, sql, params, many, context):
+        """Run a query and count it."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            seconds = time.perf_counter() - start
+            for counter in (
+                self.phases[_current_phase.get()],
+                self.models[_current_model.get()],
+                self.shapes[normalize_sql(sql)],
+            ):
+                counter["queries"] += 1
+                counter["seconds"] += seconds
+
+    @contextmanager
+    def record(self):
+        """Count the queries run in this context, on the database connection of the current thread."""
+        if not self.enabled:
+            yield
+            return
+        with connection.execute_wrapper(self):
+            yield
+
+    def repeated_shapes(self, count=LOGGED_SHAPES):
+        """Return the `count` query shapes run the most times, at least twice, as (shape, counter) tuples."""
+        repeated = [(shape, counter) for shape, counter in self.shapes.items() if counter["queries"] > 1]
+        repeated.sort(key=lambda item: (item[1]["queries"], item[1]["seconds"]), reverse=True)
+        return repeated[:count]
+
+    def as_dict(self):
+        """Return the statistics as a dictionary, to be saved as JSON."""
+
+        def rounded(counters):
+            return {
+                key: {"queries": counter["queries"], "seconds": round(counter["seconds"], 6)}
+                for key, counter in sorted(counters.items())
+            }
+
+        return {
+            "phases": rounded(self.phases),
+            "models": rounded(self.models),
+            "repeated_queries": [
+                {"sql": shape, "queries": counter["queries"], "seconds": round(counter["seconds"], 6)}
+                for shape, counter in self.repeated_shapes(SAVED_SHAPES)
+            ],
+        }
+
+    def log_statistics(self, logger):
+        """Log the queries of each phase and model, and the query shapes repeated the most."""
+        for name, counter in sorted(self.phases.items()):
+            logger.info(f"SQL queries in phase {name}: {counter['queries']} in {counter['seconds']:.3f}s.")
+        for name, counter in sorted(self.models.items()):
+            logger.info(f"SQL queries for model {name}: {counter['queries']} in {counter['seconds']:.3f}s.")
+        for shape, counter in self.repeated_shapes():
+            if len(shape) > LOGGED_SHAPE_LENGTH:
+                shape = f"{shape[:LOGGED_SHAPE_LENGTH]}..."
+            logger.info(f"SQL query repeated {counter['queries']} times in {counter['seconds']:.3f}s: {shape}")
+
+    def report(self, job):
+        """Log the statistics to the job log and save them as a file of the job result, if enabled."""
+        if not self.enabled:
+            return
+        self.log_statistics(job.logger)
+        job.create_file(ARTIFACT_NAME, json.dumps(self.as_dict(), indent=2))
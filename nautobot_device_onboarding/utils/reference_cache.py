@@ -0,0 +1,105 @@
+"""Cache of reference objects shared by all jobs, stored in the Django cache backend."""
+
+import hashlib
+import logging
+import uuid
+from typing import Dict, Type
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+from nautobot.dcim.models import DeviceType, Manufacturer, Platform
+from nautobot.extras.models import Role, SecretsGroup, Status
+
+logger = logging.getLogger(__name__)
+
+PLUGIN_SETTINGS = settings.PLUGINS_CONFIG["nautobot_device_onboarding"]
+
+# Models whose rows rarely change, but are looked up by every onboarding job.
+REFERENCE_MODELS = (DeviceType, Manufacturer, Platform, Role, SecretsGroup, Status)
+
+CACHE_KEY_PREFIX = "nautobot_device_onboarding.reference_cache"
+
+
+def is_enabled():
+    """Return True if the reference cache is enabled in the app settings."""
+    return bool(PLUGIN_SETTINGS.get("reference_cache_timeout", 0))
+
+
+def _model_label(model_class: Type[Model]):
+    return model_class._meta.label_lower  # pylint: disable=protected-access
+
+
+def _generation_key(model_class: Type[Model]):
+    """Return the cache key holding the current generation of the cached objects of a model."""
+    return f"{CACHE_KEY_PREFIX}.{_model_label(model_class)}.generation"
+
+
+def _normalize_value(value):
+    """Return a stable representation of a lookup value, objects are represented by their primary key."""
+    if isinstance(value, Model):
+        return str(value.pk)
+    if isinstance(value, (list, tuple, set)):
+        return sorted(_normalize_value(item) for item in value)
+    return repr(value)
+
+
+def _object_key(model_class: Type[Model], generation, parameters: Dict):
+    """Return the cache key of an object, by model and natural key lookup."""
+    lookup = repr(sorted((field, _normalize_value(value)) for field, value in parameters.items()))
+    lookup_hash = hashlib.sha256(lookup.encode()).hexdigest()
+    return f"{CACHE_KEY_PREFIX}.{_model_label(model_class)}.{generation}.{lookup_hash}"
+
+
+def get(parameters: Dict, model_class: Type[Model]):
+    """
+    Retrieve an object by its natural key from the shared cache, or from the ORM on a cache miss.
+
+    Lookups of models that aren't reference models, or any lookup while the cache is disabled, go straight to the ORM.
+    Like `Model.objects.get()`, this errors if there is not exactly one object matching the parameters, errors are not
+    cached. If the cache backend is unavailable, the object is retrieved from the ORM.
+    """
+    if not is_enabled() or model_class not in REFERENCE_MODELS:
+        return model_class.objects.get(**parameters)
+    try:
+        generation = cache.get_or_set(_generation_key(model_class), uuid.uuid4().hex, timeout=None)
+        object_key = _object_key(model_class, generation, parameters)
+        cached_object = cache.get(object_key)
+    except Exception as err:  # pylint: disable=broad-exception-caught
+        logger.warning("Reference cache unavailable, retrieving %s from the database: %s", model_class, err)
+        return model_class.objects.get(**parameters)
+    if cached_object is not None:
+        return cached_object
+    obj = model_class.objects.get(**parameters)
+    # Inside a transaction the object may not be committed, it is only shared with the other jobs once it is.
+    transaction.on_commit(lambda: _set(object_key, obj))
+    return obj
+
+
+def _set(object_key, obj):
+    """Cache an object found in the database."""
+    try:
+        cache.set(object_key, obj, timeout=PLUGIN_SETTINGS["reference_cache_timeout"])
+    except Exception as err:  # pylint: disable=broad-exception-caught
+        logger.warning("Unable to cache %s: %s", obj, err)
+
+
+def invalidate(model_class: Type[Model]):
+    """
+    Invalidate all the cached objects of a model, by starting a new generation of its cache keys.
+
+    The generation is renewed right away and again once the transaction commits, as other jobs may have cached the
+    objects as they were before the transaction in between.
+    """
+    _new_generation(model_class)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _new_generation(model_class))
+
+
+def _new_generation(model_class: Type[Model]):
+    """Start a new generation of the cache keys of a model."""
+    try:
+        cache.set(_generation_key(model_class), uuid.uuid4().hex, timeout=None)
+    except Exception as err:  # pylint: disable=broad-exception-caught
+        logger.warning("Unable to invalidate the reference cache of %s: %s", model_class, err)
@@ -854,6 +854,97 @@ def unittest_coverage(context):
     run_command(context, command)
 
 
+@task(
+    help={
+        "scenario": "Only run this benchmark scenario (small, wide-devices, vlan-heavy, fleet), may be repeated.",
+        "threshold": "Allowed regression over the baseline, as a fraction. (default: 0.2)",
+        "update_baseline": "Save the results as the new baseline. (default: False)",
+        "baseline": "JSON file of the baseline results. (default: nautobot_device_onboarding/tests/benchmarks/etl_baseline.json)",
+    },
+    iterable=["scenario"],
+)
+def benchmark(context, scenario=None, threshold=0.2, update_baseline=False, baseline=""):
+    """Run the offline ETL benchmarks against synthetic fleets, failing on a regression over the baseline."""
+    command = f"python -m nautobot_device_onboarding.tests.benchmarks --threshold {threshold}"
+    for name in scenario or []:
+        command += f" --scenario {name}"
+    if update_baseline:
+        command += " --update-baseline"
+    if baseline:
+        command += f" --baseline {baseline}"
+
+    run_command(context, command)
+
+
+@task(
+    help={
+        "scenario": "Only run this benchmark scenario (sync-devices, sync-network-data), may be repeated.",
+        "devices": "Number of simulated devices, overrides the scenario. (default: per scenario)",
+        "workers": "Number of Nornir workers, may be repeated to compare them. (default: 20 and 100)",
+        "latency": "Seconds the simulated devices take to answer each command. (default: 0.05)",
+        "jitter": "Random extra seconds the simulated devices take to answer each command. (default: 0.05)",
+        "auth_failure_rate": "Fraction of the simulated devices rejecting the credentials. (default: 0)",
+        "hang_rate": "Fraction of the simulated devices never starting the SSH session. (default: 0)",
+        "adaptive": "Use the adaptive runner, up to the number of workers. (default: False)",
+        "output": "JSON file to save the results to.",
+    },
+    iterable=["scenario", "workers"],
+)
+def benchmark_command_getter(  # pylint: disable=too-many-arguments
+    context,
+    scenario=None,
+    devices=0,
+    workers=None,
+    latency=0.05,
+    jitter=0.05,
+    auth_failure_rate=0.0,
+    hang_rate=0.0,
+    adaptive=False,
+    output="",
+):
+    """Run the command getter throughput benchmarks against simulated SSH devices."""
+    command = (
+        "python -m nautobot_device_onboarding.tests.benchmarks command-getter "
+        f"--latency {latency} --jitter {jitter} --auth-failure-rate {auth_failure_rate} --hang-rate {hang_rate}"
+    )
+    for name in scenario or []:
+        command += f" --scenario {name}"
+    for num_workers in workers or []:
+        command += f" --workers {num_workers}"
+    if devices:
+        command += f" --devices {devices}"
+    if adaptive:
+        command += " --adaptive"
+    if output:
+        command += f" --output {output}"
+
+    run_command(context, command)
+
+
+@task(
+    help={
+        "scenario": "Only run this benchmark scenario (small, fleet), may be repeated.",
+        "devices": "Number of devices, overrides the scenario. (default: per scenario)",
+        "no_cables": "Don't sync cables. (default: False)",
+        "output": "JSON file to save the results to.",
+    },
+    iterable=["scenario"],
+)
+def benchmark_network_data_sync(context, scenario=None, devices=0, no_cables=False, output=""):
+    """Run the network data sync benchmarks, failing when a phase runs more queries than its budget."""
+    command = "python -m nautobot_device_onboarding.tests.benchmarks network-data-sync"
+    for name in scenario or []:
+        command += f" --scenario {name}"
+    if devices:
+        command += f" --devices {devices}"
+    if no_cables:
+        command += " --no-cables"
+    if output:
+        command += f" --output {output}"
+
+    run_command(context, command)
+
+
 @task(
     help={
         "failfast": "fail as soon as a single test fails don't run the entire test suite. (default: False)",